@@ -15,6 +15,83 @@ down_revision = None
 branch_labels = None
 depends_on = None
 
+# Secondary indexes, built once all tables exist. CONCURRENTLY keeps the
+# tables writable while each index is built on a pre-populated database.
+# This is the current index set: a later migration that reshapes an index
+# updates its entry here too, so fresh installs start in the final shape.
+INDEXES = (
+    "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_lower ON users (lower(email)) "
+    "INCLUDE (email, hashed_password, is_active, role, id)",
+    # loan_applications
+    # No separate indexes on id (primary key) or country_code (leading
+    # column of idx_loans_filter)
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_loan_applications_status ON loan_applications (status)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_loan_applications_document_hash ON loan_applications (document_hash)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loans_filter ON loan_applications "
+    "(country_code, status, created_at DESC, id DESC)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loans_review ON loan_applications "
+    "(created_at DESC, id DESC) WHERE requires_review = true",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loans_created_at ON loan_applications (created_at DESC, id DESC)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loans_pending_review ON loan_applications (status, created_at) "
+    "WHERE status IN ('PENDING', 'IN_REVIEW')",
+    # loan_status_history
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_loan_status_history_loan_id ON loan_status_history (loan_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_status_history_loan_created ON loan_status_history USING btree (loan_id, created_at)",
+    # audit_logs
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_audit_logs_entity_type ON audit_logs (entity_type)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_audit_logs_entity_id ON audit_logs (entity_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_audit_logs_action ON audit_logs (action)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_entity_created ON audit_logs USING btree (entity_type, entity_id, created_at) "
+    "INCLUDE (action)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_actor_created ON audit_logs USING btree (actor_id, created_at) "
+    "WHERE actor_id IS NOT NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_created_brin ON audit_logs USING BRIN (created_at) "
+    "WITH (pages_per_range = 32)",
+    # async_jobs
+    # No separate index on queue_name (leading column of idx_jobs_queue_status)
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_queue_status ON async_jobs (queue_name, status) "
+    "INCLUDE (scheduled_at)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_async_jobs_status ON async_jobs (status)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_pending_queue ON async_jobs (queue_name, priority DESC, scheduled_at) "
+    "INCLUDE (id, attempts, max_attempts) WHERE status = 'PENDING'",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_pending_scheduled ON async_jobs (scheduled_at) "
+    "WHERE status = 'PENDING'",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_running ON async_jobs (locked_by, locked_at) "
+    "WHERE status = 'RUNNING'",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_completed_brin ON async_jobs USING BRIN (completed_at) "
+    "WITH (pages_per_range = 32)",
+    # webhook_events
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_webhook_events_source ON webhook_events (source)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_webhook_events_event_type ON webhook_events (event_type)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_webhook_events_loan_id ON webhook_events (loan_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_webhook_unprocessed ON webhook_events (processed, created_at) "
+    "INCLUDE (source, event_type) WHERE processed = false",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_webhook_source_type ON webhook_events (source, event_type, created_at)",
+)
+
+
+def _create_indexes_concurrently() -> None:
+    """
+    Build secondary indexes outside the migration transaction.
+
+    CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so the
+    table DDL is committed first and the indexes are built in autocommit
+    mode. Each build can use PostgreSQL's parallel maintenance workers to
+    scan large tables with several processes.
+
+    Every statement uses IF NOT EXISTS so a partially applied run can be
+    retried. A concurrent build that failed leaves an INVALID index behind,
+    which IF NOT EXISTS skips; drop it by hand before rerunning.
+    """
+    with op.get_context().autocommit_block():
+        # Separate commands for asyncpg compatibility
+        op.execute("SET max_parallel_maintenance_workers = 4")
+        op.execute("SET maintenance_work_mem = '1GB'")
+        for statement in INDEXES:
+            op.execute(statement)
+        op.execute("RESET maintenance_work_mem")
+        op.execute("RESET max_parallel_maintenance_workers")
+
 
 def upgrade() -> None:
     """
@@ -78,7 +155,6 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
         sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
     )
-    op.create_index('ix_users_email', 'users', ['email'], unique=True)
     
     # Create loan_applications table
     op.create_table(
@@ -101,14 +177,6 @@ def upgrade() -> None:
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
         sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
     )
-    op.create_index('ix_loan_applications_id', 'loan_applications', ['id'])
-    op.create_index('ix_loan_applications_country_code', 'loan_applications', ['country_code'])
-    op.create_index('ix_loan_applications_status', 'loan_applications', ['status'])
-    op.create_index('ix_loan_applications_document_hash', 'loan_applications', ['document_hash'])
-    op.create_index('idx_loans_country_status', 'loan_applications', ['country_code', 'status'])
-    op.create_index('idx_loans_created_at', 'loan_applications', ['created_at'], postgresql_using='btree')
-    op.create_index('idx_loans_pending_review', 'loan_applications', ['status', 'created_at'], 
-                    postgresql_where=sa.text("status IN ('PENDING', 'IN_REVIEW')"))
     
     # Add CHECK constraints for loan_applications
     op.create_check_constraint(
@@ -127,16 +195,14 @@ def upgrade() -> None:
         'loan_status_history',
         sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
         sa.Column('loan_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('previous_status', sa.String(30), nullable=True, comment='Previous status (null for initial creation)'),
-        sa.Column('new_status', sa.String(30), nullable=False),
+        sa.Column('previous_status', postgresql.ENUM('PENDING', 'VALIDATING', 'IN_REVIEW', 'APPROVED', 'REJECTED', 'CANCELLED', 'DISBURSED', 'COMPLETED', name='loan_status', create_type=False), nullable=True, comment='Previous status (null for initial creation)'),
+        sa.Column('new_status', postgresql.ENUM('PENDING', 'VALIDATING', 'IN_REVIEW', 'APPROVED', 'REJECTED', 'CANCELLED', 'DISBURSED', 'COMPLETED', name='loan_status', create_type=False), nullable=False),
         sa.Column('changed_by', postgresql.UUID(as_uuid=True), nullable=True, comment='User ID who made the change (null for system)'),
         sa.Column('reason', sa.Text(), nullable=True, comment='Reason for status change'),
         sa.Column('extra_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True, comment='Additional context data for the status change'),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
         sa.ForeignKeyConstraint(['loan_id'], ['loan_applications.id'], ondelete='CASCADE'),
     )
-    op.create_index('ix_loan_status_history_loan_id', 'loan_status_history', ['loan_id'])
-    op.create_index('idx_status_history_loan_created', 'loan_status_history', ['loan_id', 'created_at'], postgresql_using='btree')
     
     # Create audit_logs table
     op.create_table(
@@ -152,11 +218,6 @@ def upgrade() -> None:
         sa.Column('user_agent', sa.Text(), nullable=True),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
     )
-    op.create_index('ix_audit_logs_entity_type', 'audit_logs', ['entity_type'])
-    op.create_index('ix_audit_logs_entity_id', 'audit_logs', ['entity_id'])
-    op.create_index('ix_audit_logs_action', 'audit_logs', ['action'])
-    op.create_index('idx_audit_entity_created', 'audit_logs', ['entity_type', 'entity_id', 'created_at'], postgresql_using='btree')
-    op.create_index('idx_audit_actor_created', 'audit_logs', ['actor_id', 'created_at'], postgresql_using='btree')
     
     # Create async_jobs table
     op.create_table(
@@ -176,14 +237,6 @@ def upgrade() -> None:
         sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
     )
-    op.create_index('ix_async_jobs_queue_name', 'async_jobs', ['queue_name'])
-    op.create_index('ix_async_jobs_status', 'async_jobs', ['status'])
-    op.create_index('idx_jobs_pending_queue', 'async_jobs', ['queue_name', 'priority', 'scheduled_at'],
-                    postgresql_where=sa.text("status = 'PENDING'"))
-    op.create_index('idx_jobs_running', 'async_jobs', ['locked_by', 'locked_at'],
-                    postgresql_where=sa.text("status = 'RUNNING'"))
-    op.create_index('idx_jobs_completed', 'async_jobs', ['completed_at'],
-                    postgresql_where=sa.text("status = 'COMPLETED'"))
     
     # Create webhook_events table
     op.create_table(
@@ -200,13 +253,9 @@ def upgrade() -> None:
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
         sa.ForeignKeyConstraint(['loan_id'], ['loan_applications.id'], ondelete='SET NULL'),
     )
-    op.create_index('ix_webhook_events_source', 'webhook_events', ['source'])
-    op.create_index('ix_webhook_events_event_type', 'webhook_events', ['event_type'])
-    op.create_index('ix_webhook_events_processed', 'webhook_events', ['processed'])
-    op.create_index('ix_webhook_events_loan_id', 'webhook_events', ['loan_id'])
-    op.create_index('idx_webhook_unprocessed', 'webhook_events', ['processed', 'created_at'],
-                    postgresql_where=sa.text('processed = false'))
-    op.create_index('idx_webhook_source_type', 'webhook_events', ['source', 'event_type', 'created_at'])
+
+    # Secondary indexes are built last, outside the migration transaction
+    _create_indexes_concurrently()
 
 
 def downgrade() -> None:
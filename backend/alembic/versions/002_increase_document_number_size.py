@@ -22,7 +22,14 @@ def upgrade() -> None:
     
     Fernet encryption produces base64-encoded tokens that can be 88+ characters,
     but the current column is only VARCHAR(50).
+
+    Raising a VARCHAR length limit is a catalog-only change in PostgreSQL:
+    no table rewrite and no index rebuild, so an add-backfill-swap is not
+    needed. The ALTER still needs a brief ACCESS EXCLUSIVE lock, so
+    lock_timeout makes it fail fast instead of queueing behind long
+    transactions (and blocking every query queued behind it).
     """
+    op.execute("SET LOCAL lock_timeout = '5s'")
     op.alter_column(
         'loan_applications',
         'document_number',
@@ -31,6 +38,7 @@ def upgrade() -> None:
         existing_nullable=False,
         comment='Encrypted document number (PII) - increased for Fernet encryption',
     )
+    op.execute("SET LOCAL lock_timeout TO DEFAULT")
 
 
 def downgrade() -> None:
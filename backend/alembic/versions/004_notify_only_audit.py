@@ -0,0 +1,126 @@
+"""Emit audit payload via NOTIFY instead of inserting audit jobs per row
+
+Revision ID: 004_notify_only_audit
+Revises: 003_trigger_create_audit
+Create Date: 2026-10-14 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004_notify_only_audit'
+down_revision = '003_trigger_create_audit'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Update notify_loan_change() to only send pg_notify.
+
+    The audit action is added to the notification payload ('CREATE' on
+    INSERT, 'STATUS_CHANGE' on status updates, NULL otherwise) and the
+    PostgreSQL listener writes audit jobs in batches, so the trigger no
+    longer inserts into async_jobs for every row.
+    """
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_loan_change()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            payload JSON;
+            audit_action TEXT;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                audit_action = 'CREATE';
+            ELSIF TG_OP = 'UPDATE' AND OLD.status IS DISTINCT FROM NEW.status THEN
+                audit_action = 'STATUS_CHANGE';
+            END IF;
+
+            -- Build JSON payload with loan change information
+            payload = json_build_object(
+                'operation', TG_OP,
+                'loan_id', COALESCE(NEW.id::text, OLD.id::text),
+                'country_code', COALESCE(NEW.country_code, OLD.country_code),
+                'old_status', OLD.status,
+                'new_status', NEW.status,
+                'audit_action', audit_action,
+                'timestamp', NOW()
+            );
+
+            -- Send notification to channel 'loan_changes'
+            PERFORM pg_notify('loan_changes', payload::text);
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+
+def downgrade() -> None:
+    """Revert to inserting audit jobs from the trigger (CREATE and STATUS_CHANGE)."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_loan_change()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            payload JSON;
+        BEGIN
+            -- Build JSON payload with loan change information
+            payload = json_build_object(
+                'operation', TG_OP,
+                'loan_id', COALESCE(NEW.id::text, OLD.id::text),
+                'country_code', COALESCE(NEW.country_code, OLD.country_code),
+                'old_status', OLD.status,
+                'new_status', NEW.status,
+                'timestamp', NOW()
+            );
+
+            -- Send notification to channel 'loan_changes'
+            PERFORM pg_notify('loan_changes', payload::text);
+
+            -- Enqueue audit job for INSERT (CREATE) or UPDATE with status change
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO async_jobs (
+                    queue_name,
+                    payload,
+                    status,
+                    scheduled_at
+                ) VALUES (
+                    'audit',
+                    json_build_object(
+                        'entity_type', 'loan_application',
+                        'entity_id', NEW.id::text,
+                        'action', 'CREATE',
+                        'old_status', NULL,
+                        'new_status', NEW.status,
+                        'timestamp', NOW()
+                    ),
+                    'PENDING',
+                    NOW()
+                );
+            ELSIF TG_OP = 'UPDATE' AND OLD.status IS DISTINCT FROM NEW.status THEN
+                INSERT INTO async_jobs (
+                    queue_name,
+                    payload,
+                    status,
+                    scheduled_at
+                ) VALUES (
+                    'audit',
+                    json_build_object(
+                        'entity_type', 'loan_application',
+                        'entity_id', NEW.id::text,
+                        'action', 'STATUS_CHANGE',
+                        'old_status', OLD.status,
+                        'new_status', NEW.status,
+                        'timestamp', NOW()
+                    ),
+                    'PENDING',
+                    NOW()
+                );
+            END IF;
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
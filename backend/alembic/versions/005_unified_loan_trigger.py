@@ -0,0 +1,162 @@
+"""Fuse loan triggers into one BEFORE trigger and audit inserts per statement
+
+Revision ID: 005_unified_loan_trigger
+Revises: 004_notify_only_audit
+Create Date: 2026-10-14 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005_unified_loan_trigger'
+down_revision = '004_notify_only_audit'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Replace the two row triggers on loan_applications with a single one.
+
+    - loan_change_handler() runs BEFORE INSERT OR UPDATE, sets updated_at on
+      UPDATE and sends the pg_notify payload (one trigger call per row
+      instead of two).
+    - CREATE audit jobs are written by an AFTER INSERT statement trigger
+      reading the transition table, so a multi-row INSERT enqueues all of
+      them with a single INSERT ... SELECT.
+    """
+    op.execute("""
+        CREATE OR REPLACE FUNCTION loan_change_handler()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            payload JSON;
+            audit_action TEXT;
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                NEW.updated_at = NOW();
+                IF OLD.status IS DISTINCT FROM NEW.status THEN
+                    audit_action = 'STATUS_CHANGE';
+                END IF;
+            END IF;
+
+            -- Build JSON payload with loan change information
+            payload = json_build_object(
+                'operation', TG_OP,
+                'loan_id', NEW.id::text,
+                'country_code', NEW.country_code,
+                'old_status', OLD.status,
+                'new_status', NEW.status,
+                'audit_action', audit_action,
+                'timestamp', NOW()
+            );
+
+            -- Delivered on commit, so sending it from a BEFORE trigger is safe
+            PERFORM pg_notify('loan_changes', payload::text);
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION audit_loan_insert()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO async_jobs (queue_name, payload, status, scheduled_at)
+            SELECT
+                'audit',
+                json_build_object(
+                    'entity_type', 'loan_application',
+                    'entity_id', new_loans.id::text,
+                    'action', 'CREATE',
+                    'old_status', NULL,
+                    'new_status', new_loans.status,
+                    'timestamp', NOW()
+                ),
+                'PENDING',
+                NOW()
+            FROM new_loans;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Drop old triggers (separate commands for asyncpg compatibility)
+    op.execute("DROP TRIGGER IF EXISTS trigger_notify_loan_change ON loan_applications;")
+    op.execute("DROP TRIGGER IF EXISTS trigger_update_timestamp ON loan_applications;")
+    op.execute("DROP FUNCTION IF EXISTS notify_loan_change();")
+
+    op.execute("DROP TRIGGER IF EXISTS trigger_loan_change ON loan_applications;")
+    op.execute("""
+        CREATE TRIGGER trigger_loan_change
+            BEFORE INSERT OR UPDATE ON loan_applications
+            FOR EACH ROW
+            EXECUTE FUNCTION loan_change_handler();
+    """)
+
+    op.execute("DROP TRIGGER IF EXISTS trigger_audit_loan_insert ON loan_applications;")
+    op.execute("""
+        CREATE TRIGGER trigger_audit_loan_insert
+            AFTER INSERT ON loan_applications
+            REFERENCING NEW TABLE AS new_loans
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION audit_loan_insert();
+    """)
+
+
+def downgrade() -> None:
+    """Restore the separate notify and updated_at row triggers."""
+    op.execute("DROP TRIGGER IF EXISTS trigger_audit_loan_insert ON loan_applications;")
+    op.execute("DROP TRIGGER IF EXISTS trigger_loan_change ON loan_applications;")
+    op.execute("DROP FUNCTION IF EXISTS audit_loan_insert();")
+    op.execute("DROP FUNCTION IF EXISTS loan_change_handler();")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_loan_change()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            payload JSON;
+            audit_action TEXT;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                audit_action = 'CREATE';
+            ELSIF TG_OP = 'UPDATE' AND OLD.status IS DISTINCT FROM NEW.status THEN
+                audit_action = 'STATUS_CHANGE';
+            END IF;
+
+            -- Build JSON payload with loan change information
+            payload = json_build_object(
+                'operation', TG_OP,
+                'loan_id', COALESCE(NEW.id::text, OLD.id::text),
+                'country_code', COALESCE(NEW.country_code, OLD.country_code),
+                'old_status', OLD.status,
+                'new_status', NEW.status,
+                'audit_action', audit_action,
+                'timestamp', NOW()
+            );
+
+            -- Send notification to channel 'loan_changes'
+            PERFORM pg_notify('loan_changes', payload::text);
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("DROP TRIGGER IF EXISTS trigger_notify_loan_change ON loan_applications;")
+    op.execute("""
+        CREATE TRIGGER trigger_notify_loan_change
+            AFTER INSERT OR UPDATE ON loan_applications
+            FOR EACH ROW
+            EXECUTE FUNCTION notify_loan_change();
+    """)
+    op.execute("DROP TRIGGER IF EXISTS trigger_update_timestamp ON loan_applications;")
+    op.execute("""
+        CREATE TRIGGER trigger_update_timestamp
+            BEFORE UPDATE ON loan_applications
+            FOR EACH ROW
+            EXECUTE FUNCTION update_updated_at();
+    """)
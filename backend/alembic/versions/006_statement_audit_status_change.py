@@ -0,0 +1,129 @@
+"""Audit status changes with a statement-level transition table trigger
+
+Revision ID: 006_statement_audit_status
+Revises: 005_unified_loan_trigger
+Create Date: 2026-10-14 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006_statement_audit_status'
+down_revision = '005_unified_loan_trigger'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Enqueue STATUS_CHANGE audit jobs from an AFTER UPDATE statement trigger.
+
+    The trigger joins the OLD and NEW transition tables on id and inserts
+    one audit job per row whose status changed, with a single set-based
+    INSERT ... SELECT per statement. Together with trigger_audit_loan_insert
+    this replaces the batched audit writes done by the PostgreSQL listener,
+    so loan_change_handler() no longer includes an audit_action.
+    """
+    op.execute("""
+        CREATE OR REPLACE FUNCTION audit_loan_status_change()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO async_jobs (queue_name, payload, status, scheduled_at)
+            SELECT
+                'audit',
+                json_build_object(
+                    'entity_type', 'loan_application',
+                    'entity_id', n.id::text,
+                    'action', 'STATUS_CHANGE',
+                    'old_status', o.status,
+                    'new_status', n.status,
+                    'timestamp', NOW()
+                ),
+                'PENDING',
+                NOW()
+            FROM new_loans n
+            JOIN old_loans o ON o.id = n.id
+            WHERE o.status IS DISTINCT FROM n.status;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION loan_change_handler()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            payload JSON;
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                NEW.updated_at = NOW();
+            END IF;
+
+            -- Build JSON payload with loan change information
+            payload = json_build_object(
+                'operation', TG_OP,
+                'loan_id', NEW.id::text,
+                'country_code', NEW.country_code,
+                'old_status', OLD.status,
+                'new_status', NEW.status,
+                'timestamp', NOW()
+            );
+
+            -- Delivered on commit, so sending it from a BEFORE trigger is safe
+            PERFORM pg_notify('loan_changes', payload::text);
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("DROP TRIGGER IF EXISTS trigger_audit_loan_status ON loan_applications;")
+    op.execute("""
+        CREATE TRIGGER trigger_audit_loan_status
+            AFTER UPDATE ON loan_applications
+            REFERENCING OLD TABLE AS old_loans NEW TABLE AS new_loans
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION audit_loan_status_change();
+    """)
+
+
+def downgrade() -> None:
+    """Go back to sending audit_action for status changes via NOTIFY."""
+    op.execute("DROP TRIGGER IF EXISTS trigger_audit_loan_status ON loan_applications;")
+    op.execute("DROP FUNCTION IF EXISTS audit_loan_status_change();")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION loan_change_handler()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            payload JSON;
+            audit_action TEXT;
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                NEW.updated_at = NOW();
+                IF OLD.status IS DISTINCT FROM NEW.status THEN
+                    audit_action = 'STATUS_CHANGE';
+                END IF;
+            END IF;
+
+            -- Build JSON payload with loan change information
+            payload = json_build_object(
+                'operation', TG_OP,
+                'loan_id', NEW.id::text,
+                'country_code', NEW.country_code,
+                'old_status', OLD.status,
+                'new_status', NEW.status,
+                'audit_action', audit_action,
+                'timestamp', NOW()
+            );
+
+            -- Delivered on commit, so sending it from a BEFORE trigger is safe
+            PERFORM pg_notify('loan_changes', payload::text);
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
@@ -0,0 +1,71 @@
+"""Narrow audit_logs indexes for the append-only workload
+
+Revision ID: 007_audit_logs_brin
+Revises: 006_statement_audit_status
+Create Date: 2026-10-14 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_audit_logs_brin'
+down_revision = '006_statement_audit_status'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Rework audit_logs indexes.
+
+    - BRIN index on created_at: audit rows are inserted in time order, so a
+      block-range index answers time-range scans at a fraction of the size
+      of a btree.
+    - idx_audit_actor_created becomes partial (actor_id IS NOT NULL); the
+      trigger-generated system audits have no actor and never hit it.
+    - idx_audit_entity_created includes action, so entity history lookups
+      are index-only.
+
+    Indexes are swapped concurrently so audit writes are not blocked.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_created_brin
+            ON audit_logs USING BRIN (created_at) WITH (pages_per_range = 32)
+        """)
+
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_actor_created_new
+            ON audit_logs (actor_id, created_at) WHERE actor_id IS NOT NULL
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_audit_actor_created")
+        op.execute("ALTER INDEX idx_audit_actor_created_new RENAME TO idx_audit_actor_created")
+
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_entity_created_new
+            ON audit_logs (entity_type, entity_id, created_at) INCLUDE (action)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_audit_entity_created")
+        op.execute("ALTER INDEX idx_audit_entity_created_new RENAME TO idx_audit_entity_created")
+
+
+def downgrade() -> None:
+    """Restore the original btree indexes."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_audit_created_brin")
+
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_actor_created_old
+            ON audit_logs USING btree (actor_id, created_at)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_audit_actor_created")
+        op.execute("ALTER INDEX idx_audit_actor_created_old RENAME TO idx_audit_actor_created")
+
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_audit_entity_created_old
+            ON audit_logs USING btree (entity_type, entity_id, created_at)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_audit_entity_created")
+        op.execute("ALTER INDEX idx_audit_entity_created_old RENAME TO idx_audit_entity_created")
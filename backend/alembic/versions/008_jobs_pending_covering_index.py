@@ -0,0 +1,47 @@
+"""Covering partial index for async_jobs pickup
+
+Revision ID: 008_jobs_pending_covering
+Revises: 007_audit_logs_brin
+Create Date: 2026-10-14 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_jobs_pending_covering'
+down_revision = '007_audit_logs_brin'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Rebuild idx_jobs_pending_queue in dequeue order with INCLUDE columns.
+
+    The key order matches ORDER BY priority DESC, scheduled_at ASC, and
+    id/attempts/max_attempts are carried in the index so the pickup query
+    can pick candidates without reading the payload.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_pending_queue_new
+            ON async_jobs (queue_name, priority DESC, scheduled_at)
+            INCLUDE (id, attempts, max_attempts)
+            WHERE status = 'PENDING'
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_pending_queue")
+        op.execute("ALTER INDEX idx_jobs_pending_queue_new RENAME TO idx_jobs_pending_queue")
+
+
+def downgrade() -> None:
+    """Restore the original pending jobs index."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_pending_queue_old
+            ON async_jobs (queue_name, priority, scheduled_at)
+            WHERE status = 'PENDING'
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_pending_queue")
+        op.execute("ALTER INDEX idx_jobs_pending_queue_old RENAME TO idx_jobs_pending_queue")
@@ -0,0 +1,44 @@
+"""Drop redundant loan_applications indexes
+
+Revision ID: 009_drop_redundant_loan_idx
+Revises: 008_jobs_pending_covering
+Create Date: 2026-10-14 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009_drop_redundant_loan_idx'
+down_revision = '008_jobs_pending_covering'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Drop indexes that duplicate other indexes on loan_applications.
+
+    - ix_loan_applications_id: the primary key is already indexed.
+    - ix_loan_applications_country_code: country_code is the leading
+      column of idx_loans_country_status, which serves the same lookups.
+
+    Both add index maintenance to every INSERT/UPDATE for no read benefit.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_loan_applications_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_loan_applications_country_code")
+
+
+def downgrade() -> None:
+    """Recreate the dropped indexes."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_loan_applications_id "
+            "ON loan_applications (id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_loan_applications_country_code "
+            "ON loan_applications (country_code)"
+        )
@@ -0,0 +1,65 @@
+"""Only fire the loan change trigger on INSERT or status changes
+
+Revision ID: 010_loan_trigger_when
+Revises: 009_drop_redundant_loan_idx
+Create Date: 2026-10-14 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010_loan_trigger_when'
+down_revision = '009_drop_redundant_loan_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Split trigger_loan_change so UPDATEs that keep the status skip it.
+
+    A trigger WHEN clause cannot reference TG_OP, and OLD is not available
+    to INSERT triggers, so the single INSERT OR UPDATE trigger becomes:
+
+    - trigger_loan_insert: BEFORE INSERT, always fires.
+    - trigger_loan_status_change: BEFORE UPDATE, with
+      WHEN (OLD.status IS DISTINCT FROM NEW.status).
+
+    UPDATEs that only touch risk_score, banking_info, etc. no longer run
+    PL/pgSQL at all. updated_at for those rows is set by the ORM
+    (onupdate=func.now() on the model).
+    """
+    op.execute("DROP TRIGGER IF EXISTS trigger_loan_change ON loan_applications;")
+
+    op.execute("DROP TRIGGER IF EXISTS trigger_loan_insert ON loan_applications;")
+    op.execute("""
+        CREATE TRIGGER trigger_loan_insert
+            BEFORE INSERT ON loan_applications
+            FOR EACH ROW
+            EXECUTE FUNCTION loan_change_handler();
+    """)
+
+    op.execute("DROP TRIGGER IF EXISTS trigger_loan_status_change ON loan_applications;")
+    op.execute("""
+        CREATE TRIGGER trigger_loan_status_change
+            BEFORE UPDATE ON loan_applications
+            FOR EACH ROW
+            WHEN (OLD.status IS DISTINCT FROM NEW.status)
+            EXECUTE FUNCTION loan_change_handler();
+    """)
+
+
+def downgrade() -> None:
+    """Restore the single INSERT OR UPDATE row trigger."""
+    op.execute("DROP TRIGGER IF EXISTS trigger_loan_status_change ON loan_applications;")
+    op.execute("DROP TRIGGER IF EXISTS trigger_loan_insert ON loan_applications;")
+
+    op.execute("DROP TRIGGER IF EXISTS trigger_loan_change ON loan_applications;")
+    op.execute("""
+        CREATE TRIGGER trigger_loan_change
+            BEFORE INSERT OR UPDATE ON loan_applications
+            FOR EACH ROW
+            EXECUTE FUNCTION loan_change_handler();
+    """)
@@ -0,0 +1,44 @@
+"""Store loan_status_history statuses as the loan_status enum
+
+Revision ID: 011_status_history_enum
+Revises: 010_loan_trigger_when
+Create Date: 2026-10-14 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011_status_history_enum'
+down_revision = '010_loan_trigger_when'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Convert previous_status/new_status from VARCHAR(30) to loan_status.
+
+    Enum values are stored as 4-byte OIDs instead of text, and match the type
+    of loan_applications.status. Both columns are converted in one ALTER
+    TABLE so the table is rewritten only once.
+    """
+    op.execute("""
+        ALTER TABLE loan_status_history
+            ALTER COLUMN previous_status TYPE loan_status
+                USING previous_status::loan_status,
+            ALTER COLUMN new_status TYPE loan_status
+                USING new_status::loan_status
+    """)
+
+
+def downgrade() -> None:
+    """Convert the status columns back to VARCHAR(30)."""
+    op.execute("""
+        ALTER TABLE loan_status_history
+            ALTER COLUMN previous_status TYPE VARCHAR(30)
+                USING previous_status::text,
+            ALTER COLUMN new_status TYPE VARCHAR(30)
+                USING new_status::text
+    """)
@@ -0,0 +1,102 @@
+"""Build audit job payloads as JSONB and keep small audit changes inline
+
+Revision ID: 012_audit_jsonb_payloads
+Revises: 011_status_history_enum
+Create Date: 2026-10-14 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012_audit_jsonb_payloads'
+down_revision = '011_status_history_enum'
+branch_labels = None
+depends_on = None
+
+
+def _audit_functions(builder: str) -> tuple:
+    """
+    Build the audit statement trigger functions.
+
+    Args:
+        builder: JSON constructor to use (json_build_object or jsonb_build_object)
+
+    Returns:
+        CREATE OR REPLACE FUNCTION statements for the insert and status audits
+    """
+    insert_fn = f"""
+        CREATE OR REPLACE FUNCTION audit_loan_insert()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO async_jobs (queue_name, payload, status, scheduled_at)
+            SELECT
+                'audit',
+                {builder}(
+                    'entity_type', 'loan_application',
+                    'entity_id', new_loans.id::text,
+                    'action', 'CREATE',
+                    'old_status', NULL,
+                    'new_status', new_loans.status,
+                    'timestamp', NOW()
+                ),
+                'PENDING',
+                NOW()
+            FROM new_loans;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """
+    status_fn = f"""
+        CREATE OR REPLACE FUNCTION audit_loan_status_change()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO async_jobs (queue_name, payload, status, scheduled_at)
+            SELECT
+                'audit',
+                {builder}(
+                    'entity_type', 'loan_application',
+                    'entity_id', n.id::text,
+                    'action', 'STATUS_CHANGE',
+                    'old_status', o.status,
+                    'new_status', n.status,
+                    'timestamp', NOW()
+                ),
+                'PENDING',
+                NOW()
+            FROM new_loans n
+            JOIN old_loans o ON o.id = n.id
+            WHERE o.status IS DISTINCT FROM n.status;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """
+    return insert_fn, status_fn
+
+
+def upgrade() -> None:
+    """
+    Cheaper audit payload storage.
+
+    - The audit trigger functions build their payload with
+      jsonb_build_object, so the value lands in async_jobs.payload (JSONB)
+      directly instead of being rendered as json text and re-parsed.
+    - audit_logs.changes holds small {field: {old, new}} objects; STORAGE
+      MAIN keeps them inline in the heap tuple instead of moving them out
+      to the TOAST table.
+    """
+    for statement in _audit_functions("jsonb_build_object"):
+        op.execute(statement)
+
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN changes SET STORAGE MAIN")
+
+
+def downgrade() -> None:
+    """Restore json_build_object payloads and EXTENDED storage."""
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN changes SET STORAGE EXTENDED")
+
+    for statement in _audit_functions("json_build_object"):
+        op.execute(statement)
@@ -0,0 +1,37 @@
+"""Drop the full index on webhook_events.processed
+
+Revision ID: 013_drop_webhook_processed_idx
+Revises: 012_audit_jsonb_payloads
+Create Date: 2026-10-14 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '013_drop_webhook_processed_idx'
+down_revision = '012_audit_jsonb_payloads'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Drop ix_webhook_events_processed.
+
+    A btree on a two-valued boolean is never picked for processed = true,
+    and idx_webhook_unprocessed (partial on processed = false) already
+    serves the unprocessed lookups.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_webhook_events_processed")
+
+
+def downgrade() -> None:
+    """Recreate ix_webhook_events_processed."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_webhook_events_processed "
+            "ON webhook_events (processed)"
+        )
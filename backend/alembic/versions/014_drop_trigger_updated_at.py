@@ -0,0 +1,89 @@
+"""Leave updated_at to the ORM and drop update_updated_at()
+
+Revision ID: 014_drop_trigger_updated_at
+Revises: 013_drop_webhook_processed_idx
+Create Date: 2026-10-14 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '014_drop_trigger_updated_at'
+down_revision = '013_drop_webhook_processed_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Stop setting updated_at from PL/pgSQL.
+
+    LoanApplication.updated_at has onupdate=func.now(), which SQLAlchemy
+    adds to every ORM flush and Core update() on the table, so the
+    assignment in loan_change_handler() is redundant. The function now
+    only sends the NOTIFY payload. update_updated_at() has had no trigger
+    since 005 and is dropped.
+    """
+    op.execute("""
+        CREATE OR REPLACE FUNCTION loan_change_handler()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            -- Delivered on commit, so sending it from a BEFORE trigger is safe
+            PERFORM pg_notify('loan_changes', json_build_object(
+                'operation', TG_OP,
+                'loan_id', NEW.id::text,
+                'country_code', NEW.country_code,
+                'old_status', OLD.status,
+                'new_status', NEW.status,
+                'timestamp', NOW()
+            )::text);
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("DROP FUNCTION IF EXISTS update_updated_at();")
+
+
+def downgrade() -> None:
+    """Restore the trigger-side updated_at assignment."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION update_updated_at()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.updated_at = NOW();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION loan_change_handler()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            payload JSON;
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                NEW.updated_at = NOW();
+            END IF;
+
+            -- Build JSON payload with loan change information
+            payload = json_build_object(
+                'operation', TG_OP,
+                'loan_id', NEW.id::text,
+                'country_code', NEW.country_code,
+                'old_status', OLD.status,
+                'new_status', NEW.status,
+                'timestamp', NOW()
+            );
+
+            -- Delivered on commit, so sending it from a BEFORE trigger is safe
+            PERFORM pg_notify('loan_changes', payload::text);
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
@@ -0,0 +1,45 @@
+"""Make the users email index cover the login lookup
+
+Revision ID: 015_users_email_covering
+Revises: 014_drop_trigger_updated_at
+Create Date: 2026-10-14 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '015_users_email_covering'
+down_revision = '014_drop_trigger_updated_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Rebuild ix_users_email with INCLUDE columns.
+
+    Login selects id, hashed_password, is_active, email and role by email;
+    carrying them in the unique email index makes that an index-only scan.
+    The index is swapped in place rather than added next to the existing
+    one, so users keeps a single email index.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_new
+            ON users (email) INCLUDE (hashed_password, is_active, role, id)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email")
+        op.execute("ALTER INDEX ix_users_email_new RENAME TO ix_users_email")
+
+
+def downgrade() -> None:
+    """Restore the plain unique email index."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email_old
+            ON users (email)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email")
+        op.execute("ALTER INDEX ix_users_email_old RENAME TO ix_users_email")
@@ -0,0 +1,44 @@
+"""Index loan_applications in listing order for keyset pagination
+
+Revision ID: 016_loans_listing_order
+Revises: 015_users_email_covering
+Create Date: 2026-10-14 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '016_loans_listing_order'
+down_revision = '015_users_email_covering'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Rebuild idx_loans_created_at as (created_at DESC, id DESC).
+
+    The loan listing orders by created_at DESC, id DESC and pages with
+    WHERE (created_at, id) < (:ts, :id); the composite key serves both
+    the ordering and the cursor predicate with a plain index scan.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loans_created_at_new
+            ON loan_applications (created_at DESC, id DESC)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_loans_created_at")
+        op.execute("ALTER INDEX idx_loans_created_at_new RENAME TO idx_loans_created_at")
+
+
+def downgrade() -> None:
+    """Restore the single-column created_at index."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loans_created_at_old
+            ON loan_applications USING btree (created_at)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_loans_created_at")
+        op.execute("ALTER INDEX idx_loans_created_at_old RENAME TO idx_loans_created_at")
@@ -0,0 +1,50 @@
+"""Index loan list filters in listing order
+
+Revision ID: 017_loans_filter_indexes
+Revises: 016_loans_listing_order
+Create Date: 2026-10-14 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '017_loans_filter_indexes'
+down_revision = '016_loans_listing_order'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add listing indexes for the country/status and review filters.
+
+    - idx_loans_filter (country_code, status, created_at DESC, id DESC)
+      returns a filtered page already sorted, with no sort step. It
+      supersedes idx_loans_country_status, whose columns are its prefix.
+    - idx_loans_review (created_at DESC, id DESC) WHERE requires_review
+      serves the manual review queue listing.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loans_filter
+            ON loan_applications (country_code, status, created_at DESC, id DESC)
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loans_review
+            ON loan_applications (created_at DESC, id DESC)
+            WHERE requires_review = true
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_loans_country_status")
+
+
+def downgrade() -> None:
+    """Restore idx_loans_country_status and drop the listing indexes."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_loans_country_status
+            ON loan_applications (country_code, status)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_loans_review")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_loans_filter")
@@ -0,0 +1,38 @@
+"""Index pending jobs by scheduled time
+
+Revision ID: 018_jobs_pending_scheduled
+Revises: 017_loans_filter_indexes
+Create Date: 2026-10-14 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '018_jobs_pending_scheduled'
+down_revision = '017_loans_filter_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add idx_jobs_pending_scheduled (scheduled_at) WHERE status = 'PENDING'.
+
+    Serves the oldest-pending lookup in the queue stats, which orders by
+    scheduled_at across queues. idx_jobs_pending_queue leads with
+    queue_name and priority, so it cannot answer that with one index probe.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_pending_scheduled
+            ON async_jobs (scheduled_at)
+            WHERE status = 'PENDING'
+        """)
+
+
+def downgrade() -> None:
+    """Drop idx_jobs_pending_scheduled."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_pending_scheduled")
@@ -0,0 +1,45 @@
+"""Default audit and job timestamps to statement_timestamp()
+
+Revision ID: 019_statement_timestamps
+Revises: 018_jobs_pending_scheduled
+Create Date: 2026-10-14 23:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '019_statement_timestamps'
+down_revision = '018_jobs_pending_scheduled'
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs whose default changes
+COLUMNS = (
+    ("audit_logs", "created_at"),
+    ("async_jobs", "created_at"),
+    ("async_jobs", "scheduled_at"),
+)
+
+
+def upgrade() -> None:
+    """
+    Switch audit and job timestamp defaults from now() to statement_timestamp().
+
+    Both read the clock once and share the value across every row of a
+    statement. now() is fixed for the whole transaction, so rows written
+    late in a long worker or webhook transaction were stamped with its
+    start time; statement_timestamp() stamps them when they are written.
+    Changing a default is a catalog-only update.
+    """
+    for table, column in COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT statement_timestamp()"
+        )
+
+
+def downgrade() -> None:
+    """Restore the now() defaults."""
+    for table, column in COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT now()")
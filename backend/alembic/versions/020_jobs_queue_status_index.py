@@ -0,0 +1,43 @@
+"""Index jobs by queue and status
+
+Revision ID: 020_jobs_queue_status
+Revises: 019_statement_timestamps
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '020_jobs_queue_status'
+down_revision = '019_statement_timestamps'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Replace ix_async_jobs_queue_name with idx_jobs_queue_status.
+
+    (queue_name, status) INCLUDE (scheduled_at) lets the per-queue stats
+    query (counts and oldest scheduled_at per status) run as an index-only
+    scan, and its leading column still serves every queue_name lookup the
+    old single-column index did.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_queue_status
+            ON async_jobs (queue_name, status) INCLUDE (scheduled_at)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_async_jobs_queue_name")
+
+
+def downgrade() -> None:
+    """Restore ix_async_jobs_queue_name and drop idx_jobs_queue_status."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_async_jobs_queue_name
+            ON async_jobs (queue_name)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_queue_status")
@@ -0,0 +1,46 @@
+"""Cover source and event_type in the unprocessed webhooks index
+
+Revision ID: 021_webhook_unprocessed_cover
+Revises: 020_jobs_queue_status
+Create Date: 2026-10-15 01:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '021_webhook_unprocessed_cover'
+down_revision = '020_jobs_queue_status'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Rebuild idx_webhook_unprocessed with INCLUDE (source, event_type).
+
+    Scans of unprocessed events by age can then return the source and
+    event type from the index without visiting the heap.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_webhook_unprocessed_new
+            ON webhook_events (processed, created_at)
+            INCLUDE (source, event_type)
+            WHERE processed = false
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_webhook_unprocessed")
+        op.execute("ALTER INDEX idx_webhook_unprocessed_new RENAME TO idx_webhook_unprocessed")
+
+
+def downgrade() -> None:
+    """Restore the non-covering unprocessed webhooks index."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_webhook_unprocessed_old
+            ON webhook_events (processed, created_at)
+            WHERE processed = false
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_webhook_unprocessed")
+        op.execute("ALTER INDEX idx_webhook_unprocessed_old RENAME TO idx_webhook_unprocessed")
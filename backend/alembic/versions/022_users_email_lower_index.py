@@ -0,0 +1,43 @@
+"""Index users by lower(email) for case-insensitive login
+
+Revision ID: 022_users_email_lower
+Revises: 021_webhook_unprocessed_cover
+Create Date: 2026-10-15 02:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '022_users_email_lower'
+down_revision = '021_webhook_unprocessed_cover'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Replace ix_users_email with a unique index on lower(email).
+
+    Login matches lower(email), so the covering columns move to the
+    expression index and the lookup stays an index-only scan. Uniqueness
+    also becomes case-insensitive; exact-match lookups are still served
+    by the users_email_key constraint.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_users_email_lower
+            ON users (lower(email)) INCLUDE (email, hashed_password, is_active, role, id)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_email")
+
+
+def downgrade() -> None:
+    """Restore the covering ix_users_email and drop idx_users_email_lower."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_users_email
+            ON users (email) INCLUDE (hashed_password, is_active, role, id)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_users_email_lower")
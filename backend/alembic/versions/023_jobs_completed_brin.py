@@ -0,0 +1,43 @@
+"""Replace the completed jobs btree with a BRIN index
+
+Revision ID: 023_jobs_completed_brin
+Revises: 022_users_email_lower
+Create Date: 2026-10-15 03:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '023_jobs_completed_brin'
+down_revision = '022_users_email_lower'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Swap idx_jobs_completed for idx_jobs_completed_brin.
+
+    cleanup_old_jobs deletes COMPLETED, FAILED and CANCELLED jobs by
+    completed_at, but the partial btree only covered COMPLETED. Jobs finish
+    roughly in insertion order, so a BRIN index on completed_at serves the
+    range for every status at a fraction of the size and write cost.
+    """
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_completed_brin
+            ON async_jobs USING BRIN (completed_at) WITH (pages_per_range = 32)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_completed")
+
+
+def downgrade() -> None:
+    """Restore the partial btree on completed jobs."""
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_jobs_completed
+            ON async_jobs (completed_at) WHERE status = 'COMPLETED'
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_jobs_completed_brin")
@@ -0,0 +1,69 @@
+"""Default UUID primary keys to time-ordered UUIDv7
+
+Revision ID: 024_uuid7_server_defaults
+Revises: 023_jobs_completed_brin
+Create Date: 2026-10-15 04:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '024_uuid7_server_defaults'
+down_revision = '023_jobs_completed_brin'
+branch_labels = None
+depends_on = None
+
+# Tables whose id column is a UUID primary key
+UUID_PK_TABLES = (
+    "users",
+    "loan_applications",
+    "loan_status_history",
+    "webhook_events",
+)
+
+
+def upgrade() -> None:
+    """
+    Add uuid_generate_v7() and make it the id default of every UUID table.
+
+    The function overwrites the first 48 bits of gen_random_uuid() with the
+    Unix time in milliseconds and sets the version nibble to 7, matching
+    app.db.base.uuid7(). The ORM still generates ids client side; the
+    default covers rows inserted by raw SQL, which previously got random
+    v4 ids scattered across the primary key index.
+    """
+    op.execute("""
+        CREATE OR REPLACE FUNCTION uuid_generate_v7()
+        RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(
+                                int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint)
+                                FROM 3
+                            )
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid;
+        $$ LANGUAGE sql VOLATILE;
+    """)
+
+    for table in UUID_PK_TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT uuid_generate_v7()")
+
+
+def downgrade() -> None:
+    """Restore gen_random_uuid() defaults and drop uuid_generate_v7()."""
+    for table in UUID_PK_TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()")
+
+    op.execute("DROP FUNCTION IF EXISTS uuid_generate_v7();")
@@ -1,91 +1,213 @@
 """API Dependencies for FastAPI."""
-from typing import Annotated, AsyncGenerator, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Callable, Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import verify_token, ACCESS_TOKEN_TYPE
-from app.db.session import async_session_maker
+from app.core.cache import CacheKeys, cache
+from app.core.config import settings
+from app.core.security import ACCESS_TOKEN_TYPE, is_token_revoked, verify_token
+from app.db.session import get_db
 from app.models.user import User, UserRole
 
 # HTTP Bearer security scheme
 security = HTTPBearer(auto_error=False)
 
+# Authenticated users cached per user_id as immutable snapshots. A
+# deactivated user keeps access for at most USER_CACHE_TTL seconds unless
+# the update path calls forget_cached_user().
+USER_CACHE_TTL = 30
+USER_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL)
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+
+@dataclass(frozen=True, slots=True)
+class AuthenticatedUser:
+    """
+    Read-only snapshot of the authenticated user.
+
+    Cached and shared between requests, so it is never an ORM instance
+    that a handler could mutate or attach to its session.
+    """
+
+    id: UUID
+    email: str
+    full_name: str
+    role: UserRole
+    is_active: bool
+    is_verified: bool
+    created_at: datetime
+    last_login: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "AuthenticatedUser":
+        """Take a snapshot of a loaded User."""
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            role=user.role,
+            is_active=user.is_active,
+            is_verified=user.is_verified,
+            created_at=user.created_at,
+            last_login=user.last_login,
+        )
+
+    @property
+    def is_admin(self) -> bool:
+        """Check if user has admin role."""
+        return self.role == UserRole.ADMIN
+
+    @property
+    def can_approve_loans(self) -> bool:
+        """Check if user can approve/reject loans."""
+        return self.role in (UserRole.ADMIN, UserRole.ANALYST)
+
+
+def forget_cached_user(user_id: UUID) -> None:
     """
-    Database session dependency.
+    Drop a user's cached snapshot.
 
-    Yields an async database session and handles cleanup.
+    Call after changing a user's role or active flag.
+
+    Args:
+        user_id: The user's ID
     """
-    async with async_session_maker() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+    USER_CACHE.pop(user_id, None)
+
+
+def _credentials_exception() -> HTTPException:
+    """Build the 401 raised for missing or invalid credentials."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
 
 # Type alias for database dependency
 DbSession = Annotated[AsyncSession, Depends(get_db)]
 
 
-async def get_current_user(
-    db: DbSession,
+async def enforce_rate_limit(scope: str, subject: str) -> None:
+    """
+    Take a token from the auth rate limit bucket for a subject.
+
+    Args:
+        scope: Limited operation (e.g. "login")
+        subject: What is limited (e.g. "ip:1.2.3.4", "email:a@b.c")
+
+    Raises:
+        HTTPException: 429 with Retry-After when the bucket is empty
+    """
+    allowed, retry_after = await cache.take_token(
+        CacheKeys.rate_limit(scope, subject),
+        capacity=settings.AUTH_RATE_LIMIT_BURST,
+        refill_per_second=settings.AUTH_RATE_LIMIT_PER_SECOND,
+    )
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(max(retry_after, 1))},
+        )
+
+
+def rate_limit_by_ip(scope: str) -> Callable:
+    """
+    Build a dependency that rate limits an endpoint per client IP.
+
+    Args:
+        scope: Limited operation, used in the bucket key
+
+    Returns:
+        FastAPI dependency
+    """
+    async def dependency(request: Request) -> None:
+        client_ip = request.client.host if request.client else "unknown"
+        await enforce_rate_limit(scope, f"ip:{client_ip}")
+
+    return dependency
+
+
+async def get_current_claims(
     credentials: Annotated[
         Optional[HTTPAuthorizationCredentials],
         Depends(security),
     ],
-) -> User:
+) -> dict:
     """
-    Get the current authenticated user.
+    Get the claims of a valid access token without loading the user.
+
+    Use for endpoints that only need the user ID or role, which the
+    access token already carries.
+
+    The user row is never read, so a deactivated user keeps access to
+    these endpoints until the token expires (JWT_ACCESS_TOKEN_EXPIRE_MINUTES).
+    Deactivating a user must also revoke their tokens for a hard cutoff;
+    endpoints that cannot accept that window use CurrentUser instead.
 
     Args:
-        db: Database session
         credentials: HTTP Bearer credentials
 
     Returns:
-        Authenticated User
+        Token payload, with "sub" already parsed to a UUID
 
     Raises:
         HTTPException: If authentication fails
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
     if not credentials:
-        raise credentials_exception
+        raise _credentials_exception()
 
     # Verify token
     payload = verify_token(credentials.credentials, ACCESS_TOKEN_TYPE)
-    if not payload:
-        raise credentials_exception
-
-    # Get user ID from token
-    user_id = payload.get("sub")
-    if not user_id:
-        raise credentials_exception
-
-    # Fetch user from database
-    try:
-        result = await db.execute(
-            select(User).where(User.id == UUID(user_id))
-        )
-        user = result.scalar_one_or_none()
-    except Exception:
-        raise credentials_exception
+    if not payload or not payload.get("sub"):
+        raise _credentials_exception()
 
-    if not user:
-        raise credentials_exception
+    # Reject tokens revoked by logout
+    if await is_token_revoked(payload):
+        raise _credentials_exception()
+
+    return payload
+
+
+# Type alias for token claims dependency
+CurrentClaims = Annotated[dict, Depends(get_current_claims)]
+
+
+async def get_current_user(
+    db: DbSession,
+    claims: CurrentClaims,
+) -> AuthenticatedUser:
+    """
+    Get the current authenticated user.
+
+    Args:
+        db: Database session
+        claims: Verified access token claims
+
+    Returns:
+        Snapshot of the authenticated user
+
+    Raises:
+        HTTPException: If authentication fails
+    """
+    user_id = claims["sub"]
+
+    # Serve from cache; only hit the database on a miss
+    user = USER_CACHE.get(user_id)
+
+    if user is None:
+        db_user = await db.get(User, user_id)
+        if not db_user:
+            raise _credentials_exception()
+
+        user = AuthenticatedUser.from_user(db_user)
+        USER_CACHE[user_id] = user
 
     if not user.is_active:
         raise HTTPException(
@@ -97,39 +219,34 @@ async def get_current_user(
 
 
 # Type alias for current user dependency
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[AuthenticatedUser, Depends(get_current_user)]
 
 
 async def get_current_active_user(
     current_user: CurrentUser,
-) -> User:
+) -> AuthenticatedUser:
     """
     Get current active user.
 
+    get_current_user already rejects deactivated accounts, so this is
+    kept as an alias for readability at call sites.
+
     Args:
         current_user: Current authenticated user
 
     Returns:
-        Active User
-
-    Raises:
-        HTTPException: If user is not active
+        Active user snapshot
     """
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Inactive user",
-        )
     return current_user
 
 
 # Type alias for active user dependency
-ActiveUser = Annotated[User, Depends(get_current_active_user)]
+ActiveUser = Annotated[AuthenticatedUser, Depends(get_current_active_user)]
 
 
 async def get_current_admin_user(
     current_user: CurrentUser,
-) -> User:
+) -> AuthenticatedUser:
     """
     Get current admin user.
 
@@ -137,7 +254,7 @@ async def get_current_admin_user(
         current_user: Current authenticated user
 
     Returns:
-        Admin User
+        Admin user snapshot
 
     Raises:
         HTTPException: If user is not admin
@@ -151,12 +268,12 @@ async def get_current_admin_user(
 
 
 # Type alias for admin user dependency
-AdminUser = Annotated[User, Depends(get_current_admin_user)]
+AdminUser = Annotated[AuthenticatedUser, Depends(get_current_admin_user)]
 
 
 async def get_current_analyst_user(
     current_user: CurrentUser,
-) -> User:
+) -> AuthenticatedUser:
     """
     Get current user with analyst or admin privileges.
 
@@ -164,7 +281,7 @@ async def get_current_analyst_user(
         current_user: Current authenticated user
 
     Returns:
-        Analyst or Admin User
+        Analyst or admin user snapshot
 
     Raises:
         HTTPException: If user cannot approve loans
@@ -178,10 +295,10 @@ async def get_current_analyst_user(
 
 
 # Type alias for analyst user dependency
-AnalystUser = Annotated[User, Depends(get_current_analyst_user)]
+AnalystUser = Annotated[AuthenticatedUser, Depends(get_current_analyst_user)]
 
 
-def get_optional_user(
+async def get_optional_user(
     credentials: Annotated[
         Optional[HTTPAuthorizationCredentials],
         Depends(security),
@@ -200,6 +317,8 @@ def get_optional_user(
         return None
 
     payload = verify_token(credentials.credentials, ACCESS_TOKEN_TYPE)
+    if payload and await is_token_revoked(payload):
+        return None
     return payload
 
 
@@ -1,56 +1,182 @@
 """Auth API Router."""
 import logging
-from datetime import datetime
+import secrets
+from datetime import timedelta
+from typing import Any, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy import func, or_, select, update
 
-from app.api.deps import CurrentUser, DbSession
+from app.api.deps import (
+    CurrentClaims,
+    CurrentUser,
+    DbSession,
+    enforce_rate_limit,
+    rate_limit_by_ip,
+)
 from app.api.v1.auth.schemas import (
     LoginRequest,
     RefreshRequest,
     TokenResponse,
     UserResponse,
 )
+from app.core.cache import CacheKeys, cache
 from app.core.config import settings
 from app.core.security import (
     REFRESH_TOKEN_TYPE,
+    ahash_password,
+    claim_token,
     create_access_token,
     create_refresh_token,
+    get_password_hash,
+    password_needs_rehash,
+    revoke_token,
     verify_password,
+    verify_password_cached,
     verify_token,
 )
+from app.db.session import async_session_maker
 from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# How long refresh may act on cached user state (is_active, email, role)
+USER_STATE_CACHE_TTL = 30
+
+# Logins within this window of the previous one don't rewrite last_login
+LAST_LOGIN_RESOLUTION = timedelta(minutes=1)
+
+# Verified against when the email is unknown, so a missing user costs the
+# same hash as a wrong password and can't be told apart by timing
+_DUMMY_HASH = get_password_hash("invalid")
+
+
+async def _update_last_login(user_id: UUID) -> None:
+    """
+    Record a login timestamp in its own short transaction.
+
+    Runs as a background task after the login response is sent. Repeated
+    logins within LAST_LOGIN_RESOLUTION are coalesced into a no-op.
+
+    Args:
+        user_id: The user's ID
+    """
+    try:
+        async with async_session_maker() as session:
+            await session.execute(
+                update(User)
+                .where(
+                    User.id == user_id,
+                    or_(
+                        User.last_login.is_(None),
+                        User.last_login < func.now() - LAST_LOGIN_RESOLUTION,
+                    ),
+                )
+                .values(last_login=func.now())
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+    except Exception as e:
+        logger.warning("Failed to update last_login for user %s: %s", user_id, e)
+
+
+async def _get_user_state(db: DbSession, user_id: UUID) -> Optional[dict[str, Any]]:
+    """
+    Get the user fields needed to mint tokens, read-through Redis.
+
+    Args:
+        db: Database session
+        user_id: The user's ID
+
+    Returns:
+        Dict with is_active, email and role, or None if the user does not exist
+    """
+    key = CacheKeys.user(str(user_id))
+    state = await cache.get(key)
+    if state is not None:
+        return state
+
+    result = await db.execute(
+        select(User.is_active, User.email, User.role).where(User.id == user_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    state = {
+        "is_active": row.is_active,
+        "email": row.email,
+        "role": row.role.value,
+    }
+    await cache.set(key, state, ttl_seconds=USER_STATE_CACHE_TTL)
+    return state
+
 
 @router.post(
     "/login",
     response_model=TokenResponse,
     summary="User login",
     description="Authenticate user and return JWT tokens.",
+    dependencies=[Depends(rate_limit_by_ip("login"))],
 )
 async def login(
     db: DbSession,
     request: LoginRequest,
+    background_tasks: BackgroundTasks,
 ) -> TokenResponse:
     """
     Authenticate user with email and password.
 
     Returns access and refresh tokens on success.
     """
-    # Find user by email
-    result = await db.execute(
-        select(User).where(User.email == request.email)
-    )
-    user = result.scalar_one_or_none()
+    await enforce_rate_limit("login", f"email:{request.email.lower()}")
+
+    # Cap in-flight logins per account so a flood of requests for one
+    # email cannot queue unbounded password hashing
+    slot_key = CacheKeys.login_active(request.email)
+    slot_id = secrets.token_hex(4)
+    if not await cache.acquire_slot(
+        slot_key,
+        slot_id,
+        limit=settings.LOGIN_MAX_CONCURRENT,
+        window_seconds=settings.LOGIN_CONCURRENCY_WINDOW,
+    ):
+        logger.warning("Too many concurrent logins for email: %s", request.email)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many concurrent login attempts",
+        )
+
+    try:
+        # Find user by email, ignoring case (covered by idx_users_email_lower,
+        # no heap fetch needed)
+        result = await db.execute(
+            select(
+                User.id,
+                User.hashed_password,
+                User.is_active,
+                User.email,
+                User.role,
+            ).where(func.lower(User.email) == request.email.lower())
+        )
+        user = result.one_or_none()
+
+        if user is None:
+            await verify_password(request.password, _DUMMY_HASH)
+            verified = False
+        else:
+            verified = await verify_password_cached(
+                str(user.id), request.password, user.hashed_password
+            )
+    finally:
+        await cache.release_slot(slot_key, slot_id)
 
     # Verify credentials
-    if not user or not verify_password(request.password, user.hashed_password):
-        logger.warning(f"Failed login attempt for email: {request.email}")
+    if not verified or user is None:
+        logger.warning("Failed login attempt for email: %s", request.email)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -59,15 +185,24 @@ async def login(
 
     # Check if user is active
     if not user.is_active:
-        logger.warning(f"Login attempt for inactive user: {user.id}")
+        logger.warning("Login attempt for inactive user: %s", user.id)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is deactivated",
         )
 
-    # Update last login
-    user.last_login = datetime.utcnow()
-    db.add(user)
+    # Upgrade legacy bcrypt / outdated argon2 hashes while we have the password
+    if password_needs_rehash(user.hashed_password):
+        new_hash = await ahash_password(request.password)
+        await db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(hashed_password=new_hash)
+            .execution_options(synchronize_session=False)
+        )
+
+    # Update last login after the response is sent
+    background_tasks.add_task(_update_last_login, user.id)
 
     # Create tokens
     access_token = create_access_token(
@@ -81,7 +216,7 @@ async def login(
         subject=str(user.id),
     )
 
-    logger.info(f"User logged in: {user.id}")
+    logger.info("User logged in: %s", user.id)
 
     return TokenResponse(
         access_token=access_token,
@@ -96,6 +231,7 @@ async def login(
     response_model=TokenResponse,
     summary="Refresh tokens",
     description="Get new access token using refresh token.",
+    dependencies=[Depends(rate_limit_by_ip("refresh"))],
 )
 async def refresh_token(
     db: DbSession,
@@ -104,30 +240,21 @@ async def refresh_token(
     """
     Refresh access token using a valid refresh token.
     """
-    # Verify refresh token
+    # Verify the refresh token and claim it in one step (rotation): of
+    # concurrent requests presenting the same token only one gets through
     payload = verify_token(request.refresh_token, REFRESH_TOKEN_TYPE)
-    if not payload:
+    if not payload or not await claim_token(payload):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired refresh token",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-        )
-
-    # Verify user still exists and is active
-    from uuid import UUID
-    result = await db.execute(
-        select(User).where(User.id == UUID(user_id))
-    )
-    user = result.scalar_one_or_none()
+    # Verify user still exists and is active (cached for a few seconds)
+    user_id = payload["sub"]
+    user = await _get_user_state(db, user_id)
 
-    if not user or not user.is_active:
+    if not user or not user["is_active"]:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
@@ -135,17 +262,17 @@ async def refresh_token(
 
     # Create new tokens
     access_token = create_access_token(
-        subject=str(user.id),
+        subject=str(user_id),
         extra_claims={
-            "email": user.email,
-            "role": user.role.value,
+            "email": user["email"],
+            "role": user["role"],
         },
     )
     new_refresh_token = create_refresh_token(
-        subject=str(user.id),
+        subject=str(user_id),
     )
 
-    logger.info(f"Tokens refreshed for user: {user.id}")
+    logger.info("Tokens refreshed for user: %s", user_id)
 
     return TokenResponse(
         access_token=access_token,
@@ -174,18 +301,18 @@ async def get_me(
     "/logout",
     status_code=status.HTTP_204_NO_CONTENT,
     summary="User logout",
-    description="Logout current user (client should discard tokens).",
+    description="Logout current user and revoke the presented access token.",
 )
 async def logout(
-    current_user: CurrentUser,
+    claims: CurrentClaims,
 ) -> None:
     """
     Logout user.
 
-    Note: Since JWTs are stateless, actual invalidation requires
-    implementing a token blacklist (e.g., in Redis).
-    For MVP, client should discard tokens.
+    The access token's jti is added to the Redis revocation list until
+    the token expires. Refresh tokens are revoked when they are rotated,
+    so clients should still discard theirs.
     """
-    logger.info(f"User logged out: {current_user.id}")
-    # TODO: Add token to blacklist in Redis for production
+    await revoke_token(claims)
+    logger.info("User logged out: %s", claims["sub"])
     return None
@@ -1,12 +1,14 @@
 """Loans API Router."""
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-from app.api.deps import AnalystUser, CurrentUser, DbSession
+from app.api.deps import AnalystUser, CurrentClaims, CurrentUser, DbSession
 from app.api.v1.loans.schemas import (
+    CountryCode,
     LoanCreateRequest,
     LoanDetailResponse,
     LoanListResponse,
@@ -20,7 +22,8 @@ from app.core.exceptions import (
     LoanNotFoundError,
     ValidationError,
 )
-from app.models.loan import LoanStatus
+from app.db.session import async_session_maker
+from app.models.loan import APPROVAL_STATUSES, LoanStatus
 from app.services.loan_service import LoanService
 
 logger = logging.getLogger(__name__)
@@ -64,7 +67,7 @@ async def create_loan(
             user_id=current_user.id,
         )
 
-        logger.info(f"Loan created: {loan.id} by user {current_user.id}")
+        logger.info("Loan created: %s by user %s", loan.id, current_user.id)
         return LoanResponse.from_orm_with_decryption(loan)
 
     except CountryNotSupportedError as e:
@@ -87,8 +90,8 @@ async def create_loan(
 )
 async def list_loans(
     db: DbSession,
-    current_user: CurrentUser,
-    country_code: Optional[str] = Query(
+    claims: CurrentClaims,
+    country_code: Optional[CountryCode] = Query(
         None,
         description="Filter by country code",
         examples=["ES"],
@@ -104,27 +107,114 @@ async def list_loans(
     ),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-) -> LoanListResponse:
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor (next_cursor of the previous page); overrides page",
+    ),
+) -> ORJSONResponse:
     """
     List loan applications with filters and pagination.
+
+    Page-based requests return total and pages. Passing ``cursor`` switches
+    to keyset pagination, which stays O(page_size) at any depth and skips
+    the count.
     """
     service = LoanService(db)
 
     skip = (page - 1) * page_size
 
-    loans, total = await service.list_loans(
-        country_code=country_code.upper() if country_code else None,
-        status=status_filter,
-        requires_review=requires_review,
-        skip=skip,
-        limit=page_size,
-    )
+    try:
+        loans, total, next_cursor = await service.list_loans(
+            country_code=country_code,
+            status=status_filter,
+            requires_review=requires_review,
+            skip=skip,
+            limit=page_size,
+            cursor=cursor,
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": e.message, "errors": e.errors},
+        )
 
-    return LoanListResponse.from_results(
+    response = LoanListResponse.from_results(
         items=list(loans),
         total=total,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
+    )
+
+    # Returned as a Response so FastAPI doesn't re-validate the page
+    # against response_model (which is kept for the OpenAPI schema)
+    return ORJSONResponse(content=response.to_content())
+
+
+async def _stream_loan_lines(
+    *,
+    country_code: Optional[str],
+    status: Optional[LoanStatus],
+    requires_review: Optional[bool],
+    limit: int,
+) -> AsyncIterator[str]:
+    """
+    Yield NDJSON lines for the loan stream.
+
+    Opens its own session: the request-scoped DbSession dependency is
+    closed before a StreamingResponse body is sent.
+    """
+    async with async_session_maker() as session:
+        service = LoanService(session)
+        async for partition in service.stream_loans(
+            country_code=country_code,
+            status=status,
+            requires_review=requires_review,
+            limit=limit,
+        ):
+            for item in LoanResponse.from_orm_batch(list(partition)):
+                yield item.model_dump_json() + "\n"
+
+
+@router.get(
+    "/stream",
+    summary="Stream loan applications",
+    description="Stream loan applications as NDJSON, newest first, one object per line.",
+    response_class=StreamingResponse,
+)
+async def stream_loans(
+    claims: CurrentClaims,
+    country_code: Optional[CountryCode] = Query(
+        None,
+        description="Filter by country code",
+        examples=["ES"],
+    ),
+    status_filter: Optional[LoanStatus] = Query(
+        None,
+        alias="status",
+        description="Filter by status",
+    ),
+    requires_review: Optional[bool] = Query(
+        None,
+        description="Filter by review requirement",
+    ),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum loans to stream"),
+) -> StreamingResponse:
+    """
+    Stream loan applications for exports and large views.
+
+    Rows are read from a server-side cursor and written as they are
+    decrypted, so the first bytes go out before the last row is read.
+    Use GET /loans for paginated UIs.
+    """
+    return StreamingResponse(
+        _stream_loan_lines(
+            country_code=country_code,
+            status=status_filter,
+            requires_review=requires_review,
+            limit=limit,
+        ),
+        media_type="application/x-ndjson",
     )
 
 
@@ -136,8 +226,8 @@ async def list_loans(
 )
 async def get_statistics(
     db: DbSession,
-    current_user: CurrentUser,
-    country_code: Optional[str] = Query(
+    claims: CurrentClaims,
+    country_code: Optional[CountryCode] = Query(
         None,
         description="Filter by country code",
     ),
@@ -148,8 +238,8 @@ async def get_statistics(
     service = LoanService(db)
 
     stats = await service.get_statistics(
-        country_code=country_code.upper() if country_code else None,
-        use_cache=False,
+        country_code=country_code,
+        use_cache=True,
     )
 
     return LoanStatisticsResponse(**stats)
@@ -163,7 +253,7 @@ async def get_statistics(
 )
 async def get_loan(
     db: DbSession,
-    current_user: CurrentUser,
+    claims: CurrentClaims,
     loan_id: UUID,
 ) -> LoanDetailResponse:
     """
@@ -195,7 +285,7 @@ async def get_loan(
 )
 async def get_loan_history(
     db: DbSession,
-    current_user: CurrentUser,
+    claims: CurrentClaims,
     loan_id: UUID,
 ) -> list[LoanStatusHistoryResponse]:
     """
@@ -239,7 +329,7 @@ async def update_loan_status(
 
     try:
         # Check if user can approve (ANALYST or ADMIN)
-        if request.status in (LoanStatus.APPROVED, LoanStatus.REJECTED):
+        if request.status in APPROVAL_STATUSES:
             if not current_user.can_approve_loans:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
@@ -254,8 +344,10 @@ async def update_loan_status(
         )
 
         logger.info(
-            f"Loan {loan_id} status updated to {request.status.value} "
-            f"by user {current_user.id}"
+            "Loan %s status updated to %s by user %s",
+            loan_id,
+            request.status.value,
+            current_user.id,
         )
 
         return LoanResponse.from_orm_with_decryption(loan)
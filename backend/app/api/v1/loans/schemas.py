@@ -1,21 +1,25 @@
 """Loans API Schemas."""
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Optional
+from typing import Annotated, Any, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, StringConstraints, TypeAdapter, field_validator
 
-from app.models.loan import LoanStatus
+from app.models.loan import LoanApplication, LoanStatus
+
+# ISO 2-letter country code, normalized to upper case during validation
+CountryCode = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, to_upper=True, min_length=2, max_length=2),
+]
 
 
 class LoanCreateRequest(BaseModel):
     """Request schema for creating a loan application."""
 
-    country_code: str = Field(
+    country_code: CountryCode = Field(
         ...,
-        min_length=2,
-        max_length=2,
         description="ISO 2-letter country code (ES, MX, CO, BR)",
         examples=["ES"],
     )
@@ -55,12 +59,6 @@ class LoanCreateRequest(BaseModel):
         examples=[3500.00],
     )
 
-    @field_validator("country_code")
-    @classmethod
-    def validate_country_code(cls, v: str) -> str:
-        """Validate and uppercase country code."""
-        return v.upper()
-
     @field_validator("document_type")
     @classmethod
     def validate_document_type(cls, v: str) -> str:
@@ -117,6 +115,44 @@ class LoanResponse(BaseModel):
             processed_at=obj.processed_at,
         )
 
+    @classmethod
+    def from_orm_batch(cls, items: list) -> list["LoanResponse"]:
+        """
+        Create responses for a page of ORM objects, decrypting PII in bulk.
+
+        Values come straight from trusted ORM rows, so the models are built
+        with model_construct and skip per-field validation.
+
+        Args:
+            items: LoanApplication ORM objects
+
+        Returns:
+            LoanResponses in input order
+        """
+        LoanApplication.decrypt_many(items, ("full_name",))
+        return [
+            cls.model_construct(
+                id=obj.id,
+                country_code=obj.country_code,
+                document_type=obj.document_type,
+                full_name=obj.decrypted_full_name,
+                amount_requested=obj.amount_requested,
+                monthly_income=obj.monthly_income,
+                currency=obj.currency,
+                status=obj.status,
+                risk_score=obj.risk_score,
+                requires_review=obj.requires_review,
+                created_at=obj.created_at,
+                updated_at=obj.updated_at,
+                processed_at=obj.processed_at,
+            )
+            for obj in items
+        ]
+
+
+# Serializer for list pages, built once at import
+LOAN_LIST_ADAPTER = TypeAdapter(list[LoanResponse])
+
 
 class LoanDetailResponse(LoanResponse):
     """Detailed response including banking info and metadata."""
@@ -129,29 +165,54 @@ class LoanListResponse(BaseModel):
     """Response schema for paginated loan list."""
 
     items: list[LoanResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
     @classmethod
     def from_results(
         cls,
         items: list,
-        total: int,
+        total: Optional[int],
         page: int,
         page_size: int,
+        next_cursor: Optional[str] = None,
     ) -> "LoanListResponse":
-        """Create response from query results with decrypted PII."""
-        pages = (total + page_size - 1) // page_size if page_size > 0 else 0
-        return cls(
-            items=[LoanResponse.from_orm_with_decryption(item) for item in items],
+        """
+        Create response from query results with decrypted PII.
+
+        total and pages are omitted (None) for cursor-paginated requests.
+        """
+        pages = None
+        if total is not None:
+            pages = (total + page_size - 1) // page_size if page_size > 0 else 0
+        return cls.model_construct(
+            items=LoanResponse.from_orm_batch(items),
             total=total,
             page=page,
             page_size=page_size,
             pages=pages,
+            next_cursor=next_cursor,
         )
 
+    def to_content(self) -> dict[str, Any]:
+        """
+        Dump to JSON-compatible data, serializing items with LOAN_LIST_ADAPTER.
+
+        Returns:
+            Dict ready to be passed to a JSON response
+        """
+        return {
+            "items": LOAN_LIST_ADAPTER.dump_python(self.items, mode="json"),
+            "total": self.total,
+            "page": self.page,
+            "page_size": self.page_size,
+            "pages": self.pages,
+            "next_cursor": self.next_cursor,
+        }
+
 
 class LoanStatusUpdateRequest(BaseModel):
     """Request schema for updating loan status."""
@@ -171,8 +232,8 @@ class LoanStatusHistoryResponse(BaseModel):
     """Response schema for status history entry."""
 
     id: UUID
-    previous_status: Optional[str]
-    new_status: str
+    previous_status: Optional[LoanStatus]
+    new_status: LoanStatus
     changed_by: Optional[UUID]
     reason: Optional[str]
     created_at: datetime
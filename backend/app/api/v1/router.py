@@ -6,6 +6,7 @@ from app.api.v1.health.router import router as health_router
 from app.api.v1.loans.router import router as loans_router
 from app.api.v1.webhooks.router import router as webhooks_router
 
+# Responses use the app's default_response_class (ORJSONResponse)
 api_router = APIRouter()
 
 # Include health check routes
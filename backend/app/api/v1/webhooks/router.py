@@ -1,12 +1,14 @@
 """Webhooks API Router."""
-import hashlib
+import base64
+import binascii
 import hmac
 import logging
-from datetime import datetime
-from typing import Optional
-from uuid import UUID
+from functools import lru_cache
+from typing import Annotated, NamedTuple, Optional
 
-from fastapi import APIRouter, Header, HTTPException, Request, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy import select
 
 from app.api.deps import DbSession
@@ -16,188 +18,196 @@ from app.api.v1.webhooks.schemas import (
     WebhookResponse,
 )
 from app.core.config import settings
-from app.models.loan import LoanApplication, LoanStatus
+from app.db.base import uuid7
 from app.models.webhook_event import WebhookEvent
-from app.repositories.job_repository import JobRepository
+from app.services.webhook_service import (
+    QUEUED_MESSAGE,
+    QueuedWebhook,
+    persist_webhooks,
+    webhook_batcher,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
 
 
-def verify_webhook_signature(
-    payload: bytes,
-    signature: str,
-    secret: str,
-) -> bool:
+@lru_cache(maxsize=8)
+def _hmac_template(secret: str) -> hmac.HMAC:
+    """
+    Build a keyed HMAC-SHA256 object to copy per request.
+
+    The inner/outer key pads are derived once here; .copy() clones the
+    keyed state, so each verify only hashes the body.
+    """
+    return hmac.new(secret.encode(), digestmod="sha256")
+
+
+def _decode_signature(signature: str, binary: bool) -> Optional[bytes]:
+    """Decode a signature header to the raw digest, or None if malformed."""
+    try:
+        if binary:
+            return base64.b64decode(signature, validate=True)
+        return binascii.unhexlify(signature)
+    except ValueError:
+        # binascii.Error is a ValueError subclass
+        return None
+
+
+def _signature_matches(expected: bytes, signature: str, binary: bool) -> bool:
+    """Compare a computed digest against a signature header value."""
+    received = _decode_signature(signature, binary)
+    if received is None:
+        return False
+
+    # Use constant-time comparison to prevent timing attacks
+    return hmac.compare_digest(expected, received)
+
+
+async def _read_signed_body(request: Request, secret: str) -> tuple[bytes, bytes]:
     """
-    Verify HMAC-SHA256 signature of webhook payload.
+    Read the request body, feeding each chunk to the HMAC as it arrives.
 
     Args:
-        payload: Raw request body
-        signature: Signature from header
+        request: Incoming request
         secret: Webhook secret key
 
     Returns:
-        True if signature is valid
+        Tuple of (raw body, HMAC-SHA256 digest of the body)
     """
-    expected = hmac.new(
-        secret.encode(),
-        payload,
-        hashlib.sha256,
-    ).hexdigest()
+    mac = _hmac_template(secret).copy()
+    chunks = []
+    async for chunk in request.stream():
+        mac.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), mac.digest()
 
-    # Use constant-time comparison to prevent timing attacks
-    return hmac.compare_digest(expected, signature)
 
+class SignedWebhook(NamedTuple):
+    """Raw webhook body that passed signature verification."""
 
-@router.post(
-    "/banking/{country_code}",
-    response_model=WebhookResponse,
-    summary="Receive banking webhook",
-    description="Endpoint for receiving webhooks from banking providers. Requires valid HMAC signature.",
-)
-async def receive_banking_webhook(
-    db: DbSession,
+    body: bytes
+    signature: str
+
+
+async def verified_webhook_body(
     request: Request,
     country_code: str,
-    payload: BankingWebhookPayload,
     x_webhook_signature: Optional[str] = Header(
         None,
         description="HMAC-SHA256 signature of the payload",
     ),
-) -> WebhookResponse:
+    x_webhook_signature_bin: Optional[str] = Header(
+        None,
+        description="Base64 raw HMAC-SHA256 digest; takes precedence over the hex header",
+    ),
+) -> SignedWebhook:
     """
-    Receive and process webhooks from banking providers.
+    Dependency that authenticates a webhook before anything parses it.
 
-    Process:
-    1. Verify HMAC signature
-    2. Store webhook event
-    3. Find related loan
-    4. Process event (update loan, enqueue jobs)
-    """
-    country_code = country_code.upper()
+    Args:
+        request: Incoming request
+        country_code: Provider country from the path
+        x_webhook_signature: Hex signature header
+        x_webhook_signature_bin: Base64 raw-digest signature header
 
-    # Get raw body for signature verification
-    body = await request.body()
+    Returns:
+        The signed raw body and the signature it was verified against
 
-    # Verify signature
-    if not x_webhook_signature:
-        logger.warning(f"Webhook received without signature from {country_code}")
+    Raises:
+        HTTPException: 401 if the signature is missing or invalid
+    """
+    binary_signature = x_webhook_signature_bin is not None
+    signature = x_webhook_signature_bin if binary_signature else x_webhook_signature
+    if not signature:
+        logger.warning("Webhook received without signature from %s", country_code.upper())
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing webhook signature",
         )
 
-    if not verify_webhook_signature(body, x_webhook_signature, settings.WEBHOOK_SECRET):
-        logger.warning(f"Invalid webhook signature from {country_code}")
+    # The body is hashed while it streams in
+    body, expected = await _read_signed_body(request, settings.WEBHOOK_SECRET)
+    if not _signature_matches(expected, signature, binary_signature):
+        logger.warning("Invalid webhook signature from %s", country_code.upper())
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid webhook signature",
         )
 
-    # Create webhook event record
-    webhook_event = WebhookEvent(
-        source=f"banking_provider_{country_code}",
-        event_type=payload.event_type,
-        payload=payload.model_dump(mode="json"),
-        signature=x_webhook_signature,
-        processed=False,
-    )
-    db.add(webhook_event)
+    return SignedWebhook(body=body, signature=signature)
 
-    # Try to find related loan
-    loan: Optional[LoanApplication] = None
-    try:
-        # Try to parse as UUID first
-        loan_id = UUID(payload.loan_reference)
-        result = await db.execute(
-            select(LoanApplication).where(LoanApplication.id == loan_id)
-        )
-        loan = result.scalar_one_or_none()
-    except ValueError:
-        # Not a UUID, try document_hash
-        result = await db.execute(
-            select(LoanApplication).where(
-                LoanApplication.document_hash == payload.loan_reference
-            )
-        )
-        loan = result.scalar_one_or_none()
 
-    if loan:
-        webhook_event.loan_id = loan.id
+# The body is read by verified_webhook_body, so document it explicitly
+_BANKING_WEBHOOK_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": BankingWebhookPayload.model_json_schema()},
+        },
+    },
+}
 
-    # Process the webhook
-    processed = False
-    message = "Webhook received and queued for processing"
 
+@router.post(
+    "/banking/{country_code}",
+    response_model=WebhookResponse,
+    summary="Receive banking webhook",
+    description="Endpoint for receiving webhooks from banking providers. Requires valid HMAC signature.",
+    openapi_extra=_BANKING_WEBHOOK_BODY,
+)
+async def receive_banking_webhook(
+    db: DbSession,
+    country_code: str,
+    signed: Annotated[SignedWebhook, Depends(verified_webhook_body)],
+) -> WebhookResponse:
+    """
+    Receive and process webhooks from banking providers.
+
+    Process:
+    1. Verify HMAC signature (dependency), then validate the payload
+    2. Hand the webhook to the background batcher and acknowledge
+    3. The batcher finds related loans, applies updates, and stores the
+       events and their audit jobs with one statement each per batch
+    """
+    country_code = country_code.upper()
+
+    # Validates straight from bytes; only reached for signed requests
     try:
-        if loan and payload.event_type == "status_update" and payload.status:
-            # Map external status to our status
-            status_mapping = {
-                "approved": LoanStatus.APPROVED,
-                "rejected": LoanStatus.REJECTED,
-                "verified": LoanStatus.VALIDATING,
-                "disbursed": LoanStatus.DISBURSED,
-            }
-
-            new_status = status_mapping.get(payload.status.lower())
-            if new_status and loan.status != new_status:
-                # Update loan status
-                loan.status = new_status
-                if new_status in (LoanStatus.APPROVED, LoanStatus.REJECTED, LoanStatus.DISBURSED):
-                    loan.processed_at = datetime.utcnow()
-
-                db.add(loan)
-                processed = True
-                message = f"Loan {loan.id} status updated to {new_status.value}"
-
-                logger.info(f"Webhook updated loan {loan.id} to {new_status.value}")
-
-        elif loan and payload.event_type == "risk_assessment" and payload.risk_score is not None:
-            # Update risk score
-            loan.risk_score = payload.risk_score
-            db.add(loan)
-            processed = True
-            message = f"Loan {loan.id} risk score updated to {payload.risk_score}"
-
-            logger.info(f"Webhook updated loan {loan.id} risk score to {payload.risk_score}")
-
-        # Mark webhook as processed
-        webhook_event.processed = processed
-        webhook_event.processed_at = datetime.utcnow() if processed else None
-
-        # Enqueue audit job
-        job_repo = JobRepository(db)
-        await job_repo.enqueue(
-            queue_name="audit",
-            payload={
-                "entity_type": "webhook_event",
-                "entity_id": str(webhook_event.id),
-                "action": "WEBHOOK_RECEIVED",
-                "changes": {
-                    "source": webhook_event.source,
-                    "event_type": payload.event_type,
-                    "loan_id": str(loan.id) if loan else None,
-                    "processed": processed,
-                },
-            },
+        payload = BankingWebhookPayload.model_validate_json(signed.body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)],
+            body=signed.body,
         )
 
-    except Exception as e:
-        logger.exception(f"Error processing webhook: {e}")
-        webhook_event.processing_error = str(e)
-        message = f"Webhook received but processing failed: {str(e)}"
+    item = QueuedWebhook(
+        event_id=uuid7(),
+        source=f"banking_provider_{country_code}",
+        payload=payload,
+        signature=signed.signature,
+    )
+
+    # Acknowledge now; the batcher applies and stores the webhook shortly after
+    if webhook_batcher.submit(item):
+        return WebhookResponse(
+            event_id=item.event_id,
+            processed=False,
+            message=QUEUED_MESSAGE,
+        )
 
-    await db.flush()
+    # Batcher not running or full: persist on the request path instead
+    [(processed, message)] = await persist_webhooks(db, [item])
 
     logger.info(
-        f"Webhook received: source={webhook_event.source}, "
-        f"type={payload.event_type}, processed={processed}"
+        "Webhook received: source=%s, type=%s, processed=%s",
+        item.source,
+        payload.event_type,
+        processed,
     )
 
     return WebhookResponse(
-        event_id=webhook_event.id,
+        event_id=item.event_id,
         processed=processed,
         message=message,
     )
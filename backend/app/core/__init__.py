@@ -1,34 +1,62 @@
-"""Core Package - Configuration and utilities."""
-from app.core.cache import CacheKeys, RedisCache, cache, get_cache
-from app.core.config import settings
-from app.core.exceptions import (
-    BaseAPIException,
-    ConflictError,
-    CountryNotSupportedError,
-    ExternalServiceError,
-    ForbiddenError,
-    LoanNotFoundError,
-    NotFoundError,
-    UnauthorizedError,
-    ValidationError,
-)
-
-__all__ = [
+"""Core Package - Configuration and utilities.
+
+Exports are resolved lazily (PEP 562), so importing a submodule such as
+app.core.config does not also load the Redis client.
+"""
+import sys
+from importlib import import_module
+from types import ModuleType
+from typing import Any
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
     # Config
-    "settings",
+    "settings": "app.core.config",
     # Cache
-    "RedisCache",
-    "CacheKeys",
-    "cache",
-    "get_cache",
+    "RedisCache": "app.core.cache",
+    "CacheKeys": "app.core.cache",
+    "cache": "app.core.cache",
+    "get_cache": "app.core.cache",
     # Exceptions
-    "BaseAPIException",
-    "ValidationError",
-    "NotFoundError",
-    "LoanNotFoundError",
-    "CountryNotSupportedError",
-    "UnauthorizedError",
-    "ForbiddenError",
-    "ConflictError",
-    "ExternalServiceError",
-]
+    "BaseAPIException": "app.core.exceptions",
+    "ValidationError": "app.core.exceptions",
+    "NotFoundError": "app.core.exceptions",
+    "LoanNotFoundError": "app.core.exceptions",
+    "CountryNotSupportedError": "app.core.exceptions",
+    "UnauthorizedError": "app.core.exceptions",
+    "ForbiddenError": "app.core.exceptions",
+    "ConflictError": "app.core.exceptions",
+    "ExternalServiceError": "app.core.exceptions",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported name from its submodule on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Include the lazy exports in dir()."""
+    return sorted(set(globals()) | set(__all__))
+
+
+class _CoreModule(ModuleType):
+    """Package module type that keeps exports from being shadowed."""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Importing app.core.cache binds the submodule as the package's
+        # "cache" attribute; store the exported instance instead, as the
+        # eager re-exports used to
+        if isinstance(value, ModuleType) and _EXPORTS.get(name) == value.__name__:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _CoreModule
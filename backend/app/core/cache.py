@@ -1,24 +1,107 @@
 """Redis cache layer for application caching."""
-import json
+import inspect
 import logging
+import time
+from decimal import Decimal
 from typing import Any, Optional
 
+import orjson
 import redis.asyncio as redis
+from redis.commands.core import AsyncScript
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# datetime/UUID/enum serialize natively; naive datetimes are stamped as UTC
+CACHE_DUMPS_OPTIONS = orjson.OPT_NAIVE_UTC
+
+
+def _json_default(value: Any) -> Any:
+    """
+    Encode the types orjson has no native support for.
+
+    Only Decimal (loan amounts) is expected; anything else is a bug and
+    raises instead of being silently cached as its str().
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not cacheable: {type(value).__name__}")
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a cache value to JSON bytes."""
+    return orjson.dumps(value, default=_json_default, option=CACHE_DUMPS_OPTIONS)
+
+
+# Atomically drop expired slots, then take one if under the limit.
+# KEYS[1] = slot set, ARGV = now, window, limit, slot id
+ACQUIRE_SLOT_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+if redis.call('ZCARD', key) >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('EXPIRE', key, math.ceil(window * 2))
+return 1
+"""
+
+# Token bucket: refill by elapsed time, then take one token if available.
+# KEYS[1] = bucket hash, ARGV = capacity, refill per second, now.
+# Returns {allowed (0/1), seconds until a token is available}.
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+return {allowed, retry_after}
+"""
+
+# SCAN the keyspace server-side and UNLINK every match (memory is freed
+# in a background thread). KEYS[1] = MATCH pattern. Returns keys removed.
+UNLINK_PATTERN_SCRIPT = """
+local cursor = '0'
+local removed = 0
+repeat
+    local page = redis.call('SCAN', cursor, 'MATCH', KEYS[1], 'COUNT', 500)
+    cursor = page[1]
+    if #page[2] > 0 then
+        removed = removed + redis.call('UNLINK', unpack(page[2]))
+    end
+until cursor == '0'
+return removed
+"""
+
 
 class RedisCache:
     """
     Redis-based cache implementation.
 
-    Provides async get/set/delete operations with JSON serialization.
+    Provides async get/set/delete operations with JSON (orjson) serialization.
     """
 
     _instance: Optional["RedisCache"] = None
     _redis: Optional[redis.Redis] = None
+    _acquire_slot: Optional[AsyncScript] = None
+    _take_token: Optional[AsyncScript] = None
+    _unlink_pattern: Optional[AsyncScript] = None
 
     def __new__(cls) -> "RedisCache":
         """Singleton pattern for cache instance."""
@@ -30,23 +113,33 @@ class RedisCache:
         """Connect to Redis."""
         if self._redis is None:
             try:
+                # Bytes mode: values go straight to orjson.loads without a
+                # UTF-8 decode pass; INFO and integer replies are unaffected
                 self._redis = redis.from_url(
                     settings.REDIS_URL,
-                    encoding="utf-8",
-                    decode_responses=True,
+                    decode_responses=False,
                 )
+                self._acquire_slot = self._redis.register_script(ACQUIRE_SLOT_SCRIPT)
+                self._take_token = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+                self._unlink_pattern = self._redis.register_script(UNLINK_PATTERN_SCRIPT)
                 # Test connection
                 await self._redis.ping()
                 logger.info("Connected to Redis cache")
             except Exception as e:
-                logger.error(f"Failed to connect to Redis: {e}")
+                logger.error("Failed to connect to Redis: %s", e)
                 self._redis = None
+                self._acquire_slot = None
+                self._take_token = None
+                self._unlink_pattern = None
 
     async def disconnect(self) -> None:
         """Disconnect from Redis."""
         if self._redis:
             await self._redis.close()
             self._redis = None
+            self._acquire_slot = None
+            self._take_token = None
+            self._unlink_pattern = None
             logger.info("Disconnected from Redis cache")
 
     @property
@@ -70,10 +163,10 @@ class RedisCache:
         try:
             data = await self._redis.get(key)
             if data:
-                return json.loads(data)
+                return orjson.loads(data)
             return None
         except Exception as e:
-            logger.warning(f"Cache get error for key {key}: {e}")
+            logger.warning("Cache get error for key %s: %s", key, e)
             return None
 
     async def set(
@@ -97,13 +190,41 @@ class RedisCache:
             return False
 
         try:
-            serialized = json.dumps(value, default=str)
-            await self._redis.setex(key, ttl_seconds, serialized)
+            await self._redis.setex(key, ttl_seconds, _dumps(value))
             return True
         except Exception as e:
-            logger.warning(f"Cache set error for key {key}: {e}")
+            logger.warning("Cache set error for key %s: %s", key, e)
             return False
 
+    async def set_if_absent(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: int,
+    ) -> bool:
+        """
+        Set a value only if the key does not exist (SET NX EX).
+
+        Used as a short-lived lock. Fails open (returns True) if Redis is
+        unavailable, so callers just do the work themselves.
+
+        Args:
+            key: Cache key
+            value: Value to store (must be JSON serializable)
+            ttl_seconds: Time to live in seconds
+
+        Returns:
+            True if the key was set
+        """
+        if not self._redis:
+            return True
+
+        try:
+            return bool(await self._redis.set(key, _dumps(value), ex=ttl_seconds, nx=True))
+        except Exception as e:
+            logger.warning("Cache set_if_absent error for key %s: %s", key, e)
+            return True
+
     async def delete(self, key: str) -> bool:
         """
         Delete a value from cache.
@@ -121,32 +242,30 @@ class RedisCache:
             result = await self._redis.delete(key)
             return result > 0
         except Exception as e:
-            logger.warning(f"Cache delete error for key {key}: {e}")
+            logger.warning("Cache delete error for key %s: %s", key, e)
             return False
 
     async def delete_pattern(self, pattern: str) -> int:
         """
         Delete all keys matching a pattern.
 
+        The scan and unlink run inside one Lua script, so this is a single
+        round trip however many keys or SCAN pages match.
+
         Args:
             pattern: Key pattern (e.g., "loan:*")
 
         Returns:
             Number of keys deleted
         """
-        if not self._redis:
+        script = self._unlink_pattern
+        if script is None:
             return 0
 
         try:
-            keys = []
-            async for key in self._redis.scan_iter(match=pattern):
-                keys.append(key)
-
-            if keys:
-                return await self._redis.delete(*keys)
-            return 0
+            return int(await script(keys=[pattern]))
         except Exception as e:
-            logger.warning(f"Cache delete pattern error for {pattern}: {e}")
+            logger.warning("Cache delete pattern error for %s: %s", pattern, e)
             return 0
 
     async def exists(self, key: str) -> bool:
@@ -165,7 +284,7 @@ class RedisCache:
         try:
             return await self._redis.exists(key) > 0
         except Exception as e:
-            logger.warning(f"Cache exists error for key {key}: {e}")
+            logger.warning("Cache exists error for key %s: %s", key, e)
             return False
 
     async def get_or_set(
@@ -177,9 +296,14 @@ class RedisCache:
         """
         Get value from cache or compute and cache it.
 
+        The computed value is stored with SET NX, so when several callers
+        miss at once the first stored value is kept rather than each
+        caller overwriting it with its own.
+
         Args:
             key: Cache key
-            factory: Async function to compute value if not cached
+            factory: Async or sync function (or a plain value) to compute
+                the value if not cached
             ttl_seconds: TTL in seconds
 
         Returns:
@@ -191,13 +315,17 @@ class RedisCache:
             return value
 
         # Compute value
-        if callable(factory):
-            value = await factory() if hasattr(factory, "__await__") else factory()
+        if inspect.iscoroutinefunction(factory):
+            value = await factory()
+        elif callable(factory):
+            value = factory()
+            if inspect.isawaitable(value):
+                value = await value
         else:
             value = factory
 
-        # Cache the result
-        await self.set(key, value, ttl_seconds)
+        # Cache the result unless another caller already did
+        await self.set_if_absent(key, value, ttl_seconds)
         return value
 
     async def increment(self, key: str, amount: int = 1) -> Optional[int]:
@@ -217,9 +345,95 @@ class RedisCache:
         try:
             return await self._redis.incrby(key, amount)
         except Exception as e:
-            logger.warning(f"Cache increment error for key {key}: {e}")
+            logger.warning("Cache increment error for key %s: %s", key, e)
             return None
 
+    async def acquire_slot(
+        self,
+        key: str,
+        slot_id: str,
+        limit: int,
+        window_seconds: int,
+    ) -> bool:
+        """
+        Take one of ``limit`` concurrent slots under a key.
+
+        Slots older than ``window_seconds`` are treated as abandoned and
+        dropped first, so a crashed request cannot hold a slot forever.
+        Fails open (returns True) if Redis is unavailable.
+
+        Args:
+            key: Slot set key
+            slot_id: Random ID of this request's slot
+            limit: Maximum concurrent slots
+            window_seconds: Maximum slot lifetime
+
+        Returns:
+            True if the slot was acquired
+        """
+        script = self._acquire_slot
+        if script is None:
+            return True
+
+        try:
+            acquired = await script(
+                keys=[key],
+                args=[time.time(), window_seconds, limit, slot_id],
+            )
+            return bool(acquired)
+        except Exception as e:
+            logger.warning("Cache acquire slot error for key %s: %s", key, e)
+            return True
+
+    async def release_slot(self, key: str, slot_id: str) -> None:
+        """
+        Release a slot taken with acquire_slot.
+
+        Args:
+            key: Slot set key
+            slot_id: ID passed to acquire_slot
+        """
+        if not self._redis:
+            return
+
+        try:
+            await self._redis.zrem(key, slot_id)
+        except Exception as e:
+            logger.warning("Cache release slot error for key %s: %s", key, e)
+
+    async def take_token(
+        self,
+        key: str,
+        capacity: int,
+        refill_per_second: float,
+    ) -> tuple[bool, int]:
+        """
+        Take one token from a token bucket in a single round trip.
+
+        Fails open (allows the request) if Redis is unavailable.
+
+        Args:
+            key: Bucket key
+            capacity: Bucket size (maximum burst)
+            refill_per_second: Tokens added per second
+
+        Returns:
+            Tuple of (allowed, seconds until the next token when denied)
+        """
+        script = self._take_token
+        if script is None:
+            return True, 0
+
+        try:
+            allowed, retry_after = await script(
+                keys=[key],
+                args=[capacity, refill_per_second, time.time()],
+            )
+            return bool(allowed), int(retry_after)
+        except Exception as e:
+            logger.warning("Cache take token error for key %s: %s", key, e)
+            return True, 0
+
     async def get_stats(self) -> dict[str, Any]:
         """
         Get cache statistics.
@@ -231,17 +445,21 @@ class RedisCache:
             return {"connected": False}
 
         try:
-            info = await self._redis.info()
+            # INFO and DBSIZE in one round trip
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.info()
+                pipe.dbsize()
+                info, total_keys = await pipe.execute()
             return {
                 "connected": True,
                 "used_memory": info.get("used_memory_human", "N/A"),
                 "connected_clients": info.get("connected_clients", 0),
-                "total_keys": await self._redis.dbsize(),
+                "total_keys": total_keys,
                 "hits": info.get("keyspace_hits", 0),
                 "misses": info.get("keyspace_misses", 0),
             }
         except Exception as e:
-            logger.warning(f"Error getting cache stats: {e}")
+            logger.warning("Error getting cache stats: %s", e)
             return {"connected": True, "error": str(e)}
 
 
@@ -278,11 +496,36 @@ class CacheKeys:
             return f"stats:loans:{country_code}"
         return "stats:loans:all"
 
+    @staticmethod
+    def loan_stats_lock(country_code: Optional[str] = None) -> str:
+        """Lock key for recomputing loan statistics."""
+        return f"stats:lock:{country_code or 'all'}"
+
     @staticmethod
     def user(user_id: str) -> str:
         """Cache key for user data."""
         return f"user:{user_id}"
 
+    @staticmethod
+    def revoked_token(jti: str) -> str:
+        """Cache key for a revoked token ID."""
+        return f"auth:revoked:{jti}"
+
+    @staticmethod
+    def login_active(email: str) -> str:
+        """Cache key for the in-flight login slots of an email."""
+        return f"login:active:{email.lower()}"
+
+    @staticmethod
+    def rate_limit(scope: str, subject: str) -> str:
+        """Cache key for a rate limit token bucket."""
+        return f"rl:{scope}:{subject}"
+
+    @staticmethod
+    def password_verify(user_id: str, digest: str) -> str:
+        """Cache key for a successful password verification."""
+        return f"auth:pwverify:{user_id}:{digest}"
+
 
 # Global cache instance
 cache = RedisCache()
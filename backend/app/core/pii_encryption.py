@@ -2,9 +2,10 @@
 import base64
 import hashlib
 import logging
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
@@ -12,6 +13,30 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# PBKDF2 parameters for the PII key; changing them changes the key
+PII_KDF_SALT = b"loan_pii_salt_v1"  # Fixed salt for consistency
+PII_KDF_ITERATIONS = 100000
+
+
+@lru_cache(maxsize=1)
+def _derive_fernet(secret: str) -> Fernet:
+    """
+    Derive the PII Fernet key from a secret, once per process.
+
+    Args:
+        secret: Secret the key is derived from (JWT_SECRET)
+
+    Returns:
+        Fernet instance for the derived key
+    """
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=PII_KDF_SALT,
+        iterations=PII_KDF_ITERATIONS,
+    )
+    return Fernet(base64.urlsafe_b64encode(kdf.derive(secret.encode())))
+
 
 class PIIEncryption:
     """
@@ -37,19 +62,18 @@ class PIIEncryption:
         Derives encryption key from JWT_SECRET using PBKDF2.
         """
         if self._fernet is None:
-            # Derive a 32-byte key from JWT_SECRET
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=b"loan_pii_salt_v1",  # Fixed salt for consistency
-                iterations=100000,
-            )
-            key = base64.urlsafe_b64encode(
-                kdf.derive(settings.JWT_SECRET.encode())
-            )
-            self._fernet = Fernet(key)
+            self._fernet = _derive_fernet(settings.JWT_SECRET)
         return self._fernet
 
+    def warm_up(self) -> None:
+        """
+        Derive the encryption key now instead of on the first PII request.
+
+        Called at application startup so each worker process pays the
+        PBKDF2 cost during boot.
+        """
+        self._get_fernet()
+
     def encrypt(self, plaintext: str) -> str:
         """
         Encrypt PII data.
@@ -68,7 +92,7 @@ class PIIEncryption:
             encrypted = fernet.encrypt(plaintext.encode("utf-8"))
             return encrypted.decode("utf-8")
         except Exception as e:
-            logger.error(f"Failed to encrypt PII: {e}")
+            logger.error("Failed to encrypt PII: %s", e)
             raise ValueError(f"Encryption failed: {e}")
 
     def decrypt(self, ciphertext: str) -> str:
@@ -89,9 +113,34 @@ class PIIEncryption:
             decrypted = fernet.decrypt(ciphertext.encode("utf-8"))
             return decrypted.decode("utf-8")
         except Exception as e:
-            logger.error(f"Failed to decrypt PII: {e}")
+            logger.error("Failed to decrypt PII: %s", e)
             raise ValueError(f"Decryption failed: {e}")
 
+    def decrypt_many(self, ciphertexts: Sequence[str]) -> list[str]:
+        """
+        Decrypt a batch of PII values with one Fernet instance.
+
+        Values that fail to decrypt are returned as-is (unencrypted legacy
+        data), matching the model's decrypted_* properties.
+
+        Args:
+            ciphertexts: Encrypted strings to decrypt
+
+        Returns:
+            Decrypted plain texts, in input order
+        """
+        decrypt = self._get_fernet().decrypt
+        plaintexts = []
+        for ciphertext in ciphertexts:
+            if not ciphertext:
+                plaintexts.append("")
+                continue
+            try:
+                plaintexts.append(decrypt(ciphertext.encode("utf-8")).decode("utf-8"))
+            except (InvalidToken, UnicodeDecodeError):
+                plaintexts.append(ciphertext)
+        return plaintexts
+
     @staticmethod
     def hash_document(document_number: str, country_code: str) -> str:
         """
@@ -106,8 +155,38 @@ class PIIEncryption:
         Returns:
             SHA256 hash string
         """
-        combined = f"{country_code}:{document_number}".upper().strip()
-        return hashlib.sha256(combined.encode()).hexdigest()
+        # Same bytes as f"{country_code}:{document_number}".upper().strip()
+        # (the ':' stops the strip), fed in pieces without the temporaries
+        digest = hashlib.sha256(country_code.lstrip().upper().encode())
+        digest.update(b":")
+        digest.update(document_number.rstrip().upper().encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_documents_bulk(pairs: Iterable[tuple[str, str]]) -> list[str]:
+        """
+        Hash many (document_number, country_code) pairs.
+
+        The "<COUNTRY>:" prefix is hashed once per country and the
+        hasher state copied for each document.
+
+        Args:
+            pairs: (document_number, country_code) tuples
+
+        Returns:
+            SHA256 hash strings, in input order
+        """
+        prefixes: dict = {}
+        hashes = []
+        for document_number, country_code in pairs:
+            prefix = prefixes.get(country_code)
+            if prefix is None:
+                prefix = hashlib.sha256(country_code.lstrip().upper().encode() + b":")
+                prefixes[country_code] = prefix
+            digest = prefix.copy()
+            digest.update(document_number.rstrip().upper().encode())
+            hashes.append(digest.hexdigest())
+        return hashes
 
 
 # Global instance
@@ -140,6 +219,19 @@ def decrypt_pii(data: str) -> str:
     return pii_encryption.decrypt(data)
 
 
+def decrypt_pii_many(data: Sequence[str]) -> list[str]:
+    """
+    Decrypt a batch of PII values (convenience function).
+
+    Args:
+        data: Encrypted strings to decrypt
+
+    Returns:
+        Decrypted plain texts, in input order
+    """
+    return pii_encryption.decrypt_many(data)
+
+
 def hash_document(document_number: str, country_code: str) -> str:
     """
     Hash document for searchable lookup (convenience function).
@@ -152,3 +244,16 @@ def hash_document(document_number: str, country_code: str) -> str:
         SHA256 hash string
     """
     return PIIEncryption.hash_document(document_number, country_code)
+
+
+def hash_documents_bulk(pairs: Iterable[tuple[str, str]]) -> list[str]:
+    """
+    Hash many documents for searchable lookup (convenience function).
+
+    Args:
+        pairs: (document_number, country_code) tuples
+
+    Returns:
+        SHA256 hash strings, in input order
+    """
+    return PIIEncryption.hash_documents_bulk(pairs)
@@ -1,23 +1,134 @@
 """Security utilities for JWT authentication and password hashing."""
-from datetime import datetime, timedelta
-from typing import Any, Optional
-
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-
+import asyncio
+import base64
+import hmac
+import os
+import re
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+from multiprocessing import get_context
+from typing import Any, Callable, Optional
+from uuid import UUID, uuid4
+
+import bcrypt
+import jwt
+import orjson
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TLRUCache
+
+from app.core.cache import CacheKeys, cache
 from app.core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing (argon2id). One hasher for the process; hashes made
+# with other parameters still verify and are flagged by
+# password_needs_rehash() so login upgrades them.
+password_hasher = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+ARGON2_PREFIX = "$argon2"
+
+# Legacy bcrypt hashes are verified until they are rehashed on login.
+# bcrypt only uses the first 72 bytes; truncate like passlib did.
+BCRYPT_MAX_PASSWORD_BYTES = 72
+# Well-formed modular crypt bcrypt hash (checkpw can panic on truncated ones)
+BCRYPT_HASH_RE = re.compile(r"\A\$2[abxy]\$\d{2}\$[./A-Za-z0-9]{53}\Z")
+
+# Executor that runs hashing off the event loop (see start_hash_executor).
+# argon2 and bcrypt release the GIL, so threads hash in parallel per core;
+# a process pool also keeps hashing spikes off this interpreter entirely.
+_hash_executor: Optional[Executor] = None
 
 # JWT Token types
 ACCESS_TOKEN_TYPE = "access"
 REFRESH_TOKEN_TYPE = "refresh"
 
+# The HS256 header never changes, so it is serialized and encoded once
+HS256_HEADER = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+_JWT_SECRET_KEY = settings.JWT_SECRET.encode()
+
+# Verified token payloads cached per raw token until the token's exp, so a
+# token presented on every request is HMAC-checked once in its lifetime.
+# The same bytes always carry the same signature, so a hit needs no
+# re-verification; revocation is checked separately (is_token_revoked).
+TOKEN_CACHE: TLRUCache = TLRUCache(
+    maxsize=10_000,
+    ttu=lambda token, entry, now: entry[0],
+    timer=time.time,
+)
+_token_cache_lock = threading.Lock()
+
 
 def get_password_hash(password: str) -> str:
     """
-    Hash a password using bcrypt.
+    Hash a password using argon2id.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password string
+    """
+    return password_hasher.hash(password)
+
+
+def start_hash_executor() -> None:
+    """
+    Create the password hashing executor from settings.
+
+    PASSWORD_HASH_EXECUTOR picks a thread or process pool. Processes are
+    spawned rather than forked, so they never inherit the event loop.
+    """
+    global _hash_executor
+    if _hash_executor is not None:
+        return
+
+    cpus = os.cpu_count() or 1
+    if settings.PASSWORD_HASH_EXECUTOR == "process":
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS or cpus,
+            mp_context=get_context("spawn"),
+        )
+    else:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS or min(32, cpus * 2),
+            thread_name_prefix="hash",
+        )
+
+
+def shutdown_hash_executor() -> None:
+    """Shut down the password hashing executor, waiting for running hashes."""
+    global _hash_executor
+    executor, _hash_executor = _hash_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def _run_hash(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a hashing function in the hash executor.
+
+    Falls back to the loop's default executor before start_hash_executor()
+    has run (scripts and tests).
+
+    Args:
+        func: Module-level function, so it can be sent to a process pool
+        *args: Arguments for func
+
+    Returns:
+        The function's return value
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, func, *args)
+
+
+async def ahash_password(password: str) -> str:
+    """
+    Hash a password without blocking the event loop.
 
     Args:
         password: Plain text password
@@ -25,12 +136,12 @@ def get_password_hash(password: str) -> str:
     Returns:
         Hashed password string
     """
-    return pwd_context.hash(password)
+    return await _run_hash(get_password_hash, password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def _verify_password_sync(plain_password: str, hashed_password: str) -> bool:
     """
-    Verify a password against its hash.
+    Verify a password against an argon2 or legacy bcrypt hash.
 
     Args:
         plain_password: Plain text password
@@ -39,7 +150,147 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    if hashed_password.startswith(ARGON2_PREFIX):
+        try:
+            return password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    if not BCRYPT_HASH_RE.match(hashed_password):
+        return False
+
+    try:
+        return bcrypt.checkpw(
+            plain_password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES],
+            hashed_password.encode("utf-8"),
+        )
+    except ValueError:
+        return False
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash without blocking the event loop.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password to compare against
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await _run_hash(_verify_password_sync, plain_password, hashed_password)
+
+
+def _password_verify_digest(plain_password: str, hashed_password: str) -> str:
+    """
+    Compute the verification cache digest for a password/hash pair.
+
+    The stored hash is part of the MAC input, so a password change (or a
+    rehash) produces a new digest and old cache entries stop matching.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Stored password hash
+
+    Returns:
+        Hex HMAC-SHA256 digest keyed with the password pepper
+    """
+    return hmac.digest(
+        settings.PASSWORD_PEPPER.encode(),
+        f"{hashed_password}:{plain_password}".encode(),
+        "sha256",
+    ).hex()
+
+
+async def verify_password_cached(
+    user_id: str,
+    plain_password: str,
+    hashed_password: str,
+) -> bool:
+    """
+    Verify a password, skipping the KDF if it was verified recently.
+
+    Only successful verifications are cached (for
+    PASSWORD_VERIFY_CACHE_TTL seconds); failures always run the full hash.
+
+    Args:
+        user_id: ID of the user the hash belongs to
+        plain_password: Plain text password
+        hashed_password: Hashed password to compare against
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    key = CacheKeys.password_verify(
+        user_id, _password_verify_digest(plain_password, hashed_password)
+    )
+    if await cache.exists(key):
+        return True
+
+    if not await verify_password(plain_password, hashed_password):
+        return False
+
+    await cache.set(key, 1, ttl_seconds=settings.PASSWORD_VERIFY_CACHE_TTL)
+    return True
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash should be upgraded to the current parameters.
+
+    Args:
+        hashed_password: Stored password hash
+
+    Returns:
+        True for legacy bcrypt hashes or outdated argon2 parameters
+    """
+    if not hashed_password.startswith(ARGON2_PREFIX):
+        return True
+    return password_hasher.check_needs_rehash(hashed_password)
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as JWS requires."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _encode_hs256(claims: dict[str, Any], secret: bytes) -> str:
+    """
+    Encode and sign a JWT with HS256.
+
+    The MAC is one hmac.digest() call, which runs entirely in OpenSSL
+    (SHA-NI where the CPU has it). The output matches jwt.encode's.
+
+    Args:
+        claims: Token claims (time claims as integer epoch seconds)
+        secret: HMAC signing key
+
+    Returns:
+        Encoded JWT token string
+    """
+    signing_input = HS256_HEADER + b"." + _b64url(orjson.dumps(claims))
+    signature = hmac.digest(secret, signing_input, "sha256")
+    return (signing_input + b"." + _b64url(signature)).decode()
+
+
+def _encode_token(claims: dict[str, Any]) -> str:
+    """
+    Sign token claims with the configured algorithm.
+
+    Args:
+        claims: Token claims
+
+    Returns:
+        Encoded JWT token string
+    """
+    if settings.JWT_ALGORITHM == "HS256":
+        return _encode_hs256(claims, _JWT_SECRET_KEY)
+    return jwt.encode(
+        claims,
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM,
+    )
 
 
 def create_access_token(
@@ -58,30 +309,25 @@ def create_access_token(
     Returns:
         Encoded JWT token string
     """
+    # One clock read; JWT time claims are integer epoch seconds anyway
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        lifetime = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(
-            minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+        lifetime = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
     to_encode = {
         "sub": str(subject),
-        "exp": expire,
-        "iat": datetime.utcnow(),
+        "exp": now + lifetime,
+        "iat": now,
+        "jti": uuid4().hex,
         "type": ACCESS_TOKEN_TYPE,
     }
 
     if extra_claims:
         to_encode.update(extra_claims)
 
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.JWT_SECRET,
-        algorithm=settings.JWT_ALGORITHM,
-    )
-
-    return encoded_jwt
+    return _encode_token(to_encode)
 
 
 def create_refresh_token(
@@ -100,30 +346,57 @@ def create_refresh_token(
     Returns:
         Encoded JWT refresh token string
     """
+    # One clock read; JWT time claims are integer epoch seconds anyway
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        lifetime = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(
-            days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS
-        )
+        lifetime = settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 86400
 
     to_encode = {
         "sub": str(subject),
-        "exp": expire,
-        "iat": datetime.utcnow(),
+        "exp": now + lifetime,
+        "iat": now,
+        "jti": uuid4().hex,
         "type": REFRESH_TOKEN_TYPE,
     }
 
     if extra_claims:
         to_encode.update(extra_claims)
 
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.JWT_SECRET,
-        algorithm=settings.JWT_ALGORITHM,
-    )
+    return _encode_token(to_encode)
+
+
+def _decode_verified_token(token: str) -> Optional[dict[str, Any]]:
+    """
+    Verify a JWT's signature and expiry and decode its payload.
+
+    jwt.decode() rejects expired tokens (ExpiredSignatureError is an
+    InvalidTokenError), so exp needs no second check here.
+
+    Args:
+        token: The JWT token string
+
+    Returns:
+        Decoded token payload (with "sub" parsed to a UUID) or None if invalid
+    """
+    try:
+        payload = jwt.decode(
+            token,
+            settings.JWT_SECRET,
+            algorithms=[settings.JWT_ALGORITHM],
+        )
+
+        # Subjects are user IDs; reject tokens whose subject is not a UUID
+        payload["sub"] = UUID(payload["sub"])
+
+        return payload
+
+    except (KeyError, TypeError, ValueError):
+        return None
 
-    return encoded_jwt
+    except jwt.InvalidTokenError:
+        return None
 
 
 def verify_token(
@@ -133,34 +406,101 @@ def verify_token(
     """
     Verify and decode a JWT token.
 
+    Valid tokens are cached in TOKEN_CACHE until their exp; invalid tokens
+    and tokens without exp are never cached.
+
     Args:
         token: The JWT token string
         token_type: Expected token type (access or refresh)
 
     Returns:
-        Decoded token payload or None if invalid
+        Decoded token payload (with "sub" parsed to a UUID) or None if invalid
     """
-    try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
+    now = time.time()
+    with _token_cache_lock:
+        entry = TOKEN_CACHE.get(token)
 
-        # Verify token type
-        if payload.get("type") != token_type:
+    # Re-check the deadline so a cached token cannot outlive its exp
+    if entry is not None and entry[0] > now:
+        payload = entry[1]
+    else:
+        payload = _decode_verified_token(token)
+        if payload is None:
             return None
 
-        # Check expiration (jose already does this, but explicit check)
         exp = payload.get("exp")
-        if exp and datetime.utcfromtimestamp(exp) < datetime.utcnow():
-            return None
+        if isinstance(exp, (int, float)):
+            with _token_cache_lock:
+                TOKEN_CACHE[token] = (exp, payload)
 
-        return payload
-
-    except JWTError:
+    # Verify token type
+    if payload.get("type") != token_type:
         return None
 
+    # Callers get their own copy; the cached payload stays untouched
+    return dict(payload)
+
+
+async def is_token_revoked(payload: dict[str, Any]) -> bool:
+    """
+    Check whether a verified token has been revoked.
+
+    Tokens issued before jti was added cannot be revoked and are
+    treated as valid. If Redis is unavailable the check fails open.
+
+    Args:
+        payload: Verified token payload
+
+    Returns:
+        True if the token's jti is on the revocation list
+    """
+    jti = payload.get("jti")
+    if not jti:
+        return False
+    return await cache.exists(CacheKeys.revoked_token(jti))
+
+
+async def revoke_token(payload: dict[str, Any]) -> None:
+    """
+    Add a verified token to the revocation list until it expires.
+
+    The entry's TTL is the token's remaining lifetime, so the list never
+    holds tokens that would be rejected as expired anyway.
+
+    Args:
+        payload: Verified token payload
+    """
+    jti = payload.get("jti")
+    remaining = int(payload.get("exp", 0) - time.time())
+    if not jti or remaining <= 0:
+        return
+    await cache.set(CacheKeys.revoked_token(jti), 1, ttl_seconds=remaining)
+
+
+async def claim_token(payload: dict[str, Any]) -> bool:
+    """
+    Atomically mark a verified token as used, as refresh rotation needs.
+
+    The jti goes on the revocation list with SET NX, so of several
+    concurrent requests presenting the same token only one succeeds.
+    Tokens without a jti cannot be revoked and are always claimable; if
+    Redis is unavailable the claim fails open, like is_token_revoked.
+
+    Args:
+        payload: Verified token payload
+
+    Returns:
+        True if this call claimed the token, False if it was already used
+        or revoked
+    """
+    jti = payload.get("jti")
+    if not jti:
+        return True
+    remaining = max(int(payload.get("exp", 0) - time.time()), 1)
+    return await cache.set_if_absent(
+        CacheKeys.revoked_token(jti), 1, ttl_seconds=remaining
+    )
+
 
 def decode_token(token: str) -> Optional[dict[str, Any]]:
     """
@@ -180,7 +520,7 @@ def decode_token(token: str) -> Optional[dict[str, Any]]:
             algorithms=[settings.JWT_ALGORITHM],
             options={"verify_exp": False},
         )
-    except JWTError:
+    except jwt.InvalidTokenError:
         return None
 
 
@@ -196,5 +536,5 @@ def get_token_subject(token: str) -> Optional[str]:
     """
     payload = verify_token(token)
     if payload:
-        return payload.get("sub")
+        return str(payload["sub"])
     return None
@@ -1,8 +1,39 @@
 """SQLAlchemy declarative base."""
+import os
+import time
+from uuid import UUID
+
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
-    
-    pass
+
+    # Fetch server-generated defaults (created_at, updated_at, ...) with
+    # INSERT/UPDATE ... RETURNING during the flush, so a flushed object is
+    # complete without a follow-up refresh() SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
+
+def uuid7() -> UUID:
+    """
+    Generate a time-ordered UUID (RFC 9562 version 7).
+
+    The first 48 bits are the Unix time in milliseconds and the rest is
+    random, so new primary keys land at the right edge of the B-tree
+    instead of on random pages. Rows inserted outside the ORM get the same
+    layout from the uuid_generate_v7() column default.
+
+    Returns:
+        A new version 7 UUID
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76  # version
+        | (rand >> 68) << 64  # rand_a (12 bits)
+        | 0b10 << 62  # variant
+        | (rand & 0x3FFF_FFFF_FFFF_FFFF)  # rand_b (62 bits)
+    )
+    return UUID(int=value)
@@ -9,7 +9,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 from sqlalchemy import select
 
-from app.core.security import get_password_hash
+from app.core.security import ahash_password
 from app.db.session import async_session_maker
 from app.models.user import User, UserRole
 
@@ -44,28 +44,39 @@ async def seed_users() -> None:
     logger.info("Starting user seed...")
     
     async with async_session_maker() as session:
-        for user_data in DEMO_USERS:
-            # Check if user already exists
-            result = await session.execute(
-                select(User).where(User.email == user_data["email"])
+        # One query for every demo email that already exists
+        result = await session.execute(
+            select(User.email).where(
+                User.email.in_([user_data["email"] for user_data in DEMO_USERS])
             )
-            existing_user = result.scalar_one_or_none()
-            
-            if existing_user:
-                logger.info(f"User already exists: {user_data['email']}")
-                continue
-            
-            # Create new user
-            user = User(
+        )
+        existing_emails = set(result.scalars().all())
+
+        for email in sorted(existing_emails):
+            logger.info("User already exists: %s", email)
+
+        new_users = [
+            user_data for user_data in DEMO_USERS
+            if user_data["email"] not in existing_emails
+        ]
+        # Hash concurrently in the executor instead of one after another
+        hashed_passwords = await asyncio.gather(
+            *(ahash_password(user_data["password"]) for user_data in new_users)
+        )
+
+        session.add_all([
+            User(
                 email=user_data["email"],
-                hashed_password=get_password_hash(user_data["password"]),
+                hashed_password=hashed_password,
                 full_name=user_data["full_name"],
                 role=user_data["role"],
                 is_active=True,
                 is_verified=True,
             )
-            session.add(user)
-            logger.info(f"Created user: {user_data['email']} ({user_data['role'].value})")
+            for user_data, hashed_password in zip(new_users, hashed_passwords)
+        ])
+        for user_data in new_users:
+            logger.info("Created user: %s (%s)", user_data['email'], user_data['role'].value)
         
         await session.commit()
     
@@ -87,7 +98,7 @@ async def main() -> None:
     logger.info("Demo Credentials:")
     logger.info("-" * 30)
     for user in DEMO_USERS:
-        logger.info(f"  {user['role'].value}: {user['email']} / {user['password']}")
+        logger.info("  %s: %s / %s", user['role'].value, user['email'], user['password'])
     logger.info("")
 
 
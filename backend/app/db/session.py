@@ -1,22 +1,60 @@
 """Database session configuration with async SQLAlchemy."""
-from typing import AsyncGenerator
+import os
+from typing import Any, AsyncGenerator
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
+# Pool sizing: password hashing runs in threads and requests hold their
+# connection across it, so the pool scales with the CPU count
+POOL_SIZE = settings.DB_POOL_SIZE or (os.cpu_count() or 1) * 4
+MAX_OVERFLOW = POOL_SIZE if settings.DB_MAX_OVERFLOW < 0 else settings.DB_MAX_OVERFLOW
+
+POOL_OPTIONS: dict[str, Any]
+if settings.DB_PGBOUNCER:
+    # PgBouncer in transaction mode pools server connections, so keep no
+    # pool here. Its server connections change between transactions, so
+    # statements can't stay prepared on them either.
+    POOL_OPTIONS = {"poolclass": NullPool}
+    STATEMENT_CACHE_SIZE = 0
+else:
+    # No pre-ping round trip on checkout; pool_recycle bounds how long a
+    # connection can go stale. The trade-off: a connection the server
+    # dropped fails the one request that uses it (SQLAlchemy then
+    # invalidates the pool) instead of every checkout paying a SELECT 1.
+    POOL_OPTIONS = {
+        "pool_pre_ping": False,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+    STATEMENT_CACHE_SIZE = settings.DB_STATEMENT_CACHE_SIZE
+
 # Create async engine
+# Prepared statements are cached per connection (SQLAlchemy's asyncpg
+# adapter and asyncpg itself), so hot queries like the user lookup are
+# parsed once per connection.
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     future=True,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    # Compiled SQL per statement shape; the default 500 is undersized for
+    # the ORM plus bulk and listing variants
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    connect_args={
+        "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,
+        "statement_cache_size": STATEMENT_CACHE_SIZE,
+    },
+    **POOL_OPTIONS,
 )
 
 # Session factory
@@ -28,10 +66,68 @@ async_session_maker = async_sessionmaker(
     autocommit=False,
 )
 
+# Session.info key set once the current transaction has written something
+_HAS_WRITES = "has_writes"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_writes(session: Session, flush_context) -> None:
+    """Flag the transaction as written once the ORM flushes changes."""
+    session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state: ORMExecuteState) -> None:
+    """Flag the transaction as written for any non-SELECT statement."""
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _reset_writes(session: Session) -> None:
+    """Clear the write flag when the transaction ends."""
+    session.info.pop(_HAS_WRITES, None)
+
+
+def mark_written(session: AsyncSession) -> None:
+    """
+    Flag the session's transaction as written.
+
+    For writes that bypass the ORM events, such as a COPY on the raw
+    driver connection, so get_db still commits them.
+
+    Args:
+        session: The async session
+    """
+    session.info[_HAS_WRITES] = True
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """
+    Check whether the session's transaction needs a COMMIT.
+
+    Args:
+        session: The async session
+
+    Returns:
+        True if statements wrote data or unflushed changes are pending
+    """
+    return bool(
+        session.info.get(_HAS_WRITES)
+        or session.new
+        or session.dirty
+        or session.deleted
+    )
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     FastAPI dependency that yields a database session.
+
+    Only commits when the request wrote something; read-only requests just
+    close the session, which rolls back the implicit transaction without
+    a COMMIT round trip or WAL flush.
     
     Usage:
         @app.get("/items")
@@ -41,7 +137,8 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         try:
             yield session
-            await session.commit()
+            if has_pending_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
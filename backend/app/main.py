@@ -1,19 +1,22 @@
 """FastAPI Application Entry Point."""
 import logging
+import ssl
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 import socketio
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1.router import api_router
 from app.core.cache import cache
 from app.core.config import settings
 from app.core.exceptions import BaseAPIException
+from app.core.pii_encryption import pii_encryption
+from app.core.security import shutdown_hash_executor, start_hash_executor
+from app.services.webhook_service import start_webhook_batcher, stop_webhook_batcher
 from app.sockets.handlers import sio
-from app.sockets.pg_listener import start_pg_listener, stop_pg_listener
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +25,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# First OpenSSL release with SHA extension (SHA-NI) dispatch for SHA-256
+MIN_OPENSSL_VERSION = (1, 1, 1)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
@@ -30,41 +36,72 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     Handles startup and shutdown events.
     """
+    # Only the lifespan uses the listener; everything else main imports is
+    # also imported by the API routers, so deferring it would save nothing
+    from app.sockets.pg_listener import start_pg_listener, stop_pg_listener
+
     # Startup
-    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
-    logger.info(f"Debug mode: {settings.DEBUG}")
+    logger.info("Starting %s v%s", settings.APP_NAME, settings.APP_VERSION)
+    logger.info("Environment: %s", settings.ENVIRONMENT)
+    logger.info("Debug mode: %s", settings.DEBUG)
+
+    # hmac.digest() dispatches to OpenSSL, which picks SHA-NI via CPUID on 1.1.1+
+    logger.info("Crypto backend: %s", ssl.OPENSSL_VERSION)
+    if ssl.OPENSSL_VERSION_INFO < MIN_OPENSSL_VERSION:
+        logger.warning(
+            "OpenSSL older than 1.1.1; HMAC-SHA256 will not use SHA extensions"
+        )
+
+    # Password hashing runs in its own thread or process pool
+    start_hash_executor()
+    logger.info("Password hash executor: %s", settings.PASSWORD_HASH_EXECUTOR)
+
+    # Derive the PII key before serving, not on the first request
+    pii_encryption.warm_up()
 
     # Initialize Redis cache
     try:
         await cache.connect()
         logger.info("Redis cache connected")
     except Exception as e:
-        logger.warning(f"Redis cache not available: {e}")
+        logger.warning("Redis cache not available: %s", e)
 
     # Start PostgreSQL LISTEN for real-time updates
     try:
         await start_pg_listener()
         logger.info("PostgreSQL listener started")
     except Exception as e:
-        logger.warning(f"PostgreSQL listener not available: {e}")
+        logger.warning("PostgreSQL listener not available: %s", e)
+
+    # Start the webhook persistence batcher
+    await start_webhook_batcher()
+    logger.info("Webhook batcher started")
 
     yield
 
     # Shutdown
     logger.info("Shutting down application...")
 
+    # Flush queued webhooks before the database goes away
+    try:
+        await stop_webhook_batcher()
+    except Exception as e:
+        logger.warning("Error stopping webhook batcher: %s", e)
+
     # Stop PostgreSQL listener
     try:
         await stop_pg_listener()
     except Exception as e:
-        logger.warning(f"Error stopping PostgreSQL listener: {e}")
+        logger.warning("Error stopping PostgreSQL listener: %s", e)
 
     # Disconnect Redis cache
     try:
         await cache.disconnect()
     except Exception as e:
-        logger.warning(f"Error disconnecting Redis: {e}")
+        logger.warning("Error disconnecting Redis: %s", e)
+
+    # Let in-flight hashes finish; a process pool also reaps its workers
+    shutdown_hash_executor()
 
 
 # Create FastAPI application
@@ -90,6 +127,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    # orjson serializes the (UUID/datetime-heavy) response payloads in C
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -107,9 +146,9 @@ app.add_middleware(
 @app.exception_handler(BaseAPIException)
 async def base_api_exception_handler(
     request: Request, exc: BaseAPIException
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Handle custom API exceptions."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "message": exc.message,
@@ -120,10 +159,10 @@ async def base_api_exception_handler(
 
 
 @app.exception_handler(Exception)
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """Handle unexpected exceptions."""
-    logger.exception(f"Unexpected error: {exc}")
-    return JSONResponse(
+    logger.exception("Unexpected error: %s", exc)
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "message": "Internal server error",
@@ -2,9 +2,8 @@
 import enum
 from datetime import datetime
 from typing import Optional
-from uuid import UUID as PyUUID
 
-from sqlalchemy import BigInteger, DateTime, Index, String, Text, func
+from sqlalchemy import BigInteger, DateTime, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import INET, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -54,8 +53,10 @@ class AuditLog(Base):
         index=True,
         comment="Type of entity: loan_application, user, etc.",
     )
-    entity_id: Mapped[PyUUID] = mapped_column(
-        UUID(as_uuid=True),
+    # IDs stay strings (as_uuid=False): audit rows are written from job
+    # payloads and rarely read back, so no uuid.UUID objects are built
+    entity_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
         nullable=False,
         index=True,
     )
@@ -68,8 +69,8 @@ class AuditLog(Base):
     )
 
     # Who performed the action
-    actor_id: Mapped[Optional[PyUUID]] = mapped_column(
-        UUID(as_uuid=True),
+    actor_id: Mapped[Optional[str]] = mapped_column(
+        UUID(as_uuid=False),
         nullable=True,
         comment="User or system ID that performed the action",
     )
@@ -99,9 +100,8 @@ class AuditLog(Base):
     # Timestamp
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        server_default=func.now(),
+        server_default=func.statement_timestamp(),
         nullable=False,
-        index=True,
     )
 
     # Indexes for common queries
@@ -112,12 +112,21 @@ class AuditLog(Base):
             "entity_id",
             "created_at",
             postgresql_using="btree",
+            postgresql_include=["action"],
         ),
         Index(
             "idx_audit_actor_created",
             "actor_id",
             "created_at",
             postgresql_using="btree",
+            postgresql_where=text("actor_id IS NOT NULL"),
+        ),
+        # Append-only table: block-range index for time-range scans
+        Index(
+            "idx_audit_created_brin",
+            "created_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
         ),
         {
             "comment": "Audit logs - consider partitioning by month for production",
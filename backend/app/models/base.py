@@ -6,7 +6,7 @@ from sqlalchemy import DateTime, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base import Base
+from app.db.base import Base, uuid7
 
 
 class BaseModel(Base):
@@ -24,18 +24,18 @@ class BaseModel(Base):
     id: Mapped[uuid4] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
-        index=True,
+        default=uuid7,
+        server_default=func.uuid_generate_v7(),
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        server_default=func.now(),
+        server_default=func.statement_timestamp(),
         nullable=False,
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        server_default=func.now(),
-        onupdate=func.now(),
+        server_default=func.statement_timestamp(),
+        onupdate=func.statement_timestamp(),
         nullable=False,
     )
 
@@ -39,7 +39,6 @@ class AsyncJob(Base):
     queue_name: Mapped[str] = mapped_column(
         String(50),
         nullable=False,
-        index=True,
         comment="Queue name: risk_evaluation, audit, notifications, webhooks",
     )
     payload: Mapped[dict] = mapped_column(
@@ -82,7 +81,7 @@ class AsyncJob(Base):
     # Scheduling
     scheduled_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        server_default=func.now(),
+        server_default=func.statement_timestamp(),
         nullable=False,
         comment="When the job should be processed",
     )
@@ -111,17 +110,32 @@ class AsyncJob(Base):
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        server_default=func.now(),
+        server_default=func.statement_timestamp(),
         nullable=False,
     )
 
     # Indexes for efficient job processing
     __table_args__ = (
-        # Index for fetching pending jobs by queue
+        # Index for fetching pending jobs by queue, in dequeue order.
+        # INCLUDE lets the pickup query resolve candidates from the index.
         Index(
             "idx_jobs_pending_queue",
             "queue_name",
-            "priority",
+            priority.desc(),
+            "scheduled_at",
+            postgresql_include=["id", "attempts", "max_attempts"],
+            postgresql_where=(status == JobStatus.PENDING.value),
+        ),
+        # Index for per-queue status stats (and queue_name lookups)
+        Index(
+            "idx_jobs_queue_status",
+            "queue_name",
+            "status",
+            postgresql_include=["scheduled_at"],
+        ),
+        # Index for the oldest ready job across queues
+        Index(
+            "idx_jobs_pending_scheduled",
             "scheduled_at",
             postgresql_where=(status == JobStatus.PENDING.value),
         ),
@@ -132,11 +146,13 @@ class AsyncJob(Base):
             "locked_at",
             postgresql_where=(status == JobStatus.RUNNING.value),
         ),
-        # Index for cleanup of old completed jobs
+        # Block-range index for cleanup of old finished jobs (any status);
+        # completed_at grows roughly with the physical row order
         Index(
-            "idx_jobs_completed",
+            "idx_jobs_completed_brin",
             "completed_at",
-            postgresql_where=(status == JobStatus.COMPLETED.value),
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
         ),
     )
 
@@ -2,7 +2,7 @@
 import enum
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Iterable, Optional, Sequence
 from uuid import uuid4
 
 from sqlalchemy import (
@@ -18,8 +18,8 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.pii_encryption import decrypt_pii
-from app.db.base import Base
+from app.core.pii_encryption import decrypt_pii, decrypt_pii_many
+from app.db.base import Base, uuid7
 
 
 class LoanStatus(str, enum.Enum):
@@ -35,6 +35,16 @@ class LoanStatus(str, enum.Enum):
     COMPLETED = "COMPLETED"
 
 
+# Decisions that only analysts may take and that notify the applicant
+APPROVAL_STATUSES = frozenset({LoanStatus.APPROVED, LoanStatus.REJECTED})
+
+# Statuses that stamp processed_at when a loan enters them
+PROCESSED_STATUSES = frozenset({LoanStatus.APPROVED, LoanStatus.REJECTED, LoanStatus.DISBURSED})
+
+# Columns holding Fernet-encrypted PII
+PII_FIELDS = ("document_number", "full_name")
+
+
 class LoanApplication(Base):
     """
     Loan application model.
@@ -49,15 +59,14 @@ class LoanApplication(Base):
     id: Mapped[uuid4] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
-        index=True,
+        default=uuid7,
+        server_default=func.uuid_generate_v7(),
     )
 
     # Country and document info
     country_code: Mapped[str] = mapped_column(
         String(2),
         nullable=False,
-        index=True,
         comment="ISO 2-letter country code: ES, MX, CO, BR",
     )
     document_type: Mapped[str] = mapped_column(
@@ -154,12 +163,35 @@ class LoanApplication(Base):
         cascade="all, delete-orphan",
         lazy="dynamic",
     )
+    # Read-only list form of status_history. Never loaded implicitly; list
+    # queries opt in with selectinload() to fetch every page's history in
+    # one extra query
+    status_history_list = relationship(
+        "LoanStatusHistory",
+        order_by="LoanStatusHistory.created_at",
+        lazy="noload",
+        viewonly=True,
+    )
 
     # Table configuration
     __table_args__ = (
-        # Composite indexes for common queries
-        Index("idx_loans_country_status", "country_code", "status"),
-        Index("idx_loans_created_at", "created_at", postgresql_using="btree"),
+        # Listing filtered by country (and status), already in listing order
+        Index(
+            "idx_loans_filter",
+            "country_code",
+            "status",
+            created_at.desc(),
+            id.desc(),
+        ),
+        # Listing of loans flagged for manual review
+        Index(
+            "idx_loans_review",
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=(requires_review == True),  # noqa: E712
+        ),
+        # Listing order (newest first, id as tiebreaker for keyset cursors)
+        Index("idx_loans_created_at", created_at.desc(), id.desc()),
         # Partial index for pending/in_review loans (most queried)
         Index(
             "idx_loans_pending_review",
@@ -173,6 +205,54 @@ class LoanApplication(Base):
         },
     )
 
+    @classmethod
+    def decrypt_many(
+        cls,
+        rows: Sequence["LoanApplication"],
+        fields: Iterable[str] = PII_FIELDS,
+    ) -> None:
+        """
+        Decrypt PII for many loans in one pass and cache it on each row.
+
+        Each field is decrypted for the whole batch with one Fernet
+        instance; afterwards the decrypted_* properties are cached reads.
+
+        Args:
+            rows: Loans to decrypt, e.g. one list page
+            fields: Encrypted columns to decrypt
+        """
+        for field in fields:
+            ciphertexts = [getattr(row, field) for row in rows]
+            plaintexts = decrypt_pii_many(ciphertexts)
+            for row, ciphertext, plaintext in zip(rows, ciphertexts, plaintexts):
+                row.__dict__[f"_decrypted_{field}"] = (ciphertext, plaintext)
+
+    def _decrypted(self, field: str) -> str:
+        """
+        Get the decrypted value of a PII column, decrypting at most once.
+
+        The cache entry remembers its ciphertext, so assigning a new value
+        to the column is never answered from a stale cache.
+
+        Args:
+            field: Encrypted column name
+
+        Returns:
+            Decrypted value
+        """
+        ciphertext = getattr(self, field)
+        cached = self.__dict__.get(f"_decrypted_{field}")
+        if cached is not None and cached[0] == ciphertext:
+            return cached[1]
+
+        try:
+            plaintext = decrypt_pii(ciphertext)
+        except Exception:
+            # If decryption fails, return as-is (might be unencrypted legacy data)
+            plaintext = ciphertext
+        self.__dict__[f"_decrypted_{field}"] = (ciphertext, plaintext)
+        return plaintext
+
     @property
     def decrypted_document_number(self) -> str:
         """
@@ -181,11 +261,7 @@ class LoanApplication(Base):
         Returns:
             Decrypted document number
         """
-        try:
-            return decrypt_pii(self.document_number)
-        except Exception:
-            # If decryption fails, return as-is (might be unencrypted legacy data)
-            return self.document_number
+        return self._decrypted("document_number")
 
     @property
     def decrypted_full_name(self) -> str:
@@ -195,11 +271,7 @@ class LoanApplication(Base):
         Returns:
             Decrypted full name
         """
-        try:
-            return decrypt_pii(self.full_name)
-        except Exception:
-            # If decryption fails, return as-is (might be unencrypted legacy data)
-            return self.full_name
+        return self._decrypted("full_name")
 
     def __repr__(self) -> str:
         return f"<LoanApplication(id={self.id}, country={self.country_code}, status={self.status.value})>"
@@ -3,11 +3,12 @@ from datetime import datetime
 from typing import Optional
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base import Base
+from app.db.base import Base, uuid7
+from app.models.loan import LoanStatus
 
 
 class LoanStatusHistory(Base):
@@ -22,7 +23,8 @@ class LoanStatusHistory(Base):
     id: Mapped[uuid4] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
+        default=uuid7,
+        server_default=func.uuid_generate_v7(),
     )
 
     # Foreign key to loan application
@@ -33,14 +35,14 @@ class LoanStatusHistory(Base):
         index=True,
     )
 
-    # Status change info
-    previous_status: Mapped[Optional[str]] = mapped_column(
-        String(30),
+    # Status change info (same enum type as loan_applications.status)
+    previous_status: Mapped[Optional[LoanStatus]] = mapped_column(
+        Enum(LoanStatus, name="loan_status"),
         nullable=True,
         comment="Previous status (null for initial creation)",
     )
-    new_status: Mapped[str] = mapped_column(
-        String(30),
+    new_status: Mapped[LoanStatus] = mapped_column(
+        Enum(LoanStatus, name="loan_status"),
         nullable=False,
     )
 
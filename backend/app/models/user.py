@@ -4,11 +4,11 @@ from datetime import datetime
 from typing import Optional
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Enum, String, func
+from sqlalchemy import Boolean, DateTime, Enum, Index, String, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base import Base
+from app.db.base import Base, uuid7
 
 
 class UserRole(str, enum.Enum):
@@ -31,7 +31,8 @@ class User(Base):
     id: Mapped[uuid4] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
+        default=uuid7,
+        server_default=func.uuid_generate_v7(),
     )
 
     # Authentication
@@ -39,7 +40,6 @@ class User(Base):
         String(255),
         unique=True,
         nullable=False,
-        index=True,
     )
     hashed_password: Mapped[str] = mapped_column(
         String(255),
@@ -88,6 +88,17 @@ class User(Base):
         nullable=True,
     )
 
+    __table_args__ = (
+        # Case-insensitive unique email index covering the login lookup
+        # (index-only scan)
+        Index(
+            "idx_users_email_lower",
+            func.lower(email),
+            unique=True,
+            postgresql_include=["email", "hashed_password", "is_active", "role", "id"],
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email={self.email}, role={self.role.value})>"
 
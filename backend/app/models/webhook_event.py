@@ -7,7 +7,7 @@ from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.db.base import Base
+from app.db.base import Base, uuid7
 
 
 class WebhookEvent(Base):
@@ -23,7 +23,8 @@ class WebhookEvent(Base):
     id: Mapped[uuid4] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid4,
+        default=uuid7,
+        server_default=func.uuid_generate_v7(),
     )
 
     # Source information
@@ -57,7 +58,6 @@ class WebhookEvent(Base):
         Boolean,
         default=False,
         nullable=False,
-        index=True,
     )
     processed_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True),
@@ -91,6 +91,7 @@ class WebhookEvent(Base):
             "processed",
             "created_at",
             postgresql_where=(processed == False),  # noqa: E712
+            postgresql_include=["source", "event_type"],
         ),
         Index(
             "idx_webhook_source_type",
@@ -2,7 +2,7 @@
 from typing import Any, Generic, Optional, Sequence, TypeVar
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, bindparam, func, literal_column, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base import Base
@@ -10,6 +10,10 @@ from app.db.base import Base
 # Type variable for the model class
 ModelType = TypeVar("ModelType", bound=Base)
 
+# Primary key lookups per model, built once and reused with an "id" bind
+_GET_BY_ID_STATEMENTS: dict[type, Select] = {}
+_EXISTS_STATEMENTS: dict[type, Select] = {}
+
 
 class BaseRepository(Generic[ModelType]):
     """
@@ -43,7 +47,6 @@ class BaseRepository(Generic[ModelType]):
         db_obj = self.model(**obj_in)
         self.session.add(db_obj)
         await self.session.flush()
-        await self.session.refresh(db_obj)
         return db_obj
 
     async def get_by_id(self, id: UUID) -> Optional[ModelType]:
@@ -56,9 +59,12 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             The model instance or None if not found
         """
-        result = await self.session.execute(
-            select(self.model).where(self.model.id == id)
-        )
+        statement = _GET_BY_ID_STATEMENTS.get(self.model)
+        if statement is None:
+            statement = select(self.model).where(self.model.id == bindparam("id"))
+            _GET_BY_ID_STATEMENTS[self.model] = statement
+
+        result = await self.session.execute(statement, {"id": id})
         return result.scalar_one_or_none()
 
     async def get_multi(
@@ -113,7 +119,6 @@ class BaseRepository(Generic[ModelType]):
 
         self.session.add(db_obj)
         await self.session.flush()
-        await self.session.refresh(db_obj)
         return db_obj
 
     async def delete(self, id: UUID) -> bool:
@@ -133,13 +138,30 @@ class BaseRepository(Generic[ModelType]):
             return True
         return False
 
-    async def count(self) -> int:
+    async def count(self, approximate: bool = False) -> int:
         """
         Count all records.
 
+        Args:
+            approximate: Return the planner's row estimate (pg_class.reltuples,
+                kept current by ANALYZE/autovacuum) instead of counting
+
         Returns:
-            Total number of records
-        """
+            Total number of records (estimated if approximate)
+        """
+        if approximate:
+            # reltuples is -1 until the table has been analyzed
+            result = await self.session.execute(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = to_regclass(:table_name)"
+                ),
+                {"table_name": self.model.__tablename__},
+            )
+            estimate = result.scalar_one_or_none()
+            if estimate is not None and estimate >= 0:
+                return estimate
+
         result = await self.session.execute(
             select(func.count()).select_from(self.model)
         )
@@ -155,7 +177,15 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             True if exists, False otherwise
         """
-        result = await self.session.execute(
-            select(func.count()).select_from(self.model).where(self.model.id == id)
-        )
-        return result.scalar_one() > 0
+        # SELECT 1 ... LIMIT 1 stops at the first primary key match
+        statement = _EXISTS_STATEMENTS.get(self.model)
+        if statement is None:
+            statement = (
+                select(literal_column("1"))
+                .where(self.model.id == bindparam("id"))
+                .limit(1)
+            )
+            _EXISTS_STATEMENTS[self.model] = statement
+
+        result = await self.session.execute(statement, {"id": id})
+        return result.scalar() is not None
@@ -2,11 +2,17 @@
 from datetime import datetime, timedelta
 from typing import Any, Optional, Sequence
 
-from sqlalchemy import and_, func, select, text, update
+import orjson
+from sqlalchemy import and_, case, delete, func, literal, select, type_coerce, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.session import mark_written
 from app.models.job import AsyncJob, JobStatus
 
+# Columns written by enqueue_many; the rest take their server defaults
+COPY_JOB_COLUMNS = ("queue_name", "payload", "status", "priority", "attempts", "max_attempts")
+
 
 class JobRepository:
     """
@@ -50,9 +56,60 @@ class JobRepository:
         )
         self.session.add(job)
         await self.session.flush()
-        await self.session.refresh(job)
         return job
 
+    async def enqueue_many(
+        self,
+        queue_name: str,
+        payloads: Sequence[dict[str, Any]],
+        priority: int = 0,
+        max_attempts: int = 3,
+    ) -> int:
+        """
+        Add many jobs to one queue with a single binary COPY.
+
+        Runs on the session's connection, so the rows are part of the
+        current transaction, which is flagged as written. Jobs are
+        scheduled for now.
+
+        Args:
+            queue_name: Name of the queue
+            payloads: Job data, one job per payload
+            priority: Priority for every job
+            max_attempts: Maximum retry attempts for every job
+
+        Returns:
+            Number of jobs enqueued
+        """
+        if not payloads:
+            return 0
+
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        # JSONB goes over COPY as JSON text, matching the dialect's codec
+        records = [
+            (
+                queue_name,
+                orjson.dumps(payload).decode(),
+                JobStatus.PENDING.value,
+                priority,
+                0,
+                max_attempts,
+            )
+            for payload in payloads
+        ]
+        # The asyncpg connection; only None once the DBAPI connection is closed
+        driver_connection = raw_connection.driver_connection
+        assert driver_connection is not None
+        await driver_connection.copy_records_to_table(
+            AsyncJob.__tablename__,
+            records=records,
+            columns=COPY_JOB_COLUMNS,
+        )
+        # The COPY bypasses the ORM, so flag the transaction for commit
+        mark_written(self.session)
+        return len(records)
+
     async def dequeue(
         self,
         queue_name: str,
@@ -62,8 +119,6 @@ class JobRepository:
         """
         Get and lock the next available job from a queue.
 
-        Uses SELECT FOR UPDATE SKIP LOCKED for safe concurrent access.
-
         Args:
             queue_name: Name of the queue to pull from
             worker_id: Identifier of the worker claiming the job
@@ -72,12 +127,44 @@ class JobRepository:
         Returns:
             AsyncJob if available, None otherwise
         """
+        jobs = await self.dequeue_batch(
+            queue_name,
+            worker_id,
+            batch_size=1,
+            lock_timeout_seconds=lock_timeout_seconds,
+        )
+        return jobs[0] if jobs else None
+
+    async def dequeue_batch(
+        self,
+        queue_name: str,
+        worker_id: str,
+        batch_size: int = 16,
+        lock_timeout_seconds: int = 300,
+    ) -> list[AsyncJob]:
+        """
+        Get and lock up to batch_size available jobs from a queue.
+
+        One UPDATE ... FROM (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING
+        statement picks, claims and loads the jobs in a single round trip;
+        the pick is one range scan of idx_jobs_pending_queue.
+
+        Args:
+            queue_name: Name of the queue to pull from
+            worker_id: Identifier of the worker claiming the jobs
+            batch_size: Maximum number of jobs to claim
+            lock_timeout_seconds: How long to hold the lock
+
+        Returns:
+            Claimed jobs in dequeue order (highest priority, oldest first)
+        """
         now = datetime.utcnow()
 
-        # Find next pending job that is ready to be processed
-        # Use FOR UPDATE SKIP LOCKED for concurrent safety
-        query = (
-            select(AsyncJob)
+        # Find the next pending jobs that are ready to be processed
+        # Use FOR UPDATE SKIP LOCKED for concurrent safety. Only the id is
+        # selected so candidate payloads are never read or detoasted.
+        claimed = (
+            select(AsyncJob.id)
             .where(
                 and_(
                     AsyncJob.queue_name == queue_name,
@@ -86,26 +173,30 @@ class JobRepository:
                 )
             )
             .order_by(AsyncJob.priority.desc(), AsyncJob.scheduled_at.asc())
-            .limit(1)
+            .limit(batch_size)
             .with_for_update(skip_locked=True)
+            .cte("claimed")
         )
 
-        result = await self.session.execute(query)
-        job = result.scalar_one_or_none()
-
-        if job:
-            # Lock the job
-            job.status = JobStatus.RUNNING
-            job.locked_by = worker_id
-            job.locked_at = now
-            job.started_at = now
-            job.attempts += 1
-
-            self.session.add(job)
-            await self.session.flush()
-            await self.session.refresh(job)
-
-        return job
+        # Lock, claim and load the full rows (with payload) in one statement
+        result = await self.session.execute(
+            update(AsyncJob)
+            .where(AsyncJob.id == claimed.c.id)
+            .values(
+                status=JobStatus.RUNNING,
+                locked_by=worker_id,
+                locked_at=now,
+                started_at=now,
+                attempts=AsyncJob.attempts + 1,
+            )
+            .returning(AsyncJob)
+            .execution_options(synchronize_session=False)
+        )
+        # RETURNING does not keep the CTE's order
+        return sorted(
+            result.scalars().all(),
+            key=lambda job: (-job.priority, job.scheduled_at),
+        )
 
     async def complete(
         self,
@@ -122,27 +213,18 @@ class JobRepository:
         Returns:
             Updated AsyncJob or None if not found
         """
-        result = await self.session.execute(
-            select(AsyncJob).where(AsyncJob.id == job_id)
-        )
-        job = result.scalar_one_or_none()
-
-        if not job:
-            return None
-
-        job.status = JobStatus.COMPLETED
-        job.completed_at = datetime.utcnow()
-        job.locked_by = None
-        job.locked_at = None
-
+        values: dict[str, Any] = {
+            "status": JobStatus.COMPLETED,
+            "completed_at": datetime.utcnow(),
+            "locked_by": None,
+            "locked_at": None,
+        }
         if result_data:
-            job.payload = {**job.payload, "result": result_data}
-
-        self.session.add(job)
-        await self.session.flush()
-        await self.session.refresh(job)
+            values["payload"] = AsyncJob.payload.op("||")(
+                type_coerce({"result": result_data}, JSONB)
+            )
 
-        return job
+        return await self._update_returning(AsyncJob.id == job_id, values)
 
     async def fail(
         self,
@@ -154,6 +236,9 @@ class JobRepository:
         """
         Mark a job as failed.
 
+        The retry decision (attempts < max_attempts) is made by the
+        UPDATE itself, so the job is not read first.
+
         Args:
             job_id: The job ID
             error: Error message
@@ -163,31 +248,37 @@ class JobRepository:
         Returns:
             Updated AsyncJob or None if not found
         """
-        result = await self.session.execute(
-            select(AsyncJob).where(AsyncJob.id == job_id)
-        )
-        job = result.scalar_one_or_none()
-
-        if not job:
-            return None
-
-        job.error = error
-        job.locked_by = None
-        job.locked_at = None
-
-        # Check if we should retry
-        if retry and job.attempts < job.max_attempts:
-            job.status = JobStatus.PENDING
-            job.scheduled_at = datetime.utcnow() + timedelta(seconds=retry_delay_seconds)
-        else:
-            job.status = JobStatus.FAILED
-            job.completed_at = datetime.utcnow()
+        now = datetime.utcnow()
+        values: dict[str, Any] = {
+            "error": error,
+            "locked_by": None,
+            "locked_at": None,
+            "status": JobStatus.FAILED,
+            "completed_at": now,
+        }
 
-        self.session.add(job)
-        await self.session.flush()
-        await self.session.refresh(job)
+        if retry:
+            retrying = AsyncJob.attempts < AsyncJob.max_attempts
+            values["status"] = case(
+                (retrying, literal(JobStatus.PENDING, AsyncJob.status.type)),
+                else_=literal(JobStatus.FAILED, AsyncJob.status.type),
+            )
+            values["scheduled_at"] = case(
+                (
+                    retrying,
+                    literal(
+                        now + timedelta(seconds=retry_delay_seconds),
+                        AsyncJob.scheduled_at.type,
+                    ),
+                ),
+                else_=AsyncJob.scheduled_at,
+            )
+            values["completed_at"] = case(
+                (retrying, AsyncJob.completed_at),
+                else_=literal(now, AsyncJob.completed_at.type),
+            )
 
-        return job
+        return await self._update_returning(AsyncJob.id == job_id, values)
 
     async def cancel(self, job_id: int) -> Optional[AsyncJob]:
         """
@@ -199,27 +290,44 @@ class JobRepository:
         Returns:
             Updated AsyncJob or None if not found
         """
-        result = await self.session.execute(
-            select(AsyncJob).where(
-                and_(
-                    AsyncJob.id == job_id,
-                    AsyncJob.status == JobStatus.PENDING,
-                )
-            )
+        return await self._update_returning(
+            and_(
+                AsyncJob.id == job_id,
+                AsyncJob.status == JobStatus.PENDING,
+            ),
+            {
+                "status": JobStatus.CANCELLED,
+                "completed_at": datetime.utcnow(),
+            },
         )
-        job = result.scalar_one_or_none()
 
-        if not job:
-            return None
+    async def _update_returning(
+        self,
+        condition: Any,
+        values: dict[str, Any],
+    ) -> Optional[AsyncJob]:
+        """
+        Update one job and load it from the same statement.
 
-        job.status = JobStatus.CANCELLED
-        job.completed_at = datetime.utcnow()
+        UPDATE ... RETURNING replaces the SELECT before and the refresh
+        after the change; populate_existing brings an instance already in
+        the session up to date with the returned row.
 
-        self.session.add(job)
-        await self.session.flush()
-        await self.session.refresh(job)
+        Args:
+            condition: WHERE clause selecting the job
+            values: Column values to set
 
-        return job
+        Returns:
+            Updated AsyncJob or None if no job matched
+        """
+        result = await self.session.execute(
+            update(AsyncJob)
+            .where(condition)
+            .values(values)
+            .returning(AsyncJob)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return result.scalar_one_or_none()
 
     async def release_stale_locks(
         self,
@@ -273,26 +381,21 @@ class JobRepository:
         Returns:
             Dictionary with queue statistics
         """
-        base_condition = AsyncJob.queue_name == queue_name if queue_name else True
+        # One pass: count per status, with the oldest scheduled_at per group
+        query = select(
+            AsyncJob.status,
+            func.count(),
+            func.min(AsyncJob.scheduled_at),
+        ).group_by(AsyncJob.status)
+        if queue_name:
+            query = query.where(AsyncJob.queue_name == queue_name)
 
-        # Count by status
-        status_counts = {}
-        for status in JobStatus:
-            query = select(func.count()).select_from(AsyncJob).where(
-                and_(base_condition, AsyncJob.status == status)
-            )
-            result = await self.session.execute(query)
-            status_counts[status.value] = result.scalar_one()
-
-        # Get oldest pending job
-        oldest_query = (
-            select(AsyncJob.scheduled_at)
-            .where(and_(base_condition, AsyncJob.status == JobStatus.PENDING))
-            .order_by(AsyncJob.scheduled_at.asc())
-            .limit(1)
-        )
-        oldest_result = await self.session.execute(oldest_query)
-        oldest_pending = oldest_result.scalar_one_or_none()
+        status_counts = {status.value: 0 for status in JobStatus}
+        oldest_pending = None
+        for status, count, oldest in await self.session.execute(query):
+            status_counts[status.value] = count
+            if status == JobStatus.PENDING:
+                oldest_pending = oldest
 
         return {
             "queue_name": queue_name or "all",
@@ -354,29 +457,15 @@ class JobRepository:
 
         cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
 
-        # Count before delete
-        count_query = select(func.count()).select_from(AsyncJob).where(
-            and_(
-                AsyncJob.status.in_(statuses),
-                AsyncJob.completed_at < cutoff_date,
+        # One pass: the DELETE reports how many rows it removed
+        result = await self.session.execute(
+            delete(AsyncJob)
+            .where(
+                and_(
+                    AsyncJob.status.in_(statuses),
+                    AsyncJob.completed_at < cutoff_date,
+                )
             )
+            .execution_options(synchronize_session=False)
         )
-        result = await self.session.execute(count_query)
-        count = result.scalar_one()
-
-        # Delete old jobs
-        if count > 0:
-            await self.session.execute(
-                text("""
-                    DELETE FROM async_jobs
-                    WHERE status = ANY(:statuses)
-                    AND completed_at < :cutoff_date
-                """),
-                {
-                    "statuses": [s.value for s in statuses],
-                    "cutoff_date": cutoff_date,
-                },
-            )
-            await self.session.flush()
-
-        return count
+        return result.rowcount
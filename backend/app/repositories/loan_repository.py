@@ -1,16 +1,20 @@
 """Repository for loan application operations."""
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Optional, Sequence
+from typing import Any, AsyncIterator, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, func, literal, or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
-from app.models.loan import LoanApplication, LoanStatus
+from app.models.loan import PROCESSED_STATUSES, LoanApplication, LoanStatus
 from app.models.loan_status_history import LoanStatusHistory
 from app.repositories.base import BaseRepository
 
+# Rows fetched per round trip when streaming from a server-side cursor
+STREAM_PARTITION_SIZE = 100
+
 
 class LoanRepository(BaseRepository[LoanApplication]):
     """Repository for LoanApplication CRUD operations."""
@@ -73,13 +77,12 @@ class LoanRepository(BaseRepository[LoanApplication]):
         )
         self.session.add(loan)
         await self.session.flush()
-        await self.session.refresh(loan)
 
         # Create initial status history
         history = LoanStatusHistory(
             loan_id=loan.id,
             previous_status=None,
-            new_status=status.value,
+            new_status=status,
             reason="Application created",
         )
         self.session.add(history)
@@ -153,18 +156,12 @@ class LoanRepository(BaseRepository[LoanApplication]):
             List of matching LoanApplications
         """
         query = select(LoanApplication)
-        conditions = []
-
-        if country_code:
-            conditions.append(LoanApplication.country_code == country_code)
-
-        if status:
-            conditions.append(LoanApplication.status == status)
-        elif statuses:
-            conditions.append(LoanApplication.status.in_(statuses))
-
-        if requires_review is not None:
-            conditions.append(LoanApplication.requires_review == requires_review)
+        conditions = self._filter_conditions(
+            country_code=country_code,
+            status=status,
+            statuses=statuses,
+            requires_review=requires_review,
+        )
 
         if min_amount is not None:
             conditions.append(LoanApplication.amount_requested >= min_amount)
@@ -197,16 +194,16 @@ class LoanRepository(BaseRepository[LoanApplication]):
         result = await self.session.execute(query)
         return result.scalars().all()
 
-    async def get_count(
-        self,
+    @staticmethod
+    def _filter_conditions(
         *,
         country_code: Optional[str] = None,
         status: Optional[LoanStatus] = None,
         statuses: Optional[list[LoanStatus]] = None,
         requires_review: Optional[bool] = None,
-    ) -> int:
+    ) -> list[Any]:
         """
-        Count loan applications with optional filters.
+        Build the WHERE conditions shared by listing and counting.
 
         Args:
             country_code: Filter by country
@@ -215,9 +212,8 @@ class LoanRepository(BaseRepository[LoanApplication]):
             requires_review: Filter by review requirement
 
         Returns:
-            Count of matching records
+            List of SQLAlchemy conditions
         """
-        query = select(func.count()).select_from(LoanApplication)
         conditions = []
 
         if country_code:
@@ -231,6 +227,188 @@ class LoanRepository(BaseRepository[LoanApplication]):
         if requires_review is not None:
             conditions.append(LoanApplication.requires_review == requires_review)
 
+        return conditions
+
+    async def list_page(
+        self,
+        *,
+        country_code: Optional[str] = None,
+        status: Optional[LoanStatus] = None,
+        requires_review: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 50,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> tuple[Sequence[LoanApplication], Optional[int]]:
+        """
+        List a page of loans, newest first, with the total in the same query.
+
+        With ``after`` the page starts right after that (created_at, id)
+        position (keyset pagination) and no total is computed; otherwise
+        ``skip`` is used and the total comes from COUNT(*) OVER ().
+
+        Args:
+            country_code: Filter by country
+            status: Filter by status
+            requires_review: Filter by review requirement
+            skip: Pagination offset (ignored when ``after`` is given)
+            limit: Maximum results
+            after: Keyset cursor position (created_at, id)
+
+        Returns:
+            Tuple of (loans, total_count or None in keyset mode)
+        """
+        conditions = self._filter_conditions(
+            country_code=country_code,
+            status=status,
+            requires_review=requires_review,
+        )
+        order = (LoanApplication.created_at.desc(), LoanApplication.id.desc())
+
+        if after is not None:
+            conditions.append(
+                tuple_(LoanApplication.created_at, LoanApplication.id)
+                < tuple_(
+                    literal(after[0], LoanApplication.created_at.type),
+                    literal(after[1], LoanApplication.id.type),
+                )
+            )
+            query = select(LoanApplication).where(and_(*conditions))
+            result = await self.session.execute(query.order_by(*order).limit(limit))
+            return result.scalars().all(), None
+
+        windowed = select(LoanApplication, func.count().over().label("total"))
+        if conditions:
+            windowed = windowed.where(and_(*conditions))
+        result = await self.session.execute(
+            windowed.order_by(*order).offset(skip).limit(limit)
+        )
+        rows = result.all()
+
+        if rows:
+            return [row[0] for row in rows], rows[0].total
+
+        # Past the last page the window has no rows to report the total on
+        total = 0
+        if skip > 0:
+            total = await self.get_count(
+                country_code=country_code,
+                status=status,
+                requires_review=requires_review,
+            )
+        return [], total
+
+    async def list_with_history(
+        self,
+        *,
+        country_code: Optional[str] = None,
+        status: Optional[LoanStatus] = None,
+        requires_review: Optional[bool] = None,
+        skip: int = 0,
+        limit: int = 50,
+    ) -> Sequence[LoanApplication]:
+        """
+        List loans newest first with their status history loaded.
+
+        The history of the whole page is fetched by one extra
+        ``WHERE loan_id IN (...)`` query into ``status_history_list``,
+        instead of one query per loan.
+
+        Args:
+            country_code: Filter by country
+            status: Filter by status
+            requires_review: Filter by review requirement
+            skip: Pagination offset
+            limit: Maximum results
+
+        Returns:
+            List of LoanApplications with status_history_list populated
+        """
+        conditions = self._filter_conditions(
+            country_code=country_code,
+            status=status,
+            requires_review=requires_review,
+        )
+        query = select(LoanApplication).options(
+            selectinload(LoanApplication.status_history_list)
+        )
+        if conditions:
+            query = query.where(and_(*conditions))
+
+        result = await self.session.execute(
+            query.order_by(LoanApplication.created_at.desc(), LoanApplication.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
+
+    async def stream_with_filters(
+        self,
+        *,
+        country_code: Optional[str] = None,
+        status: Optional[LoanStatus] = None,
+        requires_review: Optional[bool] = None,
+        limit: int = 1000,
+    ) -> AsyncIterator[Sequence[LoanApplication]]:
+        """
+        Stream loans newest first from a server-side cursor.
+
+        Args:
+            country_code: Filter by country
+            status: Filter by status
+            requires_review: Filter by review requirement
+            limit: Maximum rows to stream
+
+        Yields:
+            Partitions of up to STREAM_PARTITION_SIZE loans
+        """
+        conditions = self._filter_conditions(
+            country_code=country_code,
+            status=status,
+            requires_review=requires_review,
+        )
+        query = select(LoanApplication)
+        if conditions:
+            query = query.where(and_(*conditions))
+        query = query.order_by(
+            LoanApplication.created_at.desc(),
+            LoanApplication.id.desc(),
+        ).limit(limit)
+
+        result = await self.session.stream_scalars(
+            query,
+            execution_options={"yield_per": STREAM_PARTITION_SIZE},
+        )
+        async for partition in result.partitions():
+            yield partition
+
+    async def get_count(
+        self,
+        *,
+        country_code: Optional[str] = None,
+        status: Optional[LoanStatus] = None,
+        statuses: Optional[list[LoanStatus]] = None,
+        requires_review: Optional[bool] = None,
+    ) -> int:
+        """
+        Count loan applications with optional filters.
+
+        Args:
+            country_code: Filter by country
+            status: Filter by single status
+            statuses: Filter by multiple statuses
+            requires_review: Filter by review requirement
+
+        Returns:
+            Count of matching records
+        """
+        query = select(func.count()).select_from(LoanApplication)
+        conditions = self._filter_conditions(
+            country_code=country_code,
+            status=status,
+            statuses=statuses,
+            requires_review=requires_review,
+        )
+
         if conditions:
             query = query.where(and_(*conditions))
 
@@ -266,7 +444,7 @@ class LoanRepository(BaseRepository[LoanApplication]):
 
         # Update status
         loan.status = new_status
-        if new_status in (LoanStatus.APPROVED, LoanStatus.REJECTED, LoanStatus.DISBURSED):
+        if new_status in PROCESSED_STATUSES:
             loan.processed_at = datetime.utcnow()
 
         self.session.add(loan)
@@ -274,8 +452,8 @@ class LoanRepository(BaseRepository[LoanApplication]):
         # Create status history record
         history = LoanStatusHistory(
             loan_id=loan_id,
-            previous_status=old_status.value,
-            new_status=new_status.value,
+            previous_status=old_status,
+            new_status=new_status,
             changed_by=changed_by,
             reason=reason,
             extra_data=extra_data,
@@ -283,7 +461,6 @@ class LoanRepository(BaseRepository[LoanApplication]):
         self.session.add(history)
 
         await self.session.flush()
-        await self.session.refresh(loan)
 
         return loan
 
@@ -1,7 +1,11 @@
 """Loan application service with business logic."""
+import asyncio
+import base64
+import binascii
 import logging
+from datetime import datetime
 from decimal import Decimal
-from typing import Any, Optional, Sequence
+from typing import Any, AsyncIterator, Optional, Sequence
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,7 +17,7 @@ from app.core.exceptions import (
     ValidationError,
 )
 from app.core.pii_encryption import encrypt_pii, hash_document
-from app.models.loan import LoanApplication, LoanStatus
+from app.models.loan import APPROVAL_STATUSES, LoanApplication, LoanStatus
 from app.repositories.job_repository import JobRepository
 from app.repositories.loan_repository import LoanRepository
 from app.strategies import BankingInfo, StrategyRegistry, ValidationResult
@@ -23,7 +27,13 @@ logger = logging.getLogger(__name__)
 # Cache TTL constants (in seconds)
 CACHE_TTL_LOAN = 300  # 5 minutes for individual loans
 CACHE_TTL_LIST = 60  # 1 minute for list queries
-CACHE_TTL_STATS = 120  # 2 minutes for statistics
+CACHE_TTL_STATS = 30  # 30 seconds for statistics
+
+# Single-flight recomputation of statistics: one request holds the lock
+# and runs the aggregates, the others poll the cache for its result
+STATS_LOCK_TTL = 5
+STATS_LOCK_POLL_INTERVAL = 0.1
+STATS_LOCK_POLL_ATTEMPTS = 30
 
 
 # Valid status transitions
@@ -39,6 +49,43 @@ VALID_TRANSITIONS: dict[LoanStatus, list[LoanStatus]] = {
 }
 
 
+def encode_list_cursor(loan: LoanApplication) -> str:
+    """
+    Encode a loan's listing position as an opaque keyset cursor.
+
+    Args:
+        loan: Last loan of the current page
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{loan.created_at.isoformat()}|{loan.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_list_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode a keyset cursor produced by encode_list_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        Tuple of (created_at, id)
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, loan_id = (
+            base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        )
+        return datetime.fromisoformat(created_at), UUID(loan_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError(message="Invalid cursor", errors=["invalid_cursor"])
+
+
 class LoanService:
     """
     Service for loan application business logic.
@@ -110,8 +157,10 @@ class LoanService:
             ValidationError: If validation fails
         """
         logger.info(
-            f"Creating loan application for country={country_code}, "
-            f"amount={amount_requested}, document_type={document_type}"
+            "Creating loan application for country=%s, amount=%s, document_type=%s",
+            country_code,
+            amount_requested,
+            document_type,
         )
 
         # 1. Get country strategy
@@ -123,7 +172,7 @@ class LoanService:
         # 2. Validate document
         doc_result = strategy.validate_document(document_type, document_number)
         if not doc_result.is_valid:
-            logger.warning(f"Document validation failed: {doc_result.errors}")
+            logger.warning("Document validation failed: %s", doc_result.errors)
             raise ValidationError(
                 message="Document validation failed",
                 errors=doc_result.errors,
@@ -136,9 +185,9 @@ class LoanService:
                 document_number=document_number,
                 full_name=full_name,
             )
-            logger.debug(f"Banking info fetched: provider={banking_info.provider_name}")
+            logger.debug("Banking info fetched: provider=%s", banking_info.provider_name)
         except Exception as e:
-            logger.error(f"Failed to fetch banking info: {e}")
+            logger.error("Failed to fetch banking info: %s", e)
             # Continue without banking info - will require manual review
             banking_info = BankingInfo(
                 provider_name=f"{country_code}_UNAVAILABLE",
@@ -156,7 +205,7 @@ class LoanService:
         combined_result = doc_result.merge(rules_result)
 
         if not combined_result.is_valid:
-            logger.warning(f"Business rules validation failed: {combined_result.errors}")
+            logger.warning("Business rules validation failed: %s", combined_result.errors)
             raise ValidationError(
                 message="Business rules validation failed",
                 errors=combined_result.errors,
@@ -210,8 +259,10 @@ class LoanService:
         )
 
         logger.info(
-            f"Loan application created: id={loan.id}, "
-            f"risk_score={risk_score}, requires_review={combined_result.requires_review}"
+            "Loan application created: id=%s, risk_score=%s, requires_review=%s",
+            loan.id,
+            risk_score,
+            combined_result.requires_review,
         )
 
         # 7. Enqueue risk evaluation job
@@ -229,6 +280,14 @@ class LoanService:
         # Note: Audit job is created automatically by PostgreSQL trigger
         # when loan is inserted into the database
 
+        # Invalidate statistics cache
+        try:
+            cache = await get_cache()
+            await cache.delete(CacheKeys.loan_stats(country_code))
+            await cache.delete(CacheKeys.loan_stats(None))
+        except Exception as e:
+            logger.warning("Cache invalidation error: %s", e)
+
         return loan
 
     async def get_loan_by_id(
@@ -259,11 +318,11 @@ class LoanService:
                 cache = await get_cache()
                 cached = await cache.get(cache_key)
                 if cached:
-                    logger.debug(f"Cache hit for loan {loan_id}")
+                    logger.debug("Cache hit for loan %s", loan_id)
                     # We still need to fetch from DB for the ORM object
                     # but we could skip if we stored full object
             except Exception as e:
-                logger.warning(f"Cache error: {e}")
+                logger.warning("Cache error: %s", e)
 
         # Fetch from database
         loan = await self.loan_repo.get_by_id(loan_id)
@@ -286,7 +345,7 @@ class LoanService:
                     ttl_seconds=CACHE_TTL_LOAN,
                 )
             except Exception as e:
-                logger.warning(f"Cache set error: {e}")
+                logger.warning("Cache set error: %s", e)
 
         return loan
 
@@ -298,35 +357,66 @@ class LoanService:
         requires_review: Optional[bool] = None,
         skip: int = 0,
         limit: int = 50,
-    ) -> tuple[Sequence[LoanApplication], int]:
+        cursor: Optional[str] = None,
+    ) -> tuple[Sequence[LoanApplication], Optional[int], Optional[str]]:
         """
-        List loan applications with filters.
+        List loan applications with filters, newest first.
 
         Args:
             country_code: Filter by country
             status: Filter by status
             requires_review: Filter by review requirement
-            skip: Pagination offset
+            skip: Pagination offset (ignored when a cursor is given)
             limit: Maximum results
+            cursor: Keyset cursor from a previous page's next_cursor
 
         Returns:
-            Tuple of (loans, total_count)
+            Tuple of (loans, total_count, next_cursor). total_count is None
+            in cursor mode; next_cursor is None on the last page.
+
+        Raises:
+            ValidationError: If the cursor is malformed
         """
-        loans = await self.loan_repo.list_with_filters(
+        loans, total = await self.loan_repo.list_page(
             country_code=country_code,
             status=status,
             requires_review=requires_review,
             skip=skip,
             limit=limit,
+            after=decode_list_cursor(cursor) if cursor else None,
         )
 
-        total = await self.loan_repo.get_count(
+        next_cursor = encode_list_cursor(loans[-1]) if len(loans) == limit else None
+
+        return loans, total, next_cursor
+
+    async def stream_loans(
+        self,
+        *,
+        country_code: Optional[str] = None,
+        status: Optional[LoanStatus] = None,
+        requires_review: Optional[bool] = None,
+        limit: int = 1000,
+    ) -> AsyncIterator[Sequence[LoanApplication]]:
+        """
+        Stream loan applications with filters, newest first.
+
+        Args:
+            country_code: Filter by country
+            status: Filter by status
+            requires_review: Filter by review requirement
+            limit: Maximum results
+
+        Yields:
+            Partitions of loans as the database cursor drains
+        """
+        async for partition in self.loan_repo.stream_with_filters(
             country_code=country_code,
             status=status,
             requires_review=requires_review,
-        )
-
-        return loans, total
+            limit=limit,
+        ):
+            yield partition
 
     async def update_status(
         self,
@@ -382,15 +472,17 @@ class LoanService:
             raise LoanNotFoundError(str(loan_id))
 
         logger.info(
-            f"Loan status updated: id={loan_id}, "
-            f"{current_status.value} -> {new_status.value}"
+            "Loan status updated: id=%s, %s -> %s",
+            loan_id,
+            current_status.value,
+            new_status.value,
         )
 
         # Note: Audit job is created automatically by PostgreSQL trigger
         # when loan status is updated in the database
 
         # Enqueue notification if approved/rejected
-        if new_status in (LoanStatus.APPROVED, LoanStatus.REJECTED):
+        if new_status in APPROVAL_STATUSES:
             await self.job_repo.enqueue(
                 queue_name="notifications",
                 payload={
@@ -411,9 +503,9 @@ class LoanService:
             await cache.delete(CacheKeys.loan_stats(None))
             # Delete list caches (pattern-based)
             await cache.delete_pattern("loans:*")
-            logger.debug(f"Cache invalidated for loan {loan_id}")
+            logger.debug("Cache invalidated for loan %s", loan_id)
         except Exception as e:
-            logger.warning(f"Cache invalidation error: {e}")
+            logger.warning("Cache invalidation error: %s", e)
 
         return updated
 
@@ -429,12 +521,17 @@ class LoanService:
 
         Returns:
             List of status history records
+
+        Raises:
+            LoanNotFoundError: If loan not found
         """
-        loan = await self.loan_repo.get_by_id(loan_id)
-        if not loan:
+        # Every loan gets an initial history row on creation, so only an
+        # empty result needs the (cheap) existence check.
+        history = await self.loan_repo.get_status_history(loan_id)
+        if not history and not await self.loan_repo.exists(loan_id):
             raise LoanNotFoundError(str(loan_id))
 
-        return await self.loan_repo.get_status_history(loan_id)
+        return history
 
     async def get_statistics(
         self,
@@ -444,6 +541,10 @@ class LoanService:
         """
         Get loan statistics.
 
+        On a cache miss only one request recomputes the aggregates (guarded
+        by a short SET NX lock); concurrent requests wait for its result
+        instead of running the same queries.
+
         Args:
             country_code: Optional country filter
             use_cache: Whether to use cache
@@ -451,28 +552,34 @@ class LoanService:
         Returns:
             Dictionary with statistics
         """
+        if not use_cache:
+            return await self.loan_repo.get_statistics(country_code)
+
         cache_key = CacheKeys.loan_stats(country_code)
+        lock_key = CacheKeys.loan_stats_lock(country_code)
+        cache = await get_cache()
 
         # Try cache first
-        if use_cache:
-            try:
-                cache = await get_cache()
+        cached = await cache.get(cache_key)
+        if cached:
+            logger.debug("Cache hit for stats %s", country_code or 'all')
+            return cached
+
+        if not await cache.set_if_absent(lock_key, 1, ttl_seconds=STATS_LOCK_TTL):
+            # Another request is computing the statistics
+            for _ in range(STATS_LOCK_POLL_ATTEMPTS):
+                await asyncio.sleep(STATS_LOCK_POLL_INTERVAL)
                 cached = await cache.get(cache_key)
                 if cached:
-                    logger.debug(f"Cache hit for stats {country_code or 'all'}")
                     return cached
-            except Exception as e:
-                logger.warning(f"Cache error: {e}")
+            logger.warning("Timed out waiting for stats %s", country_code or 'all')
+            return await self.loan_repo.get_statistics(country_code)
 
-        # Fetch from database
-        stats = await self.loan_repo.get_statistics(country_code)
-
-        # Cache the results
-        if use_cache:
-            try:
-                cache = await get_cache()
-                await cache.set(cache_key, stats, ttl_seconds=CACHE_TTL_STATS)
-            except Exception as e:
-                logger.warning(f"Cache set error: {e}")
+        try:
+            # Fetch from database and cache the results
+            stats = await self.loan_repo.get_statistics(country_code)
+            await cache.set(cache_key, stats, ttl_seconds=CACHE_TTL_STATS)
+        finally:
+            await cache.delete(lock_key)
 
         return stats
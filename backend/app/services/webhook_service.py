@@ -0,0 +1,361 @@
+"""Webhook event persistence and background batching."""
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Optional
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, Text, cast, insert, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import async_session_maker
+from app.models.loan import PROCESSED_STATUSES, LoanApplication, LoanStatus
+from app.models.webhook_event import WebhookEvent
+from app.repositories.job_repository import JobRepository
+
+if TYPE_CHECKING:
+    # Importing the webhooks package at runtime would import its router,
+    # which imports this module
+    from app.api.v1.webhooks.schemas import BankingWebhookPayload
+
+logger = logging.getLogger(__name__)
+
+# Canonical UUID form; checked up front so document hashes never raise
+_UUID_RE = re.compile(
+    r"\A[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z"
+)
+
+QUEUED_MESSAGE = "Webhook received and queued for processing"
+
+# Provider status (lowercased) -> our status
+_STATUS_MAP = {
+    "approved": LoanStatus.APPROVED,
+    "rejected": LoanStatus.REJECTED,
+    "verified": LoanStatus.VALIDATING,
+    "disbursed": LoanStatus.DISBURSED,
+}
+
+
+@dataclass
+class QueuedWebhook:
+    """A signed, validated webhook waiting to be persisted."""
+
+    event_id: UUID
+    source: str
+    payload: "BankingWebhookPayload"
+    signature: str
+
+
+def _event_row(
+    item: QueuedWebhook,
+    *,
+    processed: bool = False,
+    processed_at: Optional[datetime] = None,
+    processing_error: Optional[str] = None,
+    loan_id: Optional[UUID] = None,
+) -> dict:
+    """
+    Build the webhook_events INSERT values for a queued webhook.
+
+    Args:
+        item: The webhook
+        processed: Whether it changed a loan
+        processed_at: When it was applied
+        processing_error: Error raised while applying it
+        loan_id: The loan it refers to, if found
+
+    Returns:
+        Column values for insert(WebhookEvent)
+    """
+    return {
+        "id": item.event_id,
+        "source": item.source,
+        "event_type": item.payload.event_type,
+        # Serialized by pydantic-core; Postgres parses it straight into JSONB
+        "payload": cast(literal(item.payload.model_dump_json(), Text), JSONB),
+        "signature": item.signature,
+        "processed": processed,
+        "processed_at": processed_at,
+        "processing_error": processing_error,
+        "loan_id": loan_id,
+    }
+
+
+async def persist_webhooks(
+    session: AsyncSession,
+    items: list[QueuedWebhook],
+) -> list[tuple[bool, str]]:
+    """
+    Apply and store a batch of webhooks with a fixed number of statements.
+
+    One SELECT resolves every loan reference, one bulk UPDATE applies the
+    loan changes, one multi-row INSERT writes the webhook events and one
+    binary COPY writes their audit jobs. Events are applied in order, so two webhooks for
+    the same loan in one batch behave as if processed one after another.
+
+    Args:
+        session: Database session (the caller commits)
+        items: Webhooks to persist
+
+    Returns:
+        (processed, message) for each item, in order
+    """
+    references = {item.payload.loan_reference for item in items}
+    loan_ids = {UUID(ref) for ref in references if _UUID_RE.match(ref)}
+
+    condition: ColumnElement[bool] = LoanApplication.document_hash.in_(references)
+    if loan_ids:
+        condition = or_(LoanApplication.id.in_(loan_ids), condition)
+    result = await session.execute(
+        select(
+            LoanApplication.id,
+            LoanApplication.status,
+            LoanApplication.document_hash,
+        ).where(condition)
+    )
+
+    by_hash: dict[str, UUID] = {}
+    current_status: dict[UUID, LoanStatus] = {}
+    for row in result:
+        by_hash.setdefault(row.document_hash, row.id)
+        current_status[row.id] = row.status
+
+    # One aware UTC timestamp for every processed_at in the batch
+    now = datetime.now(timezone.utc)
+    loan_values: dict[UUID, dict] = {}
+    event_rows = []
+    audit_payloads = []
+    outcomes = []
+
+    for item in items:
+        payload = item.payload
+        reference = payload.loan_reference
+        loan_id = by_hash.get(reference)
+        if _UUID_RE.match(reference) and UUID(reference) in current_status:
+            # An exact id match wins over a document_hash match
+            loan_id = UUID(reference)
+
+        processed = False
+        processing_error: Optional[str] = None
+        message = QUEUED_MESSAGE
+
+        try:
+            values: dict = {}
+            if loan_id and payload.event_type == "status_update" and payload.status:
+                new_status = _STATUS_MAP.get(payload.status.lower())
+                if new_status and current_status[loan_id] != new_status:
+                    values["status"] = new_status
+                    current_status[loan_id] = new_status
+                    if new_status in PROCESSED_STATUSES:
+                        values["processed_at"] = now
+                    message = f"Loan {loan_id} status updated to {new_status.value}"
+
+            elif loan_id and payload.event_type == "risk_assessment" and payload.risk_score is not None:
+                values["risk_score"] = payload.risk_score
+                message = f"Loan {loan_id} risk score updated to {payload.risk_score}"
+
+            # values is only filled once a loan was found
+            if values and loan_id is not None:
+                loan_values.setdefault(loan_id, {}).update(values)
+                processed = True
+                logger.info("Webhook updated loan %s: %s", loan_id, message)
+
+        except Exception as e:
+            logger.exception("Error processing webhook: %s", e)
+            processing_error = str(e)
+            message = f"Webhook received but processing failed: {str(e)}"
+
+        event_rows.append(_event_row(
+            item,
+            processed=processed,
+            processed_at=now if processed else None,
+            processing_error=processing_error,
+            loan_id=loan_id,
+        ))
+        audit_payloads.append({
+            "entity_type": "webhook_event",
+            "entity_id": str(item.event_id),
+            "action": "WEBHOOK_RECEIVED",
+            "changes": {
+                "source": item.source,
+                "event_type": payload.event_type,
+                "loan_id": str(loan_id) if loan_id else None,
+                "processed": processed,
+            },
+        })
+        outcomes.append((processed, message))
+
+    if loan_values:
+        # ORM bulk UPDATE by primary key, grouped by the columns each loan sets
+        await session.execute(
+            update(LoanApplication),
+            [{"id": loan_id, **values} for loan_id, values in loan_values.items()],
+        )
+
+    await session.execute(insert(WebhookEvent).values(event_rows))
+    await JobRepository(session).enqueue_many("audit", audit_payloads)
+
+    return outcomes
+
+
+class WebhookBatcher:
+    """
+    Coalesces webhook persistence into batched writes.
+
+    The request handler verifies and validates the webhook, hands it to
+    submit() and acknowledges immediately. A background task collects up
+    to WEBHOOK_BATCH_SIZE items, waiting at most WEBHOOK_BATCH_MAX_WAIT_MS
+    after the first one, and persists them with persist_webhooks().
+    """
+
+    def __init__(self) -> None:
+        self._queue: Optional[asyncio.Queue[Optional[QueuedWebhook]]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Check if the batcher is accepting webhooks."""
+        return self._task is not None
+
+    def submit(self, item: QueuedWebhook) -> bool:
+        """
+        Queue a webhook for batched persistence.
+
+        Args:
+            item: Webhook to persist
+
+        Returns:
+            False if the batcher is not running or the queue is full, in
+            which case the caller should persist the webhook itself
+        """
+        queue = self._queue
+        if self._task is None or queue is None:
+            return False
+
+        try:
+            queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def start(self) -> None:
+        """Start the background batching task."""
+        if self._task is None:
+            queue: asyncio.Queue[Optional[QueuedWebhook]] = asyncio.Queue(
+                maxsize=settings.WEBHOOK_QUEUE_MAX_SIZE
+            )
+            self._queue = queue
+            self._task = asyncio.create_task(self._run(queue))
+
+    async def stop(self) -> None:
+        """Stop accepting webhooks and flush everything already queued."""
+        queue = self._queue
+        if self._task is None or queue is None:
+            return
+
+        task, self._task = self._task, None
+        # Sentinel: the consumer flushes what is queued ahead of it and exits
+        await queue.put(None)
+        await task
+
+    async def _run(self, queue: "asyncio.Queue[Optional[QueuedWebhook]]") -> None:
+        """
+        Collect batches from the queue and flush them until stopped.
+
+        Args:
+            queue: The queue submit() feeds
+        """
+        loop = asyncio.get_running_loop()
+        max_wait = settings.WEBHOOK_BATCH_MAX_WAIT_MS / 1000
+
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stopping = False
+            deadline = loop.time() + max_wait
+            while len(batch) < settings.WEBHOOK_BATCH_SIZE:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: list[QueuedWebhook]) -> None:
+        """
+        Persist a batch in its own transaction.
+
+        If the batch fails, its items are retried one by one so a single
+        bad webhook does not take the rest of the batch down with it. A
+        webhook that still fails is stored as a bare event with its
+        processing_error, since the provider was already told it arrived.
+
+        Args:
+            batch: Webhooks to persist
+        """
+        try:
+            async with async_session_maker() as session:
+                await persist_webhooks(session, batch)
+                await session.commit()
+        except Exception as e:
+            if len(batch) == 1:
+                await self._store_failed(batch[0], e)
+                return
+
+            logger.warning("Webhook batch of %s failed, retrying individually: %s", len(batch), e)
+            for item in batch:
+                await self._flush([item])
+
+    async def _store_failed(self, item: QueuedWebhook, error: Exception) -> None:
+        """
+        Record a webhook that could not be applied, without its loan changes.
+
+        Args:
+            item: The webhook
+            error: The persist error
+        """
+        logger.error("Storing webhook event %s unprocessed after persist error: %s", item.event_id, error)
+        try:
+            async with async_session_maker() as session:
+                await session.execute(
+                    insert(WebhookEvent).values(
+                        _event_row(item, processing_error=str(error))
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            logger.exception("Dropping webhook event %s after persist error: %s", item.event_id, e)
+
+
+# Global batcher instance
+webhook_batcher = WebhookBatcher()
+
+
+async def start_webhook_batcher() -> None:
+    """Start the webhook batcher."""
+    await webhook_batcher.start()
+
+
+async def stop_webhook_batcher() -> None:
+    """Stop the webhook batcher, flushing queued webhooks."""
+    await webhook_batcher.stop()
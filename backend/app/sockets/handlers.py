@@ -48,7 +48,7 @@ class LoanNamespace(socketio.AsyncNamespace):
         Returns:
             True to accept connection
         """
-        logger.info(f"Client connected: {sid}")
+        logger.info("Client connected: %s", sid)
 
         # Extract auth data if provided by newer Socket.IO versions
         auth: Optional[dict] = None
@@ -61,7 +61,7 @@ class LoanNamespace(socketio.AsyncNamespace):
             auth = kwargs["auth"]
 
         if auth:
-            logger.debug(f"Client {sid} auth payload: {auth}")
+            logger.debug("Client %s auth payload: %s", sid, auth)
 
         self.connected_clients[sid] = {
             "rooms": set(),
@@ -78,7 +78,7 @@ class LoanNamespace(socketio.AsyncNamespace):
         Args:
             sid: Session ID
         """
-        logger.info(f"Client disconnected: {sid}")
+        logger.info("Client disconnected: %s", sid)
         if sid in self.connected_clients:
             del self.connected_clients[sid]
 
@@ -103,7 +103,7 @@ class LoanNamespace(socketio.AsyncNamespace):
         if sid in self.connected_clients:
             self.connected_clients[sid]["rooms"].add(room)
 
-        logger.debug(f"Client {sid} subscribed to {room}")
+        logger.debug("Client %s subscribed to %s", sid, room)
         return {"subscribed": room}
 
     async def on_unsubscribe_country(self, sid: str, data: dict) -> dict:
@@ -124,7 +124,7 @@ class LoanNamespace(socketio.AsyncNamespace):
         if sid in self.connected_clients:
             self.connected_clients[sid]["rooms"].discard(room)
 
-        logger.debug(f"Client {sid} unsubscribed from {room}")
+        logger.debug("Client %s unsubscribed from %s", sid, room)
         return {"unsubscribed": room}
 
     async def on_subscribe_loan(self, sid: str, data: dict) -> dict:
@@ -148,7 +148,7 @@ class LoanNamespace(socketio.AsyncNamespace):
         if sid in self.connected_clients:
             self.connected_clients[sid]["rooms"].add(room)
 
-        logger.debug(f"Client {sid} subscribed to {room}")
+        logger.debug("Client %s subscribed to %s", sid, room)
         return {"subscribed": room}
 
     async def on_unsubscribe_loan(self, sid: str, data: dict) -> dict:
@@ -169,7 +169,7 @@ class LoanNamespace(socketio.AsyncNamespace):
         if sid in self.connected_clients:
             self.connected_clients[sid]["rooms"].discard(room)
 
-        logger.debug(f"Client {sid} unsubscribed from {room}")
+        logger.debug("Client %s unsubscribed from %s", sid, room)
         return {"unsubscribed": room}
 
 
@@ -210,7 +210,7 @@ async def emit_loan_created(
         room=f"country:{country_code}",
     )
 
-    logger.debug(f"Emitted loan_created for {loan_id}")
+    logger.debug("Emitted loan_created for %s", loan_id)
 
 
 async def emit_loan_updated(
@@ -248,7 +248,7 @@ async def emit_loan_updated(
         room=f"loan:{loan_id}",
     )
 
-    logger.debug(f"Emitted loan_updated for {loan_id}")
+    logger.debug("Emitted loan_updated for %s", loan_id)
 
 
 async def emit_status_changed(
@@ -289,4 +289,4 @@ async def emit_status_changed(
         room=f"loan:{loan_id}",
     )
 
-    logger.info(f"Emitted status_changed for {loan_id}: {old_status} -> {new_status}")
+    logger.info("Emitted status_changed for %s: %s -> %s", loan_id, old_status, new_status)
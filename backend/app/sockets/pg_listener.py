@@ -41,7 +41,7 @@ class PostgresListener:
             self.connection = await asyncpg.connect(params["dsn"])
             logger.info("PostgreSQL listener connected")
         except Exception as e:
-            logger.error(f"Failed to connect PostgreSQL listener: {e}")
+            logger.error("Failed to connect PostgreSQL listener: %s", e)
             raise
 
     async def disconnect(self) -> None:
@@ -82,7 +82,7 @@ class PostgresListener:
         """
         try:
             data = json.loads(payload)
-            logger.debug(f"Received notification on {channel}: {data}")
+            logger.debug("Received notification on %s: %s", channel, data)
 
             # Call registered callbacks
             if channel in self._callbacks:
@@ -90,16 +90,16 @@ class PostgresListener:
                     try:
                         await callback(data)
                     except Exception as e:
-                        logger.error(f"Callback error for {channel}: {e}")
+                        logger.error("Callback error for %s: %s", channel, e)
 
             # Handle loan_changes channel
             if channel == "loan_changes":
                 await self._handle_loan_change(data)
 
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in notification: {e}")
+            logger.error("Invalid JSON in notification: %s", e)
         except Exception as e:
-            logger.error(f"Error handling notification: {e}")
+            logger.error("Error handling notification: %s", e)
 
     async def _handle_loan_change(self, data: dict) -> None:
         """
@@ -151,7 +151,7 @@ class PostgresListener:
             self._handle_notification,
         )
 
-        logger.info(f"Listening to PostgreSQL channels: {channels}")
+        logger.info("Listening to PostgreSQL channels: %s", channels)
 
         # Keep the connection alive
         while self.running:
@@ -175,7 +175,7 @@ async def start_pg_listener() -> None:
     try:
         await pg_listener.start()
     except Exception as e:
-        logger.warning(f"Could not start PostgreSQL listener: {e}")
+        logger.warning("Could not start PostgreSQL listener: %s", e)
         # Don't fail the application if listener fails
 
 
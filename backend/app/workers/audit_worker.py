@@ -2,7 +2,6 @@
 import logging
 from datetime import datetime
 from typing import Any, Optional
-from uuid import UUID
 
 from app.db.session import async_session_maker
 from app.models.audit import AuditLog
@@ -26,6 +25,7 @@ class AuditWorker(BaseWorker):
             queue_name="audit",
             worker_id=worker_id or "audit-worker",
             poll_interval=0.5,  # Process audit logs quickly
+            batch_size=16,  # Audit inserts are short; claim them in bulk
         )
 
     async def process(self, job_id: int, payload: dict[str, Any]) -> dict[str, Any]:
@@ -47,25 +47,26 @@ class AuditWorker(BaseWorker):
             Result with created audit log ID
         """
         entity_type = payload.get("entity_type")
-        entity_id_str = payload.get("entity_id")
+        entity_id = payload.get("entity_id")
         action = payload.get("action")
-        actor_id_str = payload.get("actor_id")
+        actor_id = payload.get("actor_id") or None
         changes = payload.get("changes", {})
         ip_address = payload.get("ip_address")
         user_agent = payload.get("user_agent")
 
-        if not entity_type or not entity_id_str or not action:
+        if not entity_type or not entity_id or not action:
             raise ValueError("entity_type, entity_id, and action are required")
 
-        entity_id = UUID(entity_id_str)
-        actor_id = UUID(actor_id_str) if actor_id_str else None
-
         logger.debug(
-            f"[AuditWorker] Creating audit log: {entity_type}/{entity_id} - {action}"
+            "[AuditWorker] Creating audit log: %s/%s - %s",
+            entity_type,
+            entity_id,
+            action,
         )
 
         async with async_session_maker() as session:
-            # Create audit log entry
+            # Create audit log entry. IDs go to the as_uuid=False columns as
+            # strings; Postgres validates them
             audit_log = AuditLog(
                 entity_type=entity_type,
                 entity_id=entity_id,
@@ -79,17 +80,19 @@ class AuditWorker(BaseWorker):
 
             session.add(audit_log)
             await session.commit()
-            await session.refresh(audit_log)
 
             logger.info(
-                f"[AuditWorker] Audit log created: id={audit_log.id}, "
-                f"entity={entity_type}/{entity_id}, action={action}"
+                "[AuditWorker] Audit log created: id=%s, entity=%s/%s, action=%s",
+                audit_log.id,
+                entity_type,
+                entity_id,
+                action,
             )
 
             return {
                 "audit_log_id": audit_log.id,
                 "entity_type": entity_type,
-                "entity_id": str(entity_id),
+                "entity_id": entity_id,
                 "action": action,
                 "created_at": datetime.utcnow().isoformat(),
             }
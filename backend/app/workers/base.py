@@ -31,6 +31,7 @@ class BaseWorker(ABC):
         worker_id: Optional[str] = None,
         poll_interval: float = 1.0,
         lock_timeout: int = 300,
+        batch_size: int = 1,
     ):
         """
         Initialize the worker.
@@ -40,11 +41,14 @@ class BaseWorker(ABC):
             worker_id: Unique identifier for this worker
             poll_interval: Seconds between queue polls
             lock_timeout: Seconds before a job lock expires
+            batch_size: Jobs claimed per queue poll; every claimed job must
+                finish within lock_timeout
         """
         self.queue_name = queue_name
         self.worker_id = worker_id or f"{queue_name}-{datetime.now().timestamp()}"
         self.poll_interval = poll_interval
         self.lock_timeout = lock_timeout
+        self.batch_size = batch_size
         self.running = False
         self._shutdown_event = asyncio.Event()
 
@@ -81,7 +85,7 @@ class BaseWorker(ABC):
             job: The job to process
         """
         job_id = job.id
-        logger.info(f"[{self.worker_id}] Processing job {job_id}: {job.queue_name}")
+        logger.info("[%s] Processing job %s: %s", self.worker_id, job_id, job.queue_name)
 
         try:
             # Process the job
@@ -91,11 +95,11 @@ class BaseWorker(ABC):
             await job_repo.complete(job_id, result)
             await session.commit()
 
-            logger.info(f"[{self.worker_id}] Job {job_id} completed successfully")
+            logger.info("[%s] Job %s completed successfully", self.worker_id, job_id)
 
         except Exception as e:
             await session.rollback()
-            logger.error(f"[{self.worker_id}] Job {job_id} failed: {e}")
+            logger.error("[%s] Job %s failed: %s", self.worker_id, job_id, e)
 
             # Mark as failed (will retry if attempts < max_attempts)
             try:
@@ -109,30 +113,42 @@ class BaseWorker(ABC):
                     )
                     await new_session.commit()
             except Exception as fail_error:
-                logger.error(f"[{self.worker_id}] Failed to mark job as failed: {fail_error}")
+                logger.error("[%s] Failed to mark job as failed: %s", self.worker_id, fail_error)
 
     async def run_once(self) -> bool:
         """
         Run one iteration of the worker loop.
 
+        Claims up to batch_size jobs with one statement and processes
+        them in order.
+
         Returns:
             True if a job was processed
         """
         async with async_session_maker() as session:
             job_repo = JobRepository(session)
 
-            # Try to get a job
-            job = await job_repo.dequeue(
+            # Try to get jobs
+            jobs = await job_repo.dequeue_batch(
                 queue_name=self.queue_name,
                 worker_id=self.worker_id,
+                batch_size=self.batch_size,
                 lock_timeout_seconds=self.lock_timeout,
             )
 
-            if job:
-                await self._process_job(session, job_repo, job)
-                return True
+            if not jobs:
+                return False
 
-            return False
+            if len(jobs) > 1:
+                # Persist the claims so a failing job's rollback cannot
+                # release the rest of the batch, and detach the jobs so
+                # that rollback does not expire them either
+                await session.commit()
+                session.expunge_all()
+
+            for job in jobs:
+                await self._process_job(session, job_repo, job)
+            return True
 
     async def run_forever(self) -> None:
         """
@@ -141,7 +157,7 @@ class BaseWorker(ABC):
         Polls the queue and processes jobs continuously.
         """
         self.running = True
-        logger.info(f"[{self.worker_id}] Starting worker for queue '{self.queue_name}'")
+        logger.info("[%s] Starting worker for queue '%s'", self.worker_id, self.queue_name)
 
         # Setup signal handlers
         loop = asyncio.get_event_loop()
@@ -160,15 +176,15 @@ class BaseWorker(ABC):
                 except asyncio.CancelledError:
                     break
                 except Exception as e:
-                    logger.error(f"[{self.worker_id}] Worker error: {e}")
+                    logger.error("[%s] Worker error: %s", self.worker_id, e)
                     await asyncio.sleep(self.poll_interval)
 
         finally:
-            logger.info(f"[{self.worker_id}] Worker stopped")
+            logger.info("[%s] Worker stopped", self.worker_id)
 
     def _handle_shutdown(self) -> None:
         """Handle shutdown signal."""
-        logger.info(f"[{self.worker_id}] Shutdown signal received")
+        logger.info("[%s] Shutdown signal received", self.worker_id)
         self.running = False
         self._shutdown_event.set()
 
@@ -190,6 +206,6 @@ class BaseWorker(ABC):
             await session.commit()
 
             if released > 0:
-                logger.info(f"[{self.worker_id}] Released {released} stale jobs")
+                logger.info("[%s] Released %s stale jobs", self.worker_id, released)
 
             return released
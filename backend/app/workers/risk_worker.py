@@ -4,7 +4,7 @@ from typing import Any, Optional
 from uuid import UUID
 
 from app.db.session import async_session_maker
-from app.models.loan import LoanStatus
+from app.models.loan import APPROVAL_STATUSES, LoanStatus
 from app.repositories.job_repository import JobRepository
 from app.repositories.loan_repository import LoanRepository
 from app.sockets.handlers import emit_status_changed
@@ -61,7 +61,9 @@ class RiskEvaluationWorker(BaseWorker):
         loan_id = UUID(loan_id_str)
 
         logger.info(
-            f"[RiskWorker] Evaluating loan {loan_id} with risk_score={risk_score}"
+            "[RiskWorker] Evaluating loan %s with risk_score=%s",
+            loan_id,
+            risk_score,
         )
 
         async with async_session_maker() as session:
@@ -75,8 +77,9 @@ class RiskEvaluationWorker(BaseWorker):
             # Only process loans in PENDING status
             if loan.status != LoanStatus.PENDING:
                 logger.warning(
-                    f"[RiskWorker] Loan {loan_id} is not PENDING "
-                    f"(status={loan.status.value}), skipping"
+                    "[RiskWorker] Loan %s is not PENDING (status=%s), skipping",
+                    loan_id,
+                    loan.status.value,
                 )
                 return {
                     "skipped": True,
@@ -115,8 +118,11 @@ class RiskEvaluationWorker(BaseWorker):
             await session.commit()
 
             logger.info(
-                f"[RiskWorker] Loan {loan_id}: {old_status.value} -> {new_status.value} "
-                f"({decision_reason})"
+                "[RiskWorker] Loan %s: %s -> %s (%s)",
+                loan_id,
+                old_status.value,
+                new_status.value,
+                decision_reason,
             )
 
             # Emit Socket.IO event
@@ -128,10 +134,10 @@ class RiskEvaluationWorker(BaseWorker):
                     new_status=new_status.value,
                 )
             except Exception as e:
-                logger.warning(f"[RiskWorker] Failed to emit status change: {e}")
+                logger.warning("[RiskWorker] Failed to emit status change: %s", e)
 
             # Enqueue notification job if approved/rejected
-            if new_status in (LoanStatus.APPROVED, LoanStatus.REJECTED):
+            if new_status in APPROVAL_STATUSES:
                 job_repo = JobRepository(session)
                 await job_repo.enqueue(
                     queue_name="notifications",
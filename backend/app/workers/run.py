@@ -56,7 +56,7 @@ async def run_worker(queue_name: str, worker_id: str = None) -> None:
         queue_name: Queue to process
         worker_id: Optional worker identifier
     """
-    logger.info(f"Starting worker for queue: {queue_name}")
+    logger.info("Starting worker for queue: %s", queue_name)
 
     try:
         worker_class = get_worker_class(queue_name)
@@ -65,7 +65,7 @@ async def run_worker(queue_name: str, worker_id: str = None) -> None:
         # Clean up stale jobs on startup
         released = await worker.cleanup_stale_jobs()
         if released > 0:
-            logger.info(f"Released {released} stale jobs on startup")
+            logger.info("Released %s stale jobs on startup", released)
 
         # Run the worker
         await worker.run_forever()
@@ -73,7 +73,7 @@ async def run_worker(queue_name: str, worker_id: str = None) -> None:
     except KeyboardInterrupt:
         logger.info("Worker stopped by user")
     except Exception as e:
-        logger.error(f"Worker error: {e}")
+        logger.error("Worker error: %s", e)
         raise
 
 
@@ -1,5 +1,4 @@
 """Webhook worker for sending outgoing notifications."""
-import hashlib
 import hmac
 import logging
 from datetime import datetime
@@ -61,11 +60,11 @@ class WebhookWorker(BaseWorker):
         Returns:
             HMAC-SHA256 signature
         """
-        return hmac.new(
+        return hmac.digest(
             settings.WEBHOOK_SECRET.encode(),
             payload.encode(),
-            hashlib.sha256,
-        ).hexdigest()
+            "sha256",
+        ).hex()
 
     def _get_endpoint(self, country_code: str) -> str:
         """
@@ -113,8 +112,10 @@ class WebhookWorker(BaseWorker):
             raise ValueError("loan_id and notification_type are required")
 
         logger.info(
-            f"[WebhookWorker] Sending {notification_type} notification "
-            f"for loan {loan_id} to {country_code}"
+            "[WebhookWorker] Sending %s notification for loan %s to %s",
+            notification_type,
+            loan_id,
+            country_code,
         )
 
         # Build webhook payload
@@ -153,8 +154,10 @@ class WebhookWorker(BaseWorker):
             success = 200 <= response.status_code < 300
 
             logger.info(
-                f"[WebhookWorker] Webhook sent to {endpoint}: "
-                f"status={response.status_code}, success={success}"
+                "[WebhookWorker] Webhook sent to %s: status=%s, success=%s",
+                endpoint,
+                response.status_code,
+                success,
             )
 
             return {
@@ -167,11 +170,11 @@ class WebhookWorker(BaseWorker):
             }
 
         except httpx.RequestError as e:
-            logger.error(f"[WebhookWorker] Request failed: {e}")
+            logger.error("[WebhookWorker] Request failed: %s", e)
             raise  # Will trigger retry
 
         except Exception as e:
-            logger.error(f"[WebhookWorker] Unexpected error: {e}")
+            logger.error("[WebhookWorker] Unexpected error: %s", e)
             raise
 
     async def stop(self) -> None:
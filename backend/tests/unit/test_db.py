@@ -0,0 +1,36 @@
+"""Unit tests for database helpers."""
+import time
+
+import app.models  # noqa: F401  (registers every mapper)
+from app.db.base import Base, uuid7
+
+
+class TestUUID7:
+    """Tests for uuid7."""
+
+    def test_version_and_variant(self):
+        """Test that generated IDs are RFC 9562 version 7 UUIDs."""
+        value = uuid7()
+
+        assert value.version == 7
+        assert value.variant == "specified in RFC 4122"
+
+    def test_ids_are_time_ordered(self):
+        """Test that IDs from later milliseconds sort after earlier ones."""
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+
+        assert first < second
+        assert first.int >> 80 <= time.time_ns() // 1_000_000
+
+
+class TestBase:
+    """Tests for the declarative base."""
+
+    def test_models_fetch_server_defaults_eagerly(self):
+        """Test that every model loads server defaults with RETURNING on flush."""
+        mappers = list(Base.registry.mappers)
+
+        assert mappers
+        assert all(mapper.eager_defaults for mapper in mappers)
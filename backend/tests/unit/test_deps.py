@@ -0,0 +1,47 @@
+"""Unit tests for API dependencies."""
+import dataclasses
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.api.deps import USER_CACHE, AuthenticatedUser, forget_cached_user
+from app.models.user import User, UserRole
+
+
+def _user(role: UserRole = UserRole.ANALYST) -> User:
+    """An unsaved User with every snapshot field set."""
+    return User(
+        id=uuid4(),
+        email="analyst@example.com",
+        full_name="Ana Lyst",
+        hashed_password="x",
+        role=role,
+        is_active=True,
+        is_verified=True,
+        created_at=datetime.now(timezone.utc),
+        last_login=None,
+    )
+
+
+class TestAuthenticatedUser:
+    """Tests for the cached user snapshot."""
+
+    def test_snapshot_is_immutable(self):
+        """Test that a cached snapshot cannot be changed by a handler."""
+        snapshot = AuthenticatedUser.from_user(_user())
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snapshot.role = UserRole.ADMIN
+
+        assert snapshot.can_approve_loans is True
+        assert snapshot.is_admin is False
+
+    def test_forget_cached_user_drops_the_entry(self):
+        """Test that forget_cached_user evicts a user's snapshot."""
+        snapshot = AuthenticatedUser.from_user(_user())
+        USER_CACHE[snapshot.id] = snapshot
+
+        forget_cached_user(snapshot.id)
+
+        assert snapshot.id not in USER_CACHE
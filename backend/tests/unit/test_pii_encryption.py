@@ -0,0 +1,82 @@
+"""Unit tests for PII encryption helpers."""
+import hashlib
+
+from app.core.pii_encryption import (
+    decrypt_pii,
+    decrypt_pii_many,
+    encrypt_pii,
+    hash_document,
+    hash_documents_bulk,
+)
+from app.models import loan as loan_module
+from app.models.loan import LoanApplication
+
+
+class TestDecryptMany:
+    """Tests for batch PII decryption."""
+
+    def test_matches_single_decrypt(self):
+        """Test that batch decryption returns the same values in order."""
+        names = ["Juan García López", "Maria Silva", "Ana Pérez"]
+        encrypted = [encrypt_pii(name) for name in names]
+
+        assert decrypt_pii_many(encrypted) == [decrypt_pii(e) for e in encrypted]
+        assert decrypt_pii_many(encrypted) == names
+
+    def test_legacy_and_empty_values_pass_through(self):
+        """Test that unencrypted and empty values are returned as-is."""
+        assert decrypt_pii_many(["plain legacy name", ""]) == ["plain legacy name", ""]
+
+
+class TestHashDocument:
+    """Tests for searchable document hashes."""
+
+    PAIRS = [("12345678z", "es"), (" 123 ", "  mx "), ("ñandú", "co"), ("123", "ES")]
+
+    @staticmethod
+    def _legacy_hash(document_number: str, country_code: str) -> str:
+        """Original formula stored document hashes were computed with."""
+        combined = f"{country_code}:{document_number}".upper().strip()
+        return hashlib.sha256(combined.encode()).hexdigest()
+
+    def test_matches_stored_hash_formula(self):
+        """Test that hashes stay identical to ones already in the database."""
+        for document_number, country_code in self.PAIRS:
+            assert hash_document(document_number, country_code) == self._legacy_hash(
+                document_number, country_code
+            )
+
+    def test_bulk_matches_single(self):
+        """Test that bulk hashing returns the single-call hashes in order."""
+        assert hash_documents_bulk(self.PAIRS) == [
+            hash_document(document_number, country_code)
+            for document_number, country_code in self.PAIRS
+        ]
+
+
+class TestLoanDecryptMany:
+    """Tests for LoanApplication.decrypt_many."""
+
+    def test_properties_read_the_batch_cache(self, monkeypatch):
+        """Test that decrypted_* properties reuse the batch results."""
+        loans = [
+            LoanApplication(full_name=encrypt_pii(name), document_number=encrypt_pii("123"))
+            for name in ("Ana Pérez", "Maria Silva")
+        ]
+        LoanApplication.decrypt_many(loans)
+
+        def fail_decrypt(data):
+            raise AssertionError("value was decrypted again")
+
+        monkeypatch.setattr(loan_module, "decrypt_pii", fail_decrypt)
+
+        assert [loan.decrypted_full_name for loan in loans] == ["Ana Pérez", "Maria Silva"]
+        assert loans[0].decrypted_document_number == "123"
+
+    def test_changed_ciphertext_is_decrypted_again(self):
+        """Test that reassigning a PII column does not return the stale value."""
+        loan = LoanApplication(full_name=encrypt_pii("Ana Pérez"))
+        LoanApplication.decrypt_many([loan], ("full_name",))
+        loan.full_name = encrypt_pii("Maria Silva")
+
+        assert loan.decrypted_full_name == "Maria Silva"
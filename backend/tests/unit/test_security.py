@@ -0,0 +1,184 @@
+"""Unit tests for JWT and password hashing helpers."""
+import time
+from datetime import timedelta
+from uuid import UUID, uuid4
+
+import bcrypt
+import jwt
+
+from app.core import security
+from app.core.security import (
+    ACCESS_TOKEN_TYPE,
+    REFRESH_TOKEN_TYPE,
+    TOKEN_CACHE,
+    ahash_password,
+    claim_token,
+    create_access_token,
+    create_refresh_token,
+    get_password_hash,
+    get_token_subject,
+    password_needs_rehash,
+    verify_password,
+    verify_token,
+)
+
+
+class TestVerifyToken:
+    """Tests for verify_token."""
+
+    def test_access_token_round_trip(self):
+        """Test that a valid access token decodes with its claims."""
+        user_id = uuid4()
+        token = create_access_token(str(user_id), extra_claims={"role": "ADMIN"})
+
+        payload = verify_token(token, ACCESS_TOKEN_TYPE)
+
+        assert payload is not None
+        assert payload["type"] == ACCESS_TOKEN_TYPE
+        assert payload["role"] == "ADMIN"
+
+    def test_subject_is_parsed_to_uuid(self):
+        """Test that the subject claim is returned as a UUID."""
+        user_id = uuid4()
+        payload = verify_token(create_access_token(str(user_id)))
+
+        assert isinstance(payload["sub"], UUID)
+        assert payload["sub"] == user_id
+
+    def test_non_uuid_subject_is_rejected(self):
+        """Test that tokens whose subject is not a UUID are invalid."""
+        assert verify_token(create_access_token("not-a-uuid")) is None
+
+    def test_wrong_token_type_is_rejected(self):
+        """Test that a refresh token is not accepted as an access token."""
+        token = create_refresh_token(str(uuid4()))
+
+        assert verify_token(token, ACCESS_TOKEN_TYPE) is None
+        assert verify_token(token, REFRESH_TOKEN_TYPE) is not None
+
+    def test_expired_token_is_rejected(self):
+        """Test that an expired token is invalid."""
+        token = create_access_token(
+            str(uuid4()),
+            expires_delta=timedelta(seconds=-10),
+        )
+
+        assert verify_token(token) is None
+
+    def test_tampered_token_is_rejected(self):
+        """Test that a token with a modified signature is invalid."""
+        token = create_access_token(str(uuid4()))
+        tampered = token[:-2] + ("AA" if token[-2:] != "AA" else "BB")
+
+        assert verify_token(tampered) is None
+
+    def test_tokens_carry_unique_jti(self):
+        """Test that every issued token gets its own jti for revocation."""
+        user_id = str(uuid4())
+        first = verify_token(create_access_token(user_id))
+        second = verify_token(create_access_token(user_id))
+
+        assert first["jti"] and second["jti"]
+        assert first["jti"] != second["jti"]
+
+    def test_cached_token_skips_signature_check(self, monkeypatch):
+        """Test that a repeated token is served from the cache."""
+        token = create_access_token(str(uuid4()))
+        first = verify_token(token)
+
+        def fail_decode(*args, **kwargs):
+            raise AssertionError("token was decoded again")
+
+        monkeypatch.setattr(security.jwt, "decode", fail_decode)
+
+        assert verify_token(token) == first
+        assert verify_token(token, REFRESH_TOKEN_TYPE) is None
+
+    def test_cache_entry_past_deadline_is_reverified(self):
+        """Test that an expired token is not revived by a stale cache entry."""
+        token = create_access_token(
+            str(uuid4()),
+            expires_delta=timedelta(seconds=-10),
+        )
+        TOKEN_CACHE[token] = (time.time() - 1, {"type": ACCESS_TOKEN_TYPE})
+
+        assert verify_token(token) is None
+
+    def test_get_token_subject_returns_string(self):
+        """Test that get_token_subject returns the subject as a string."""
+        user_id = uuid4()
+
+        assert get_token_subject(create_access_token(str(user_id))) == str(user_id)
+
+
+class TestClaimToken:
+    """Tests for claim_token."""
+
+    async def test_token_can_be_claimed_once(self, monkeypatch):
+        """Test that a second claim of the same refresh token is refused."""
+        keys = set()
+
+        async def set_if_absent(key, value, ttl_seconds):
+            if key in keys:
+                return False
+            keys.add(key)
+            return True
+
+        monkeypatch.setattr(security.cache, "set_if_absent", set_if_absent)
+        payload = verify_token(create_refresh_token(str(uuid4())), REFRESH_TOKEN_TYPE)
+
+        assert await claim_token(payload) is True
+        assert await claim_token(payload) is False
+
+
+class TestEncodeHS256:
+    """Tests for the HS256 token encoder."""
+
+    def test_matches_pyjwt_output(self):
+        """Test that the encoder produces byte-identical tokens to jwt.encode."""
+        now = int(time.time())
+        claims = {
+            "sub": str(uuid4()),
+            "exp": now + 300,
+            "iat": now,
+            "role": "ADMIN",
+        }
+
+        assert security._encode_hs256(claims, b"secret") == jwt.encode(
+            claims, "secret", algorithm="HS256"
+        )
+
+
+class TestPasswordHashing:
+    """Tests for password hashing and verification."""
+
+    async def test_argon2_hash_round_trip(self):
+        """Test that new hashes are argon2 and verify correctly."""
+        hashed = get_password_hash("s3cret-pass")
+
+        assert hashed.startswith("$argon2id$")
+        assert await verify_password("s3cret-pass", hashed) is True
+        assert await verify_password("wrong-pass", hashed) is False
+
+    async def test_async_hash_verifies(self):
+        """Test that ahash_password produces a verifiable argon2 hash."""
+        hashed = await ahash_password("s3cret-pass")
+
+        assert hashed.startswith("$argon2id$")
+        assert await verify_password("s3cret-pass", hashed) is True
+
+    async def test_legacy_bcrypt_hash_verifies_and_needs_rehash(self):
+        """Test that bcrypt hashes still verify and are flagged for upgrade."""
+        hashed = bcrypt.hashpw(b"s3cret-pass", bcrypt.gensalt(rounds=4)).decode()
+
+        assert await verify_password("s3cret-pass", hashed) is True
+        assert await verify_password("wrong-pass", hashed) is False
+        assert password_needs_rehash(hashed) is True
+
+    def test_current_argon2_hash_does_not_need_rehash(self):
+        """Test that hashes with the current parameters are kept."""
+        assert password_needs_rehash(get_password_hash("s3cret-pass")) is False
+
+    async def test_malformed_hash_is_rejected(self):
+        """Test that an unparseable stored hash fails verification."""
+        assert await verify_password("s3cret-pass", "not-a-hash") is False
@@ -1,10 +1,12 @@
 """Unit tests for services."""
 import pytest
+from datetime import datetime, timezone
 from decimal import Decimal
 from unittest.mock import Mock, AsyncMock, patch
 from uuid import uuid4
 
-from app.services.loan_service import LoanService
+from app.core.exceptions import ValidationError
+from app.services.loan_service import LoanService, decode_list_cursor, encode_list_cursor
 from app.strategies.base import BankingInfo, ValidationResult
 from app.models.loan import LoanStatus
 
@@ -135,3 +137,18 @@ class TestLoanService:
             )
 
         assert "Business rules validation failed" in str(exc_info.value)
+
+
+class TestListCursor:
+    """Tests for the loan listing keyset cursor."""
+
+    def test_cursor_round_trip(self):
+        """Test that a cursor decodes back to the loan's position."""
+        loan = Mock(created_at=datetime(2026, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc), id=uuid4())
+
+        assert decode_list_cursor(encode_list_cursor(loan)) == (loan.created_at, loan.id)
+
+    def test_malformed_cursor_is_rejected(self):
+        """Test that a garbage cursor raises a ValidationError."""
+        with pytest.raises(ValidationError):
+            decode_list_cursor("not-a-cursor")
@@ -0,0 +1,91 @@
+"""Unit tests for webhook signature verification."""
+import base64
+import hmac
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.webhooks.router import router
+from app.core.config import settings
+from app.db.session import get_db
+
+URL = "/webhooks/banking/es"
+# Signed but missing loan_reference: a request that passes verification
+# stops at validation (422) before anything touches the database
+BODY = b'{"event_type": "status_update"}'
+
+
+def _digest(body: bytes = BODY) -> bytes:
+    """Reference HMAC-SHA256 of a body with the configured secret."""
+    return hmac.new(settings.WEBHOOK_SECRET.encode(), body, "sha256").digest()
+
+
+async def _no_db():
+    """Stand-in for get_db; the tested requests never reach the session."""
+    yield None
+
+
+def _client() -> TestClient:
+    """Client for an app serving only the webhooks router."""
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = _no_db
+    return TestClient(app)
+
+
+def _post(headers: dict[str, str], body: bytes = BODY) -> int:
+    """POST a webhook body and return the response status code."""
+    return _client().post(URL, content=body, headers=headers).status_code
+
+
+class TestVerifiedWebhookBody:
+    """Tests for the verified_webhook_body dependency."""
+
+    def test_missing_signature_is_rejected(self):
+        """Test that a webhook without a signature header gets 401."""
+        assert _post({}) == 401
+
+    def test_bad_signature_is_rejected(self):
+        """Test that a wrong, tampered or undecodable signature gets 401."""
+        assert _post({"X-Webhook-Signature": _digest(BODY + b" ").hex()}) == 401
+        assert _post({"X-Webhook-Signature": _digest().hex()[:-2]}) == 401
+        assert _post({"X-Webhook-Signature": "not-hex"}) == 401
+        assert _post({"X-Webhook-Signature-Bin": "!!!"}) == 401
+
+    def test_valid_hex_signature_reaches_validation(self):
+        """Test that a correct hex signature is accepted in either case."""
+        assert _post({"X-Webhook-Signature": _digest().hex()}) == 422
+        assert _post({"X-Webhook-Signature": _digest().hex().upper()}) == 422
+
+    def test_base64_header_takes_precedence(self):
+        """Test that the base64 header is the one verified when both are sent."""
+        valid_bin = base64.b64encode(_digest()).decode()
+
+        assert _post({
+            "X-Webhook-Signature-Bin": valid_bin,
+            "X-Webhook-Signature": "00" * 32,
+        }) == 422
+        assert _post({
+            "X-Webhook-Signature-Bin": base64.b64encode(b"\0" * 32).decode(),
+            "X-Webhook-Signature": _digest().hex(),
+        }) == 401
+
+    def test_invalid_json_body_is_422(self):
+        """Test that a signed body that is not valid JSON fails validation."""
+        body = b"not json"
+
+        assert _post({"X-Webhook-Signature": _digest(body).hex()}, body) == 422
+
+    def test_signature_is_compared_in_constant_time(self, monkeypatch):
+        """Test that the verifier compares digests with hmac.compare_digest."""
+        calls = []
+        compare_digest = hmac.compare_digest
+
+        def spy(expected, received):
+            calls.append((expected, received))
+            return compare_digest(expected, received)
+
+        monkeypatch.setattr(hmac, "compare_digest", spy)
+
+        assert _post({"X-Webhook-Signature": _digest().hex()}) == 422
+        assert calls == [(_digest(), _digest())]